@@ -0,0 +1,176 @@
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+from stats import format_row, summarize, timestamp
+from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository.in_memory_task_repository import InMemoryTaskRepository
+from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
+from task_manager.repository.task_repository_interface import TaskRepositoryInterface
+from task_manager.service.task_service import TaskService
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+BACKENDS = ("sqlite", "memory")
+LOAD_CHUNK_SIZE = 10_000
+PAGE_SIZE = 100
+WORDS = ["report", "invoice", "meeting", "deploy", "review", "backup", "release", "budget", "audit", "email"]
+
+
+def synthetic_tasks(count: int, rng: random.Random) -> Iterator[Task]:
+    first_due_date = date.today() - timedelta(days=365)
+    for number in range(count):
+        yield Task(
+            id=None,
+            description=f"{rng.choice(WORDS)} {rng.choice(WORDS)} #{number}",
+            due_date=first_due_date + timedelta(days=rng.randrange(730)),
+            status=CLOSED if rng.random() < 0.3 else OPEN
+        )
+
+
+def populate(repository: TaskRepositoryInterface, count: int, rng: random.Random) -> None:
+    chunk = []
+    for task in synthetic_tasks(count, rng):
+        chunk.append(task)
+        if len(chunk) == LOAD_CHUNK_SIZE:
+            repository.save_many(chunk)
+            chunk = []
+    if chunk:
+        repository.save_many(chunk)
+
+
+def measure(operation: Callable[[int], object], iterations: int) -> List[int]:
+    latencies = []
+    for iteration in range(iterations):
+        start = time.perf_counter_ns()
+        operation(iteration)
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def run_dataset(repository: TaskRepositoryInterface, size: int, args, rng: random.Random) -> Dict[str, dict]:
+    service = TaskService(repository)
+    existing_ids = [task.id for task in repository.find_page(None, min(size, 50_000))]
+    random_id = lambda _: rng.choice(existing_ids)
+    random_date = lambda: date.today() + timedelta(days=rng.randrange(-365, 365))
+    iterations = args.iterations
+    created: List[int] = []
+    service_created: List[int] = []
+
+    def save(_):
+        task = Task(id=None, description="benchmark save", due_date=random_date())
+        repository.save(task)
+        created.append(task.id)
+
+    def add_task(_):
+        service_created.append(service.add_task("benchmark add", random_date()).id)
+
+    cases = [
+        ("repository.find_all", lambda _: repository.find_all(), args.full_scan_iterations),
+        ("repository.find_page", lambda _: repository.find_page(random_id(_), PAGE_SIZE), iterations),
+        ("repository.find_by_id", lambda _: repository.find_by_id(random_id(_)), iterations),
+        ("repository.find_by_filter.overdue",
+         lambda _: repository.find_by_filter(TaskFilter(overdue=True), limit=PAGE_SIZE), iterations),
+        ("repository.save", save, iterations),
+        ("repository.update", lambda i: repository.update_details(created[i], "benchmark update", random_date()),
+         iterations),
+        ("repository.delete", lambda i: repository.delete(created[i]), iterations),
+        ("service.list_tasks", lambda _: service.list_tasks(after_id=random_id(_), limit=PAGE_SIZE), iterations),
+        ("service.get_task", lambda _: service.get_task(random_id(_)), iterations),
+        ("service.add_task", add_task, iterations),
+        ("service.edit_task", lambda i: service.edit_task(service_created[i], "benchmark edit", random_date()),
+         iterations),
+        ("service.complete_task", lambda i: service.complete_task(service_created[i]), iterations),
+        ("service.delete_task", lambda i: service.delete_task(service_created[i]), iterations),
+    ]
+
+    results = {}
+    for name, operation, case_iterations in cases:
+        summary = summarize(measure(operation, case_iterations))
+        results[name] = summary.to_dict()
+        print(format_row(name, summary), flush=True)
+    return results
+
+
+def create_repository(backend: str, workdir: Path, size: int) -> TaskRepositoryInterface:
+    if backend == "memory":
+        return InMemoryTaskRepository()
+    return SQLiteTaskRepository(workdir / f"benchmark-{size}.db")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    regressions = []
+    for backend, sizes in results["results"].items():
+        for size, cases in sizes.items():
+            for name, summary in cases.items():
+                previous = baseline.get("results", {}).get(backend, {}).get(size, {}).get(name)
+                if not previous or not previous["ops_per_second"]:
+                    continue
+                change = summary["ops_per_second"] / previous["ops_per_second"] - 1
+                line = f"{backend:<7} {size:>8} {name:<32} {change:>+8.1%} ops/s"
+                print(line)
+                if change < -threshold:
+                    regressions.append(line)
+    return regressions
+
+
+def parse_args(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for task repositories and TaskService.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Dataset sizes to generate")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--iterations", type=int, default=1000, help="Iterations per point operation")
+    parser.add_argument("--full-scan-iterations", type=int, default=3, help="Iterations of find_all")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative ops/s drop reported as a regression (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    results = {
+        "timestamp": timestamp(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "iterations": args.iterations,
+        "results": {}
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for backend in args.backends:
+            for size in args.sizes:
+                rng = random.Random(args.seed)
+                repository = create_repository(backend, Path(workdir), size)
+                print(f"\n== {backend} with {size} tasks", flush=True)
+                started = time.perf_counter()
+                populate(repository, size, rng)
+                print(f"populated in {time.perf_counter() - started:.1f}s", flush=True)
+                results["results"].setdefault(backend, {})[str(size)] = run_dataset(repository, size, args, rng)
+                if hasattr(repository, "close"):
+                    repository.close()
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        print(f"\n== compared with {args.compare}")
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import argparse
+import http.client
+import json
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from stats import format_histogram, format_row, histogram, summarize, timestamp
+from werkzeug.serving import make_server
+from task_manager.repository.in_memory_task_repository import InMemoryTaskRepository
+from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
+from task_manager.rest_api.rest_api import create_app
+from task_manager.service.task_service import TaskService
+
+BASE_PATH = "/task-manager/tasks"
+OPERATIONS = ("list", "get", "create", "edit", "complete", "delete")
+PROFILES = {
+    "read-heavy": {"list": 15, "get": 70, "create": 7, "edit": 4, "complete": 2, "delete": 2},
+    "balanced": {"list": 10, "get": 40, "create": 20, "edit": 15, "complete": 10, "delete": 5},
+    "write-heavy": {"list": 5, "get": 15, "create": 40, "edit": 20, "complete": 10, "delete": 10},
+}
+
+
+class TaskIds:
+
+    def __init__(self, task_ids: List[int]):
+        self._task_ids = task_ids
+        self._lock = threading.Lock()
+
+    def pick(self, rng: random.Random) -> int:
+        with self._lock:
+            return rng.choice(self._task_ids) if self._task_ids else 0
+
+    def add(self, task_id: int) -> None:
+        with self._lock:
+            self._task_ids.append(task_id)
+
+    def take(self, rng: random.Random) -> int:
+        with self._lock:
+            if not self._task_ids:
+                return 0
+            index = rng.randrange(len(self._task_ids))
+            self._task_ids[index], self._task_ids[-1] = self._task_ids[-1], self._task_ids[index]
+            return self._task_ids.pop()
+
+
+class Recorder:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[int]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, operation: str, latency_ns: int, status: int) -> None:
+        with self._lock:
+            self.latencies[operation].append(latency_ns)
+            self.statuses[operation][status] += 1
+
+
+def random_due_date(rng: random.Random) -> str:
+    return (date.today() + timedelta(days=rng.randrange(-30, 60))).isoformat()
+
+
+def build_request(operation: str, task_ids: TaskIds, rng: random.Random):
+    if operation == "list":
+        return "GET", f"{BASE_PATH}?limit=100&cursor={task_ids.pick(rng)}", None
+    if operation == "get":
+        return "GET", f"{BASE_PATH}/{task_ids.pick(rng)}", None
+    if operation == "create":
+        return "POST", BASE_PATH, {"description": "load test task", "due_date": random_due_date(rng)}
+    if operation == "edit":
+        return "PUT", f"{BASE_PATH}/{task_ids.pick(rng)}", {"description": "edited", "due_date": random_due_date(rng)}
+    if operation == "complete":
+        return "PATCH", f"{BASE_PATH}/{task_ids.pick(rng)}/complete", None
+    return "DELETE", f"{BASE_PATH}/{task_ids.take(rng)}", None
+
+
+def worker(host: str, port: int, weights: Dict[str, int], deadline: float, seed: int,
+           task_ids: TaskIds, recorder: Recorder) -> None:
+    rng = random.Random(seed)
+    operations, cumulative_weights = list(weights), []
+    total = 0
+    for operation in operations:
+        total += weights[operation]
+        cumulative_weights.append(total)
+
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, cum_weights=cumulative_weights)[0]
+        method, path, payload = build_request(operation, task_ids, rng)
+        body = json.dumps(payload) if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        start = time.perf_counter_ns()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            status, data = 0, b""
+        recorder.record(operation, time.perf_counter_ns() - start, status)
+        if operation == "create" and status == 201:
+            task_ids.add(json.loads(data)["id"])
+    connection.close()
+
+
+@contextmanager
+def local_server(backend: str, seed_tasks: int) -> Iterator[str]:
+    with tempfile.TemporaryDirectory() as workdir:
+        if backend == "memory":
+            repository = InMemoryTaskRepository()
+        else:
+            repository = SQLiteTaskRepository(Path(workdir) / "load-test.db")
+        service = TaskService(repository)
+        service.add_tasks([(f"seed task {n}", date.today() + timedelta(days=n % 60)) for n in range(seed_tasks)])
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        server = make_server("127.0.0.1", 0, create_app(service), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}"
+        finally:
+            server.shutdown()
+            if hasattr(repository, "close"):
+                repository.close()
+
+
+def fetch_task_ids(host: str, port: int) -> List[int]:
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    task_ids, cursor = [], 0
+    while True:
+        connection.request("GET", f"{BASE_PATH}?limit=1000&cursor={cursor}")
+        page = json.loads(connection.getresponse().read())
+        task_ids.extend(task["id"] for task in page["tasks"])
+        if page["next_cursor"] is None:
+            return task_ids
+        cursor = page["next_cursor"]
+
+
+def parse_mix(mix: Optional[str], profile: str) -> Dict[str, int]:
+    if not mix:
+        return PROFILES[profile]
+    weights = {}
+    for part in mix.split(","):
+        operation, _, weight = part.partition("=")
+        if operation not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{operation}', expected one of {', '.join(OPERATIONS)}")
+        weights[operation] = int(weight)
+    return weights
+
+
+def report(recorder: Recorder, wall_seconds: float, show_histograms: bool) -> dict:
+    results = {"operations": {}}
+    all_latencies, total_errors = [], 0
+    for operation in OPERATIONS:
+        latencies = recorder.latencies.get(operation)
+        if not latencies:
+            continue
+        statuses = recorder.statuses[operation]
+        errors = sum(count for status, count in statuses.items() if status == 0 or status >= 500)
+        summary = summarize(latencies, wall_seconds)
+        total_errors += errors
+        all_latencies.extend(latencies)
+        results["operations"][operation] = {
+            **summary.to_dict(),
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            "error_rate": errors / len(latencies),
+            "histogram": histogram(latencies)
+        }
+        print(f"{format_row(operation, summary)}  errors {errors / len(latencies):.2%}")
+        if show_histograms:
+            print(format_histogram(results["operations"][operation]["histogram"]))
+
+    overall = summarize(all_latencies, wall_seconds)
+    results["overall"] = {**overall.to_dict(), "error_rate": total_errors / max(len(all_latencies), 1)}
+    print(f"{format_row('overall', overall)}  errors {results['overall']['error_rate']:.2%}")
+    print(format_histogram(histogram(all_latencies)))
+    return results
+
+
+def parse_args(argv: List[str]):
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the task manager REST API.")
+    parser.add_argument("--url", help="Target an already running server instead of starting one locally")
+    parser.add_argument("--backend", choices=("sqlite", "memory"), default="sqlite",
+                        help="Repository used by the local server")
+    parser.add_argument("--seed-tasks", type=int, default=10_000, help="Tasks created before the run")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="balanced")
+    parser.add_argument("--mix", help="Custom weights, e.g. get=70,list=10,create=20")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--histograms", action="store_true", help="Print a latency histogram per operation")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def run(url: str, args) -> dict:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    weights = parse_mix(args.mix, args.profile)
+    task_ids = TaskIds(fetch_task_ids(host, port))
+    recorder = Recorder()
+
+    print(f"driving {url} with {args.threads} threads for {args.duration:.0f}s: {weights}", flush=True)
+    deadline = time.monotonic() + args.duration
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=worker, args=(host, port, weights, deadline, args.seed + n, task_ids, recorder))
+        for n in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = report(recorder, time.perf_counter() - started, args.histograms)
+    return {"timestamp": timestamp(), "threads": args.threads, "weights": weights, **results}
+
+
+def main(argv: List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.url:
+        results = run(args.url, args)
+    else:
+        with local_server(args.backend, args.seed_tasks) as url:
+            results = run(url, args)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nresults written to {args.output}")
+    return 1 if results["overall"]["error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
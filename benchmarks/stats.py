@@ -0,0 +1,75 @@
+import math
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+
+@dataclass
+class LatencySummary:
+    count: int
+    total_seconds: float
+    ops_per_second: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_ns: List[int], wall_seconds: float = None) -> LatencySummary:
+    ordered = sorted(latencies_ns)
+    total_seconds = wall_seconds if wall_seconds is not None else sum(ordered) / 1e9
+    to_ms = 1e-6
+    return LatencySummary(
+        count=len(ordered),
+        total_seconds=total_seconds,
+        ops_per_second=len(ordered) / total_seconds if total_seconds else 0.0,
+        p50_ms=percentile(ordered, 0.50) * to_ms,
+        p90_ms=percentile(ordered, 0.90) * to_ms,
+        p99_ms=percentile(ordered, 0.99) * to_ms,
+        max_ms=(ordered[-1] if ordered else 0) * to_ms
+    )
+
+
+def format_row(name: str, summary: LatencySummary) -> str:
+    return (
+        f"{name:<32} {summary.count:>8} ops {summary.ops_per_second:>12.1f} ops/s "
+        f"p50 {summary.p50_ms:>9.3f} ms  p99 {summary.p99_ms:>9.3f} ms"
+    )
+
+
+HISTOGRAM_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def histogram(latencies_ns: List[int], buckets_ms: List[float] = HISTOGRAM_BUCKETS_MS) -> Dict[str, int]:
+    counts = {f"<={bound}ms": 0 for bound in buckets_ms}
+    counts[f">{buckets_ms[-1]}ms"] = 0
+    labels = list(counts)
+    for latency in latencies_ns:
+        latency_ms = latency / 1e6
+        index = next((i for i, bound in enumerate(buckets_ms) if latency_ms <= bound), len(buckets_ms))
+        counts[labels[index]] += 1
+    return counts
+
+
+def format_histogram(counts: Dict[str, int], width: int = 40) -> str:
+    largest = max(counts.values()) if counts else 0
+    lines = []
+    for label, count in counts.items():
+        if count:
+            bar = "#" * max(1, round(width * count / largest))
+            lines.append(f"  {label:>10} {count:>8} {bar}")
+    return "\n".join(lines)
+
+
+def timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
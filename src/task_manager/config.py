@@ -0,0 +1,65 @@
+import os
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Mapping, Optional, Union, get_args, get_origin
+from task_manager.repository import caching_task_repository as cache_defaults
+from task_manager.repository import sqlite_task_repository as sqlite_defaults
+from task_manager.repository import group_commit_writer as group_commit_defaults
+from task_manager.service import task_archiver as archive_defaults
+
+ENV_PREFIX = "TASK_MANAGER_"
+TRUE_VALUES = ("1", "true", "yes", "on")
+# Kept here rather than in task_manager.server, so reading settings does not import werkzeug.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5000
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_THREADS = 8
+
+
+@dataclass
+class Settings:
+    backend: str = "sqlite"
+    memory_snapshot_enabled: bool = False
+    db_path: Path = sqlite_defaults.DEFAULT_DB_FILE
+    pool_size: int = sqlite_defaults.DEFAULT_POOL_SIZE
+    journal_mode: str = sqlite_defaults.DEFAULT_JOURNAL_MODE
+    synchronous: str = sqlite_defaults.DEFAULT_SYNCHRONOUS
+    busy_timeout_ms: int = sqlite_defaults.DEFAULT_BUSY_TIMEOUT_MS
+    cache_size_kib: int = sqlite_defaults.DEFAULT_CACHE_SIZE_KIB
+    shard_count: int = 1
+    group_commit_enabled: bool = False
+    group_commit_max_batch_size: int = group_commit_defaults.DEFAULT_MAX_BATCH_SIZE
+    group_commit_max_delay_ms: float = group_commit_defaults.DEFAULT_MAX_DELAY_MS
+    cache_enabled: bool = False
+    cache_size: int = 1024
+    cache_ttl_seconds: Optional[float] = None
+    cache_version_check_seconds: float = cache_defaults.DEFAULT_VERSION_CHECK_SECONDS
+    metrics_enabled: bool = False
+    archive_enabled: bool = False
+    archive_after_days: int = archive_defaults.DEFAULT_ARCHIVE_AFTER_DAYS
+    archive_interval_seconds: float = archive_defaults.DEFAULT_INTERVAL_SECONDS
+    archive_batch_size: int = archive_defaults.DEFAULT_BATCH_SIZE
+    host: str = DEFAULT_HOST
+    port: int = DEFAULT_PORT
+    workers: int = DEFAULT_WORKERS
+    threads: int = DEFAULT_THREADS
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "Settings":
+        # Every field can be overridden by TASK_MANAGER_<FIELD_NAME>, e.g. TASK_MANAGER_CACHE_ENABLED=1.
+        values = {}
+        for field in fields(cls):
+            raw_value = environ.get(ENV_PREFIX + field.name.upper())
+            if raw_value is not None:
+                values[field.name] = _parse(raw_value, field.type)
+        return cls(**values)
+
+
+def _parse(raw_value: str, field_type):
+    if get_origin(field_type) is Union:
+        if raw_value == "":
+            return None
+        field_type = next(arg for arg in get_args(field_type) if arg is not type(None))
+    if field_type is bool:
+        return raw_value.lower() in TRUE_VALUES
+    return field_type(raw_value)
@@ -5,7 +5,7 @@ from typing import Optional
 OPEN = "OPEN"
 CLOSED = "CLOSED"
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: Optional[int]
     description: str
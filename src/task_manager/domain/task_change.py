@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from task_manager.domain.task import Task
+
+INSERTED = "insert"
+UPDATED = "update"
+DELETED = "delete"
+# Cursors are opaque to clients; "0" always means "from the start" and answers with a reset.
+START_CURSOR = "0"
+
+
+def cursor_to_seq(cursor: str) -> int:
+    # A single change log's cursor is its sequence number as text.
+    if not (cursor.isascii() and cursor.isdigit()):
+        raise ValueError(f"Invalid change cursor '{cursor}'")
+    return int(cursor)
+
+
+@dataclass
+class TaskChange:
+    seq: int
+    operation: str
+    task_id: int
+    # The task as it is now; None once it has been deleted.
+    task: Optional[Task] = None
+
+
+@dataclass
+class ChangeFeed:
+    # The cursor to pass back as since for the next call.
+    last_seq: str
+    changes: List[TaskChange] = field(default_factory=list)
+    # Set when changes after the requested sequence are no longer recorded; clients must refetch everything.
+    reset: bool = False
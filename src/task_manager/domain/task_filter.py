@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+
+@dataclass
+class TaskFilter:
+    status: Optional[str] = None
+    due_after: Optional[date] = None
+    due_before: Optional[date] = None
+    overdue: bool = False
+    include_archived: bool = False
+
+    def is_empty(self) -> bool:
+        return (
+            self.status is None
+            and self.due_after is None
+            and self.due_before is None
+            and not self.overdue
+            and not self.include_archived
+        )
@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, Tuple
+from task_manager.domain.task import OPEN, CLOSED
+
+OVERDUE = "overdue"
+DUE_TODAY = "today"
+DUE_NEXT_7_DAYS = "next_7_days"
+DUE_LATER = "later"
+
+
+@dataclass
+class TaskStats:
+    total: int = 0
+    by_status: Dict[str, int] = field(default_factory=lambda: {OPEN: 0, CLOSED: 0})
+    overdue: int = 0
+    # Open tasks only, by how soon they are due.
+    due: Dict[str, int] = field(default_factory=lambda: {OVERDUE: 0, DUE_TODAY: 0, DUE_NEXT_7_DAYS: 0, DUE_LATER: 0})
+
+    @classmethod
+    def from_counts(cls, counts: Iterable[Tuple[str, date, int]], today: date) -> "TaskStats":
+        stats = cls()
+        for status, due_date, count in counts:
+            stats.total += count
+            stats.by_status[status] = stats.by_status.get(status, 0) + count
+            if status == OPEN:
+                stats.due[cls._due_bucket(due_date, today)] += count
+        stats.overdue = stats.due[OVERDUE]
+        return stats
+
+    @staticmethod
+    def _due_bucket(due_date: date, today: date) -> str:
+        days = (due_date - today).days
+        if days < 0:
+            return OVERDUE
+        if days == 0:
+            return DUE_TODAY
+        if days <= 7:
+            return DUE_NEXT_7_DAYS
+        return DUE_LATER
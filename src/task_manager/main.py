@@ -1,31 +1,203 @@
+import time
+
+# Taken before the other imports, so --profile-startup can show what loading them cost.
+MODULE_LOAD_STARTED = time.perf_counter()
+
+import argparse
+import atexit
 import sys
+from pathlib import Path
+from task_manager import metrics, transfer
+from task_manager.config import Settings
+from task_manager.repository.caching_task_repository import CachingTaskRepository
+from task_manager.repository.in_memory_task_repository import InMemoryTaskRepository
+from task_manager.repository.sharded_task_repository import ShardedTaskRepository, shard_paths
 from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
+from task_manager.repository.task_repository_interface import TaskRepositoryInterface
+from task_manager.service.task_archiver import TaskArchiver
 from task_manager.service.task_service import TaskService
-from task_manager.ui.console_menu import ConsoleMenu
-from task_manager.rest_api.rest_api import create_app
+from task_manager.startup_profile import StartupProfile
+
+# The interfaces (Flask and werkzeug above all) are imported only once selected, inside the functions below.
+MODULE_LOAD_SECONDS = time.perf_counter() - MODULE_LOAD_STARTED
 
 REST_API = "REST_API"
 CONSOLE = "CONSOLE"
+SERVE = "SERVE"
+EXPORT = "EXPORT"
+IMPORT = "IMPORT"
+STDIO = "-"
+PROFILE_STARTUP = "--profile-startup"
+
+SQLITE_BACKEND = "sqlite"
+MEMORY_BACKEND = "memory"
+
+def create_sqlite_repository(settings: Settings) -> TaskRepositoryInterface:
+    if settings.shard_count > 1:
+        return ShardedTaskRepository([
+            open_sqlite_file(settings, path) for path in shard_paths(settings.db_path, settings.shard_count)
+        ])
+    return open_sqlite_file(settings, settings.db_path)
+
+def open_sqlite_file(settings: Settings, db_path: Path) -> SQLiteTaskRepository:
+    return SQLiteTaskRepository(
+        db_path,
+        pool_size=settings.pool_size,
+        journal_mode=settings.journal_mode,
+        synchronous=settings.synchronous,
+        busy_timeout_ms=settings.busy_timeout_ms,
+        cache_size_kib=settings.cache_size_kib,
+        group_commit=settings.group_commit_enabled,
+        group_commit_max_batch_size=settings.group_commit_max_batch_size,
+        group_commit_max_delay_ms=settings.group_commit_max_delay_ms
+    )
+
+def create_memory_repository(settings: Settings) -> InMemoryTaskRepository:
+    if not settings.memory_snapshot_enabled:
+        return InMemoryTaskRepository()
+
+    sqlite_repository = create_sqlite_repository(settings)
+    repository = InMemoryTaskRepository.from_repository(sqlite_repository)
+    loaded_version = repository.data_version()
+
+    def snapshot():
+        # Skipped when nothing changed, e.g. in the reloader's parent process.
+        if repository.data_version() != loaded_version:
+            repository.snapshot_to(sqlite_repository)
+
+    atexit.register(snapshot)
+    return repository
+
+def create_repository(settings: Settings):
+    if settings.backend == MEMORY_BACKEND:
+        repository = create_memory_repository(settings)
+    else:
+        repository = create_sqlite_repository(settings)
+    if settings.cache_enabled:
+        repository = CachingTaskRepository(
+            repository, settings.cache_size, settings.cache_ttl_seconds,
+            version_check_seconds=settings.cache_version_check_seconds
+        )
+    return repository
+
+def start_archiver(settings: Settings, service: TaskService) -> None:
+    if not settings.archive_enabled:
+        return
+    archiver = TaskArchiver(
+        service, settings.archive_after_days, settings.archive_interval_seconds, settings.archive_batch_size
+    )
+    atexit.register(archiver.close)
+
+def parse_transfer_args(command: str, argv):
+    parser = argparse.ArgumentParser(prog=f"task_manager {command.lower()}")
+    parser.add_argument("path", help=f"File to {'write' if command == EXPORT else 'read'}, '{STDIO}' for standard streams")
+    parser.add_argument("--format", choices=transfer.FORMATS, help="Defaults to the file extension, else ndjson")
+    if command == IMPORT:
+        parser.add_argument("--replace", action="store_true", help="Delete existing tasks first")
+    args = parser.parse_args(argv)
+    args.format = args.format or (transfer.CSV if args.path.endswith(".csv") else transfer.NDJSON)
+    return args
+
+def export_tasks(service: TaskService, argv) -> None:
+    args = parse_transfer_args(EXPORT, argv)
+    output = sys.stdout if args.path == STDIO else open(args.path, "w", encoding="utf-8", newline="")
+    try:
+        for chunk in transfer.encode(service.export_tasks(), args.format):
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+def import_tasks(service: TaskService, argv) -> None:
+    args = parse_transfer_args(IMPORT, argv)
+    source = sys.stdin if args.path == STDIO else open(args.path, encoding="utf-8", newline="")
+    try:
+        imported = service.import_tasks(transfer.decode(source, args.format), args.replace)
+    except ValueError as error:
+        sys.exit(f"Importação falhou: {error}")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"{imported} tarefas importadas.", file=sys.stderr)
+
+def serve(settings: Settings, profile: StartupProfile) -> None:
+    if settings.backend == MEMORY_BACKEND and settings.workers > 1:
+        sys.exit("O backend em memória não pode ser compartilhado entre workers; use TASK_MANAGER_WORKERS=1.")
+
+    with profile.step("interface"):
+        from task_manager import server
+        from task_manager.rest_api.rest_api import create_app
+
+    def create_worker_app():
+        # Runs in each worker after fork, so no worker shares the parent's connections or threads.
+        service = TaskService(create_repository(settings))
+        start_archiver(settings, service)
+        return create_app(service)
+
+    with profile.step("socket"):
+        listener = server.bind(settings.host, settings.port)
+    profile.report()
+    print(
+        f"Servindo em http://{settings.host}:{listener.getsockname()[1]} "
+        f"({settings.workers} workers x {settings.threads} threads)",
+        file=sys.stderr
+    )
+    server.serve(create_worker_app, listener, settings.workers, settings.threads)
+
+def run_console(service: TaskService, profile: StartupProfile) -> None:
+    with profile.step("interface"):
+        from task_manager.ui.console_menu import ConsoleMenu
+        # Inject service into UI
+        menu = ConsoleMenu(service)
+    profile.report()
+    menu.show()
+
+def run_rest_api(service: TaskService, profile: StartupProfile) -> None:
+    with profile.step("interface"):
+        from task_manager.rest_api.rest_api import create_app
+        # Inject service into API
+        app = create_app(service)
+    profile.report()
+    app.run(debug=True)
 
 def main():
-    # Composition Root: Create dependencies
-    repository = SQLiteTaskRepository()
-    service = TaskService(repository)
+    profile = StartupProfile(PROFILE_STARTUP in sys.argv, MODULE_LOAD_STARTED)
+    profile.record("módulos", MODULE_LOAD_SECONDS)
+    argv = [arg for arg in sys.argv[1:] if arg != PROFILE_STARTUP]
+
+    with profile.step("configuração"):
+        settings = Settings.from_env()
+        metrics.registry.enabled = settings.metrics_enabled
 
     interface_type = REST_API
     
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].upper()
-        if arg in [REST_API, CONSOLE]:
+    if argv:
+        arg = argv[0].upper()
+        if arg in [REST_API, CONSOLE, EXPORT, IMPORT, SERVE]:
             interface_type = arg
 
-    if interface_type == CONSOLE:
-        # Inject service into UI
-        ConsoleMenu(service).show()
+    if interface_type == SERVE:
+        serve(settings, profile)
+        return
+
+    # Composition Root: Create dependencies
+    with profile.step("repositório"):
+        repository = create_repository(settings)
+    with profile.step("serviço"):
+        service = TaskService(repository)
+
+    if interface_type == EXPORT:
+        profile.report()
+        export_tasks(service, argv[1:])
+    elif interface_type == IMPORT:
+        profile.report()
+        import_tasks(service, argv[1:])
+    elif interface_type == CONSOLE:
+        start_archiver(settings, service)
+        run_console(service, profile)
     else:
-        # Inject service into API
-        app = create_app(service)
-        app.run(debug=True)
+        start_archiver(settings, service)
+        run_rest_api(service, profile)
 
 if __name__ == "__main__":
     main()
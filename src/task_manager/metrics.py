@@ -0,0 +1,112 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Dict, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+METRIC_PREFIX = "task_manager"
+
+_DISABLED = nullcontext()
+
+
+class Histogram:
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = {}
+
+    def observe(self, layer: str, operation: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((layer, operation))
+            if histogram is None:
+                histogram = self._histograms[(layer, operation)] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def timer(self, layer: str, operation: str):
+        if not self.enabled:
+            return _DISABLED
+        return self._timer(layer, operation)
+
+    @contextmanager
+    def _timer(self, layer: str, operation: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment("errors_total", layer=layer, operation=operation)
+            raise
+        finally:
+            self.observe(layer, operation, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        name = f"{METRIC_PREFIX}_operation_duration_seconds"
+        lines = [
+            f"# HELP {name} Latency of instrumented operations by layer.",
+            f"# TYPE {name} histogram"
+        ]
+        for (layer, operation), histogram in histograms:
+            labels = f'layer="{layer}",operation="{operation}"'
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        for counter_name in sorted({counter for (counter, _), _ in counters}):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{counter_name} counter")
+            for (current, labels), value in counters:
+                if current == counter_name:
+                    rendered = ",".join(f'{key}="{label}"' for key, label in labels)
+                    lines.append(f"{METRIC_PREFIX}_{counter_name}{{{rendered}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def timed(layer: str):
+    def decorate(function):
+        operation = function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            # Disabled instrumentation costs a single attribute check per call.
+            if not registry.enabled:
+                return function(*args, **kwargs)
+            with registry._timer(layer, operation):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import date
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+from task_manager.domain.task import Task
+from task_manager.domain.task_change import START_CURSOR, ChangeFeed
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository.task_repository_interface import TaskRepositoryInterface
+
+DEFAULT_CACHE_SIZE = 1024
+# How stale an entry may get after another process changes its task.
+DEFAULT_VERSION_CHECK_SECONDS = 1.0
+CHANGE_PAGE_SIZE = 500
+
+
+class CachingTaskRepository(TaskRepositoryInterface):
+
+    def __init__(
+        self,
+        repository: TaskRepositoryInterface,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        version_check_seconds: float = DEFAULT_VERSION_CHECK_SECONDS
+    ):
+        self._repository = repository
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[int, Tuple[Task, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every write so a read that raced with it does not cache a stale row.
+        self._generation = 0
+        # Other processes (SERVE workers, a CLI import) write the same file without calling
+        # _invalidate here. At most every version_check_seconds a lookup reads the data version and,
+        # when it moved, evicts the ids the change feed lists since the last check.
+        self._version_check_seconds = version_check_seconds
+        self._next_version_check = float("-inf")
+        self._version_lock = threading.Lock()
+        self._data_version = None
+        self._change_cursor = START_CURSOR
+        self.hits = 0
+        self.misses = 0
+
+    def find_all(self) -> List[Task]:
+        return self._repository.find_all()
+
+    def find_page(self, after_id: Optional[int], limit: int) -> List[Task]:
+        return self._repository.find_page(after_id, limit)
+
+    def find_by_filter(
+        self, task_filter: TaskFilter, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Task]:
+        return self._repository.find_by_filter(task_filter, after_id, limit)
+
+    def iter_all(self, batch_size: int = 500, task_filter: Optional[TaskFilter] = None) -> Iterator[Task]:
+        return self._repository.iter_all(batch_size, task_filter)
+
+    def search(self, query: str, limit: int) -> List[Task]:
+        return self._repository.search(query, limit)
+
+    def find_by_id(self, task_id: int) -> Optional[Task]:
+        self._check_data_version()
+        cached = self._get(task_id)
+        if cached:
+            return cached
+
+        generation = self._generation
+        task = self._repository.find_by_id(task_id)
+        if task:
+            self._put([task], generation)
+        return task
+
+    def find_by_ids(self, task_ids: List[int]) -> List[Task]:
+        self._check_data_version()
+        tasks_by_id = {}
+        missing = []
+        for task_id in task_ids:
+            cached = self._get(task_id)
+            if cached:
+                tasks_by_id[task_id] = cached
+            else:
+                missing.append(task_id)
+
+        if missing:
+            generation = self._generation
+            loaded = self._repository.find_by_ids(missing)
+            self._put(loaded, generation)
+            tasks_by_id.update((task.id, task) for task in loaded)
+        return [tasks_by_id[task_id] for task_id in sorted(tasks_by_id)]
+
+    def save(self, task: Task) -> None:
+        self._repository.save(task)
+
+    def save_many(self, tasks: List[Task]) -> None:
+        self._repository.save_many(tasks)
+
+    def update(self, task: Task) -> None:
+        self._repository.update(task)
+        self._invalidate([task.id])
+
+    def update_many(self, tasks: List[Task]) -> None:
+        self._repository.update_many(tasks)
+        self._invalidate([task.id for task in tasks])
+
+    def update_details(self, task_id: int, description: str, due_date: date) -> Optional[Task]:
+        result = self._repository.update_details(task_id, description, due_date)
+        self._invalidate([task_id])
+        return result
+
+    def update_details_many(self, items: List[Tuple[int, str, date]]) -> List[Task]:
+        result = self._repository.update_details_many(items)
+        self._invalidate([task_id for task_id, _, _ in items])
+        return result
+
+    def update_status(self, task_id: int, status: str) -> Optional[Task]:
+        result = self._repository.update_status(task_id, status)
+        self._invalidate([task_id])
+        return result
+
+    def update_status_many(self, task_ids: List[int], status: str) -> List[Task]:
+        result = self._repository.update_status_many(task_ids, status)
+        self._invalidate(task_ids)
+        return result
+
+    def delete(self, task_id: int) -> Optional[Task]:
+        result = self._repository.delete(task_id)
+        self._invalidate([task_id])
+        return result
+
+    def delete_many(self, task_ids: List[int]) -> List[Task]:
+        result = self._repository.delete_many(task_ids)
+        self._invalidate(task_ids)
+        return result
+
+    def import_tasks(self, tasks: Iterable[Task], replace_existing: bool = False) -> int:
+        try:
+            return self._repository.import_tasks(tasks, replace_existing)
+        finally:
+            # Imports may overwrite any id, and a failed one may still have replaced rows.
+            with self._lock:
+                self._generation += 1
+                self._entries.clear()
+
+    def archive_closed_tasks(self, closed_before: date, limit: int) -> int:
+        # Archived tasks are still found by id, unchanged, so cached entries stay valid.
+        return self._repository.archive_closed_tasks(closed_before, limit)
+
+    def compact(self) -> None:
+        self._repository.compact()
+
+    def task_counts(self) -> List[Tuple[str, date, int]]:
+        return self._repository.task_counts()
+
+    def find_changes(self, since: str, limit: int) -> ChangeFeed:
+        return self._repository.find_changes(since, limit)
+
+    def max_task_id(self) -> Optional[int]:
+        return self._repository.max_task_id()
+
+    def data_version(self) -> int:
+        return self._repository.data_version()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_data_version(self) -> None:
+        # Lookups arriving while another thread checks keep using the entries they find.
+        if self._clock() < self._next_version_check or not self._version_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_version_check = self._clock() + self._version_check_seconds
+            version = self._repository.data_version()
+            if version == self._data_version:
+                return
+            changed_ids, reset = self._read_changes()
+            with self._lock:
+                self._generation += 1
+                if reset:
+                    self._entries.clear()
+                for task_id in changed_ids:
+                    self._entries.pop(task_id, None)
+            self._data_version = version
+        finally:
+            self._version_lock.release()
+
+    def _read_changes(self) -> Tuple[Set[int], bool]:
+        # Own writes show up here as well; their entries are already gone, so popping them is harmless.
+        changed_ids = set()
+        while True:
+            feed = self._repository.find_changes(self._change_cursor, CHANGE_PAGE_SIZE)
+            self._change_cursor = feed.last_seq
+            if feed.reset:
+                return changed_ids, True
+            changed_ids.update(change.task_id for change in feed.changes)
+            if len(feed.changes) < CHANGE_PAGE_SIZE:
+                return changed_ids, False
+
+    def _get(self, task_id: int) -> Optional[Task]:
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry and (self._ttl_seconds is None or entry[1] > self._clock()):
+                self._entries.move_to_end(task_id)
+                self.hits += 1
+                # Hand out copies so callers mutating a task cannot corrupt the cache.
+                return replace(entry[0])
+            if entry:
+                del self._entries[task_id]
+            self.misses += 1
+            return None
+
+    def _put(self, tasks: List[Task], generation: int) -> None:
+        expires_at = self._clock() + self._ttl_seconds if self._ttl_seconds is not None else 0.0
+        with self._lock:
+            if generation != self._generation:
+                return
+            for task in tasks:
+                self._entries[task.id] = (replace(task), expires_at)
+                self._entries.move_to_end(task.id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def _invalidate(self, task_ids: List[int]) -> None:
+        with self._lock:
+            self._generation += 1
+            for task_id in task_ids:
+                self._entries.pop(task_id, None)
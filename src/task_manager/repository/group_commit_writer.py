@@ -0,0 +1,99 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+from task_manager.repository.sqlite_connection_pool import SQLiteConnectionPool
+
+T = TypeVar("T")
+Operation = Callable[[sqlite3.Connection], T]
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_DELAY_MS = 0.0
+
+_STOP = None
+
+
+class GroupCommitWriter:
+
+    def __init__(
+        self,
+        pool: SQLiteConnectionPool,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_delay_ms: float = DEFAULT_MAX_DELAY_MS
+    ):
+        self._pool = pool
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay_ms / 1000
+        self._queue: "queue.Queue[Optional[Tuple[Operation, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sqlite-group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, operation: Operation) -> T:
+        future = Future()
+        self._queue.put((operation, future))
+        # Only resolved once the transaction holding the operation has been committed.
+        return future.result()
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = self._fill(batch)
+            self._commit(batch)
+
+    def _fill(self, batch: List[Tuple[Operation, Future]]) -> bool:
+        # Whatever queued up while the previous batch was committing joins this one; a positive
+        # max delay additionally waits for stragglers before paying for the commit.
+        deadline = time.monotonic() + self._max_delay
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _commit(self, batch: List[Tuple[Operation, Future]]) -> None:
+        outcomes = []
+        try:
+            with self._pool.connection() as connection:
+                # Take the write lock up front: a deferred transaction that reads first can fail
+                # with SQLITE_BUSY instead of waiting when another process writes in between.
+                connection.execute("BEGIN IMMEDIATE")
+                for operation, future in batch:
+                    outcomes.append((future, *self._apply(connection, operation)))
+                connection.commit()
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _apply(self, connection: sqlite3.Connection, operation: Operation):
+        # Each operation runs in its own savepoint so a failing one does not undo its batch mates.
+        connection.execute("SAVEPOINT operation")
+        try:
+            result = operation(connection)
+        except Exception as error:
+            connection.execute("ROLLBACK TO operation")
+            connection.execute("RELEASE operation")
+            return None, error
+        connection.execute("RELEASE operation")
+        return result, None
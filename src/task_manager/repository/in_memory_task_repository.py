@@ -0,0 +1,282 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from task_manager.domain.task import Task, OPEN
+from task_manager.domain.task_change import ChangeFeed, TaskChange, INSERTED, UPDATED, DELETED, cursor_to_seq
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository.sqlite_migrations import CHANGE_LOG_SIZE
+from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
+from task_manager.repository.task_repository_interface import TaskRepositoryInterface
+from task_manager.repository.text_search import tokenize
+
+
+class InMemoryTaskRepository(TaskRepositoryInterface):
+
+    def __init__(self, tasks: Iterable[Task] = (), next_id: int = 1):
+        self._lock = threading.RLock()
+        self._tasks: Dict[int, Task] = {}
+        self._ids: List[int] = []
+        self._ids_by_status: Dict[str, Set[int]] = defaultdict(set)
+        # Sorted (due date ordinal, id) pairs, so date ranges are found by bisection.
+        self._due_index: List[Tuple[int, int]] = []
+        self._ids_by_word: Dict[str, Set[int]] = defaultdict(set)
+        self._counts: Counter = Counter()
+        self._next_id = next_id
+        self._version = 0
+        # Latest (seq, operation) per task id, kept in seq order; changes up to _log_start are lost.
+        self._changes: "OrderedDict[int, Tuple[int, str]]" = OrderedDict()
+        self._change_seq = 0
+        self._log_start = 0
+        self.load(tasks)
+
+    @classmethod
+    def from_repository(cls, source: TaskRepositoryInterface) -> "InMemoryTaskRepository":
+        # Only active tasks are loaded, but archived ones keep their ids; new tasks must not reuse them.
+        max_task_id = source.max_task_id()
+        return cls(source.iter_all(), next_id=1 if max_task_id is None else max(1, max_task_id + 1))
+
+    def snapshot_to(self, target: SQLiteTaskRepository) -> None:
+        with self._lock:
+            tasks = list(self._tasks.values())
+        target.replace_all(tasks)
+
+    def load(self, tasks: Iterable[Task]) -> None:
+        with self._lock:
+            self._tasks = {task.id: replace(task) for task in tasks}
+            self._ids = sorted(self._tasks)
+            self._ids_by_status = defaultdict(set)
+            for task in self._tasks.values():
+                self._ids_by_status[task.status].add(task.id)
+            self._due_index = sorted((task.due_date.toordinal(), task.id) for task in self._tasks.values())
+            self._counts = Counter((task.status, task.due_date) for task in self._tasks.values())
+            self._ids_by_word = defaultdict(set)
+            for task in self._tasks.values():
+                for word in tokenize(task.description):
+                    self._ids_by_word[word].add(task.id)
+            self._next_id = max(self._next_id, self._ids[-1] + 1) if self._ids else self._next_id
+            self._version += 1
+            self._changes.clear()
+            self._change_seq += 1
+            self._log_start = self._change_seq
+
+    def find_all(self) -> List[Task]:
+        with self._lock:
+            return [replace(self._tasks[task_id]) for task_id in self._ids]
+
+    def find_page(self, after_id: Optional[int], limit: int) -> List[Task]:
+        with self._lock:
+            start = 0 if after_id is None else bisect_right(self._ids, after_id)
+            return [replace(self._tasks[task_id]) for task_id in self._ids[start:start + limit]]
+
+    def find_by_filter(
+        self, task_filter: TaskFilter, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Task]:
+        with self._lock:
+            task_ids = [task_id for task_id in self._matching_ids(task_filter) if after_id is None or task_id > after_id]
+            return [replace(self._tasks[task_id]) for task_id in task_ids[:limit]]
+
+    def iter_all(self, batch_size: int = 500, task_filter: Optional[TaskFilter] = None) -> Iterator[Task]:
+        with self._lock:
+            task_ids = self._matching_ids(task_filter) if task_filter else list(self._ids)
+        for start in range(0, len(task_ids), batch_size):
+            yield from self.find_by_ids(task_ids[start:start + batch_size])
+
+    def search(self, query: str, limit: int) -> List[Task]:
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            matches = set.intersection(*(self._ids_by_word.get(word, set()) for word in words))
+            ranked = sorted(matches, key=lambda task_id: (-self._term_frequency(task_id, words), task_id))
+            return [replace(self._tasks[task_id]) for task_id in ranked[:limit]]
+
+    def find_by_id(self, task_id: int) -> Optional[Task]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return replace(task) if task else None
+
+    def find_by_ids(self, task_ids: List[int]) -> List[Task]:
+        with self._lock:
+            found = sorted(set(task_ids) & self._tasks.keys())
+            return [replace(self._tasks[task_id]) for task_id in found]
+
+    def save(self, task: Task) -> None:
+        self.save_many([task])
+
+    def save_many(self, tasks: List[Task]) -> None:
+        with self._lock:
+            for task in tasks:
+                task.id = self._next_id
+                self._next_id += 1
+                self._index(replace(task))
+            self._version += 1
+
+    def update(self, task: Task) -> None:
+        self.update_many([task])
+
+    def update_many(self, tasks: List[Task]) -> None:
+        with self._lock:
+            for task in tasks:
+                if task.id in self._tasks:
+                    self._reindex(task.id, description=task.description, due_date=task.due_date, status=task.status)
+            self._version += 1
+
+    def update_details(self, task_id: int, description: str, due_date: date) -> Optional[Task]:
+        updated = self.update_details_many([(task_id, description, due_date)])
+        return updated[0] if updated else None
+
+    def update_details_many(self, items: List[Tuple[int, str, date]]) -> List[Task]:
+        with self._lock:
+            updated = [
+                self._reindex(task_id, description=description, due_date=due_date)
+                for task_id, description, due_date in items if task_id in self._tasks
+            ]
+            self._version += 1
+            return updated
+
+    def update_status(self, task_id: int, status: str) -> Optional[Task]:
+        updated = self.update_status_many([task_id], status)
+        return updated[0] if updated else None
+
+    def update_status_many(self, task_ids: List[int], status: str) -> List[Task]:
+        with self._lock:
+            updated = [self._reindex(task_id, status=status) for task_id in task_ids if task_id in self._tasks]
+            self._version += 1
+            return updated
+
+    def delete(self, task_id: int) -> Optional[Task]:
+        deleted = self.delete_many([task_id])
+        return deleted[0] if deleted else None
+
+    def delete_many(self, task_ids: List[int]) -> List[Task]:
+        with self._lock:
+            deleted = [self._unindex(task_id) for task_id in task_ids if task_id in self._tasks]
+            self._version += 1
+            return deleted
+
+    def import_tasks(self, tasks: Iterable[Task], replace_existing: bool = False) -> int:
+        # Read the whole input first, so a slow source does not hold the lock every request needs.
+        tasks = list(tasks)
+        with self._lock:
+            existing = [] if replace_existing else list(self._tasks.values())
+            task_ids = {task.id for task in existing}
+            next_id = self._next_id
+            imported = []
+            for task in tasks:
+                task = replace(task, id=next_id if task.id is None else task.id)
+                if task.id in task_ids:
+                    raise ValueError(f"Imported tasks conflict with existing ones: duplicate id {task.id}")
+                task_ids.add(task.id)
+                next_id = max(next_id, task.id + 1)
+                imported.append(task)
+            self.load(existing + imported)
+            return len(imported)
+
+    def archive_closed_tasks(self, closed_before: date, limit: int) -> int:
+        # There is no table or index scan to keep small here, so closed tasks simply stay.
+        return 0
+
+    def compact(self) -> None:
+        pass
+
+    def task_counts(self) -> List[Tuple[str, date, int]]:
+        with self._lock:
+            return [(status, due_date, count) for (status, due_date), count in self._counts.items()]
+
+    def find_changes(self, since: str, limit: int) -> ChangeFeed:
+        since = cursor_to_seq(since)
+        with self._lock:
+            if since < self._log_start or since > self._change_seq:
+                return ChangeFeed(str(self._change_seq), reset=True)
+            newer = []
+            for task_id, (seq, operation) in reversed(self._changes.items()):
+                if seq <= since:
+                    break
+                newer.append(TaskChange(seq, operation, task_id, self.find_by_id(task_id)))
+            newer.reverse()
+            changes = newer[:limit]
+            return ChangeFeed(str(changes[-1].seq if len(changes) == limit else self._change_seq), changes)
+
+    def max_task_id(self) -> Optional[int]:
+        with self._lock:
+            return self._ids[-1] if self._ids else None
+
+    def data_version(self) -> int:
+        return self._version
+
+    def _matching_ids(self, task_filter: TaskFilter) -> List[int]:
+        status = task_filter.status
+        due_after, due_before = task_filter.due_after, task_filter.due_before
+        if task_filter.overdue:
+            if status not in (None, OPEN):
+                return []
+            status = OPEN
+            yesterday = date.today() - timedelta(days=1)
+            due_before = min(due_before, yesterday) if due_before else yesterday
+
+        candidates = None
+        if due_after is not None or due_before is not None:
+            low = bisect_left(self._due_index, (due_after.toordinal(),)) if due_after else 0
+            high = bisect_left(self._due_index, (due_before.toordinal() + 1,)) if due_before else len(self._due_index)
+            candidates = {task_id for _, task_id in self._due_index[low:high]}
+        if status is not None:
+            by_status = self._ids_by_status.get(status, set())
+            candidates = by_status if candidates is None else candidates & by_status
+        return sorted(candidates) if candidates is not None else list(self._ids)
+
+    def _term_frequency(self, task_id: int, words: List[str]) -> float:
+        description_words = tokenize(self._tasks[task_id].description)
+        return sum(description_words.count(word) for word in words) / len(description_words)
+
+    def _index(self, task: Task) -> None:
+        # New ids are always the largest, so this insort is an append.
+        insort(self._ids, task.id)
+        self._tasks[task.id] = task
+        self._index_attributes(task)
+        self._record_change(task.id, INSERTED)
+
+    def _unindex(self, task_id: int) -> Task:
+        task = self._tasks.pop(task_id)
+        del self._ids[bisect_left(self._ids, task_id)]
+        self._unindex_attributes(task)
+        self._record_change(task_id, DELETED)
+        return task
+
+    def _reindex(self, task_id: int, **changes) -> Task:
+        previous = self._tasks[task_id]
+        task = replace(previous, **changes)
+        self._unindex_attributes(previous)
+        self._index_attributes(task)
+        self._tasks[task_id] = task
+        self._record_change(task_id, UPDATED)
+        return replace(task)
+
+    def _record_change(self, task_id: int, operation: str) -> None:
+        self._change_seq += 1
+        self._changes.pop(task_id, None)
+        self._changes[task_id] = (self._change_seq, operation)
+        if len(self._changes) > CHANGE_LOG_SIZE:
+            _, (seq, _) = self._changes.popitem(last=False)
+            self._log_start = seq
+
+    def _index_attributes(self, task: Task) -> None:
+        self._ids_by_status[task.status].add(task.id)
+        insort(self._due_index, (task.due_date.toordinal(), task.id))
+        self._counts[task.status, task.due_date] += 1
+        for word in tokenize(task.description):
+            self._ids_by_word[word].add(task.id)
+
+    def _unindex_attributes(self, task: Task) -> None:
+        self._ids_by_status[task.status].discard(task.id)
+        del self._due_index[bisect_left(self._due_index, (task.due_date.toordinal(), task.id))]
+        self._counts[task.status, task.due_date] -= 1
+        if not self._counts[task.status, task.due_date]:
+            del self._counts[task.status, task.due_date]
+        for word in tokenize(task.description):
+            words = self._ids_by_word[word]
+            words.discard(task.id)
+            if not words:
+                del self._ids_by_word[word]
@@ -0,0 +1,301 @@
+import heapq
+import itertools
+import queue
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from task_manager.domain.task import Task
+from task_manager.domain.task_change import START_CURSOR, ChangeFeed
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
+from task_manager.repository.task_repository_interface import TaskRepositoryInterface
+
+IMPORT_QUEUE_SIZE = 10000
+CURSOR_SEPARATOR = "."
+_END_OF_IMPORT = object()
+
+def shard_paths(db_path: Path, shard_count: int) -> List[Path]:
+    return [db_path.with_name(f"{db_path.stem}-{index}{db_path.suffix}") for index in range(shard_count)]
+
+
+class ShardedTaskRepository(TaskRepositoryInterface):
+    # Global ids are local_id * shard_count + shard_index, so an id alone names its shard and the
+    # global order of ids interleaves the shards' local orders. The shard count is fixed once data exists.
+
+    def __init__(self, shards: List[SQLiteTaskRepository]):
+        self._shards = shards
+        self._count = len(shards)
+        self._executor = ThreadPoolExecutor(max_workers=self._count, thread_name_prefix="shard")
+        # next() on itertools.count is atomic, so concurrent inserts still spread evenly.
+        self._next_shard = itertools.count()
+
+    def find_all(self) -> List[Task]:
+        return self._merge(self._query_shards(lambda shard, index: shard.find_all()))
+
+    def find_page(self, after_id: Optional[int], limit: int) -> List[Task]:
+        return self._merge(
+            self._query_shards(lambda shard, index: shard.find_page(self._local_after(after_id, index), limit)),
+            limit
+        )
+
+    def find_by_filter(
+        self, task_filter: TaskFilter, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Task]:
+        return self._merge(
+            self._query_shards(
+                lambda shard, index: shard.find_by_filter(task_filter, self._local_after(after_id, index), limit)
+            ),
+            limit
+        )
+
+    def iter_all(self, batch_size: int = 500, task_filter: Optional[TaskFilter] = None) -> Iterator[Task]:
+        # Every shard streams in id order, so a lazy k-way merge keeps the global order.
+        return heapq.merge(
+            *(self._globalize(shard.iter_all(batch_size, task_filter), index) for index, shard in enumerate(self._shards)),
+            key=lambda task: task.id
+        )
+
+    def search(self, query: str, limit: int) -> List[Task]:
+        # Relevance scores are per shard, so results are interleaved by each shard's own ranking.
+        ranked = self._query_shards(lambda shard, index: shard.search(query, limit))
+        interleaved = itertools.chain.from_iterable(itertools.zip_longest(*ranked))
+        return [task for task in interleaved if task is not None][:limit]
+
+    def find_by_id(self, task_id: int) -> Optional[Task]:
+        index, local_id = self._locate(task_id)
+        return self._globalize_one(self._shards[index].find_by_id(local_id), index)
+
+    def find_by_ids(self, task_ids: List[int]) -> List[Task]:
+        return self._merge(self._route_ids(task_ids, lambda shard, local_ids: shard.find_by_ids(local_ids)))
+
+    def save(self, task: Task) -> None:
+        index = self._pick_shard()
+        self._shards[index].save(task)
+        task.id = self._global_id(task.id, index)
+
+    def save_many(self, tasks: List[Task]) -> None:
+        # The whole batch goes to one shard, so it stays a single transaction.
+        index = self._pick_shard()
+        self._shards[index].save_many(tasks)
+        for task in tasks:
+            task.id = self._global_id(task.id, index)
+
+    def update(self, task: Task) -> None:
+        index, local_id = self._locate(task.id)
+        self._shards[index].update(replace(task, id=local_id))
+
+    def update_many(self, tasks: List[Task]) -> None:
+        self._route(self._localize(tasks), lambda shard, local_tasks: shard.update_many(local_tasks))
+
+    def update_details(self, task_id: int, description: str, due_date: date) -> Optional[Task]:
+        index, local_id = self._locate(task_id)
+        return self._globalize_one(self._shards[index].update_details(local_id, description, due_date), index)
+
+    def update_details_many(self, items: List[Tuple[int, str, date]]) -> List[Task]:
+        by_shard = defaultdict(list)
+        for task_id, description, due_date in items:
+            index, local_id = self._locate(task_id)
+            by_shard[index].append((local_id, description, due_date))
+        return self._merge(self._route(by_shard, lambda shard, local_items: shard.update_details_many(local_items)))
+
+    def update_status(self, task_id: int, status: str) -> Optional[Task]:
+        index, local_id = self._locate(task_id)
+        return self._globalize_one(self._shards[index].update_status(local_id, status), index)
+
+    def update_status_many(self, task_ids: List[int], status: str) -> List[Task]:
+        return self._merge(self._route_ids(task_ids, lambda shard, local_ids: shard.update_status_many(local_ids, status)))
+
+    def delete(self, task_id: int) -> Optional[Task]:
+        index, local_id = self._locate(task_id)
+        return self._globalize_one(self._shards[index].delete(local_id), index)
+
+    def delete_many(self, task_ids: List[int]) -> List[Task]:
+        return self._merge(self._route_ids(task_ids, lambda shard, local_ids: shard.delete_many(local_ids)))
+
+    def replace_all(self, tasks: List[Task]) -> None:
+        # Every shard is rewritten, including those left without tasks.
+        by_shard = {index: [] for index in range(self._count)}
+        by_shard.update(self._localize(tasks))
+        self._route(by_shard, lambda shard, local_tasks: shard.replace_all(local_tasks))
+
+    def import_tasks(self, tasks: Iterable[Task], replace_existing: bool = False) -> int:
+        # Each shard loads its share in its own transaction while this thread routes the input,
+        # so the dump is streamed rather than split in memory. Atomic per shard, not across shards.
+        # The loads get their own threads: on the shared executor they would hold every fan-out
+        # thread for the whole import and stall queries, data_version and stats behind it.
+        queues = [queue.Queue(maxsize=IMPORT_QUEUE_SIZE) for _ in self._shards]
+        with ThreadPoolExecutor(max_workers=self._count, thread_name_prefix="shard-import") as executor:
+            futures = [
+                executor.submit(shard.import_tasks, self._drain(queues[index]), replace_existing)
+                for index, shard in enumerate(self._shards)
+            ]
+            try:
+                for task in tasks:
+                    if task.id is None:
+                        index = self._pick_shard()
+                        self._put(queues[index], futures[index], task)
+                    else:
+                        index, local_id = self._locate(task.id)
+                        self._put(queues[index], futures[index], replace(task, id=local_id))
+            except BaseException as error:
+                for index, shard_queue in enumerate(queues):
+                    self._put(shard_queue, futures[index], error, required=False)
+                # Let every shard roll back before the caller sees the error.
+                wait(futures)
+                raise
+            for index, shard_queue in enumerate(queues):
+                self._put(shard_queue, futures[index], _END_OF_IMPORT, required=False)
+            return sum(future.result() for future in futures)
+
+    def archive_closed_tasks(self, closed_before: date, limit: int) -> int:
+        # Up to limit per shard; a shard with more left moves exactly limit, so callers looping
+        # until fewer than limit are moved still drain every shard.
+        return sum(self._executor.map(lambda shard: shard.archive_closed_tasks(closed_before, limit), self._shards))
+
+    def compact(self) -> None:
+        list(self._executor.map(lambda shard: shard.compact(), self._shards))
+
+    def task_counts(self) -> List[Tuple[str, date, int]]:
+        counts = Counter()
+        for shard_counts in self._executor.map(lambda shard: shard.task_counts(), self._shards):
+            for status, due_date, count in shard_counts:
+                counts[status, due_date] += count
+        return [(status, due_date, count) for (status, due_date), count in counts.items()]
+
+    def find_changes(self, since: str, limit: int) -> ChangeFeed:
+        # Each shard numbers its changes independently, so the cursor lists every shard's own
+        # position, e.g. "12.7.30"; a change's seq is the one of its shard.
+        positions = self._change_positions(since)
+        feeds = list(self._executor.map(
+            lambda shard, position: shard.find_changes(position, limit), self._shards, positions
+        ))
+        if any(feed.reset for feed in feeds):
+            # The client refetches everything; shards that did not reset may then repeat a few changes.
+            return ChangeFeed(CURSOR_SEPARATOR.join(feed.last_seq for feed in feeds), reset=True)
+
+        # Interleaved like search results, then cut to limit; a shard whose changes were cut resumes
+        # after the last one returned.
+        interleaved = itertools.chain.from_iterable(itertools.zip_longest(
+            *([(index, change) for change in feed.changes] for index, feed in enumerate(feeds))
+        ))
+        taken = [item for item in interleaved if item is not None][:limit]
+        taken_per_shard = Counter(index for index, _ in taken)
+        for index, change in taken:
+            positions[index] = str(change.seq)
+        for index, feed in enumerate(feeds):
+            if taken_per_shard[index] == len(feed.changes):
+                positions[index] = feed.last_seq
+        changes = [
+            replace(change, task_id=self._global_id(change.task_id, index), task=self._globalize_one(change.task, index))
+            for index, change in taken
+        ]
+        return ChangeFeed(CURSOR_SEPARATOR.join(positions), changes)
+
+    def max_task_id(self) -> Optional[int]:
+        # Within a shard, global ids grow with local ids, so each shard's largest is its local maximum.
+        largest = [
+            self._global_id(local_id, index)
+            for index, local_id in enumerate(self._executor.map(lambda shard: shard.max_task_id(), self._shards))
+            if local_id is not None
+        ]
+        return max(largest, default=None)
+
+    def data_version(self) -> int:
+        # Each shard's version only grows, so their sum changes whenever any shard is written.
+        return sum(self._executor.map(lambda shard: shard.data_version(), self._shards))
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        for shard in self._shards:
+            shard.close()
+
+    def _query_shards(self, operation: Callable[[SQLiteTaskRepository, int], List[Task]]) -> List[List[Task]]:
+        return self._route({index: index for index in range(self._count)}, operation)
+
+    def _route(self, by_shard: Dict[int, object], operation: Callable[[SQLiteTaskRepository, object], Optional[List[Task]]]):
+        futures = {
+            index: self._executor.submit(operation, self._shards[index], argument)
+            for index, argument in by_shard.items()
+        }
+        results = []
+        for index, future in futures.items():
+            tasks = future.result()
+            if tasks is not None:
+                results.append([self._globalize_one(task, index) for task in tasks])
+        return results
+
+    def _route_ids(self, task_ids: List[int], operation: Callable[[SQLiteTaskRepository, List[int]], List[Task]]):
+        by_shard = defaultdict(list)
+        for task_id in task_ids:
+            index, local_id = self._locate(task_id)
+            by_shard[index].append(local_id)
+        return self._route(by_shard, operation)
+
+    def _localize(self, tasks: Iterable[Task]) -> Dict[int, List[Task]]:
+        by_shard = defaultdict(list)
+        for task in tasks:
+            index, local_id = self._locate(task.id)
+            by_shard[index].append(replace(task, id=local_id))
+        return by_shard
+
+    def _merge(self, results: List[List[Task]], limit: Optional[int] = None) -> List[Task]:
+        # Each shard's list is already in id order; Timsort merges such runs in linear time.
+        merged = sorted(itertools.chain.from_iterable(results), key=lambda task: task.id)
+        return merged if limit is None else merged[:limit]
+
+    def _globalize(self, tasks: Iterable[Task], index: int) -> Iterator[Task]:
+        for task in tasks:
+            yield self._globalize_one(task, index)
+
+    def _globalize_one(self, task: Optional[Task], index: int) -> Optional[Task]:
+        if task is not None:
+            task.id = self._global_id(task.id, index)
+        return task
+
+    def _global_id(self, local_id: int, index: int) -> int:
+        return local_id * self._count + index
+
+    def _locate(self, task_id: int) -> Tuple[int, int]:
+        return task_id % self._count, task_id // self._count
+
+    def _change_positions(self, cursor: str) -> List[str]:
+        if cursor == START_CURSOR:
+            return [START_CURSOR] * self._count
+        positions = cursor.split(CURSOR_SEPARATOR)
+        if len(positions) != self._count:
+            raise ValueError(f"Invalid change cursor '{cursor}'")
+        return positions
+
+    def _local_after(self, after_id: Optional[int], index: int) -> Optional[int]:
+        # Largest local id whose global id is <= after_id; None, like after_id, for no bound at all.
+        if after_id is None:
+            return None
+        return (after_id - index) // self._count
+
+    def _pick_shard(self) -> int:
+        return next(self._next_shard) % self._count
+
+    def _drain(self, shard_queue: queue.Queue) -> Iterator[Task]:
+        while True:
+            item = shard_queue.get()
+            if item is _END_OF_IMPORT:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def _put(self, shard_queue: queue.Queue, future: Future, item, required: bool = True) -> None:
+        # A shard that already failed stops draining its queue; stop feeding it instead of blocking.
+        while True:
+            if future.done():
+                if required:
+                    future.result()
+                return
+            try:
+                shard_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
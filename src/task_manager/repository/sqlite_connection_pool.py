@@ -0,0 +1,67 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+MEMORY_DB = ":memory:"
+
+
+class SQLiteConnectionPool:
+
+    def __init__(self, db_path: Path, size: int, pragmas: Dict[str, object], read_only: bool = False):
+        self._db_path = db_path
+        self._pragmas = pragmas
+        self.read_only = read_only and str(db_path) != MEMORY_DB
+        # Every connection to ":memory:" opens a distinct database, so it can only be shared.
+        self.size = 1 if str(db_path) == MEMORY_DB else size
+        self._idle = queue.LifoQueue(maxsize=self.size)
+        # Connections are opened on first demand, so startup pays for one rather than the whole pool.
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            if connection.in_transaction:
+                connection.rollback()
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            created = self._created
+        for _ in range(created):
+            self._idle.get().close()
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if not can_create:
+            return self._idle.get()
+        try:
+            return self._connect()
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            # mode=ro makes SQLite itself reject writes; the file must already exist.
+            uri = f"{self._db_path.resolve().as_uri()}?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self._db_path, check_same_thread=False)
+        for name, value in self._pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
@@ -0,0 +1,281 @@
+import sqlite3
+from typing import Callable, List
+
+# julianday('0001-01-01') - 1, so that julianday(due_date) - ORDINAL_EPOCH == date.toordinal().
+ORDINAL_EPOCH = 1721424.5
+# Newest task_changes rows kept; clients further behind than this are told to resync.
+CHANGE_LOG_SIZE = 100000
+# task_changes marker written by bulk loads, which bypass the per-row change triggers.
+RESET = "reset"
+# Today as a day ordinal, evaluated by SQLite inside triggers.
+TODAY_ORDINAL = f"CAST(julianday(date('now', 'localtime')) - {ORDINAL_EPOCH} AS INTEGER)"
+
+
+def create_base_schema(connection: sqlite3.Connection) -> None:
+    # Databases created before migrations existed already have these objects, hence IF NOT EXISTS.
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            due_date TEXT NOT NULL,
+            status TEXT NOT NULL
+        )
+    """)
+    _create_indexes(connection)
+    # Single-row counter bumped by triggers, so every process sharing the file sees each write.
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS tasks_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    connection.execute("INSERT OR IGNORE INTO tasks_version (id, version) VALUES (1, 0)")
+    # External-content table: the index keeps no copy of the descriptions, triggers keep it in sync.
+    connection.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            description, content = 'tasks', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    connection.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+    _create_triggers(connection)
+
+
+def store_due_dates_as_ordinals(connection: sqlite3.Connection) -> None:
+    connection.execute("""
+        CREATE TABLE tasks_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            due_date INTEGER NOT NULL,
+            status TEXT NOT NULL
+        )
+    """)
+    connection.execute(f"""
+        INSERT INTO tasks_new (id, description, due_date, status)
+        SELECT id, description, CAST(julianday(due_date) - {ORDINAL_EPOCH} AS INTEGER), status FROM tasks
+    """)
+    # Keep AUTOINCREMENT from reusing the ids of tasks deleted before the migration.
+    connection.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks_new'")
+    connection.execute("""
+        INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks_new', seq FROM sqlite_sequence WHERE name = 'tasks'
+    """)
+    # Dropping the table drops its indexes and triggers; rowids are kept, so tasks_fts stays valid.
+    connection.execute("DROP TABLE tasks")
+    connection.execute("ALTER TABLE tasks_new RENAME TO tasks")
+    _create_indexes(connection)
+    _create_triggers(connection)
+
+
+def count_tasks_by_status_and_due_date(connection: sqlite3.Connection) -> None:
+    # One row per (status, due date) pair, so stats read a few hundred rows however many tasks exist.
+    connection.execute("""
+        CREATE TABLE task_counts (
+            status TEXT NOT NULL,
+            due_date INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (status, due_date)
+        ) WITHOUT ROWID
+    """)
+    connection.execute("""
+        INSERT INTO task_counts (status, due_date, count)
+        SELECT status, due_date, COUNT(*) FROM tasks GROUP BY status, due_date
+    """)
+    _create_count_triggers(connection)
+
+
+def record_task_changes(connection: sqlite3.Connection) -> None:
+    # AUTOINCREMENT keeps sequence numbers from being reused after the oldest rows are pruned.
+    connection.execute("""
+        CREATE TABLE task_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER,
+            operation TEXT NOT NULL
+        )
+    """)
+    connection.execute(f"""
+        CREATE TRIGGER task_changes_prune AFTER INSERT ON task_changes
+        BEGIN
+            DELETE FROM task_changes WHERE seq <= new.seq - {CHANGE_LOG_SIZE};
+        END
+    """)
+    # Changes made before the log existed were never recorded, so clients start with a resync.
+    connection.execute(f"INSERT INTO task_changes (task_id, operation) VALUES (NULL, '{RESET}')")
+    _create_change_triggers(connection)
+
+
+def archive_closed_tasks(connection: sqlite3.Connection) -> None:
+    connection.execute("ALTER TABLE tasks ADD COLUMN closed_at INTEGER")
+    # closed_at is bookkeeping, not task data: stop it from bumping the version or the change log.
+    for trigger in ("tasks_version_update", "task_changes_update"):
+        connection.execute(f"DROP TRIGGER {trigger}")
+    _create_triggers(connection)
+    _create_change_triggers(connection)
+    # The real closing day of existing tasks is unknown; their age is counted from today.
+    connection.execute(f"UPDATE tasks SET closed_at = {TODAY_ORDINAL} WHERE status = 'CLOSED'")
+    connection.execute("""
+        CREATE TABLE archived_tasks (
+            id INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            due_date INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            closed_at INTEGER
+        )
+    """)
+    _create_archive_indexes(connection)
+    _create_closed_at_triggers(connection)
+    _create_count_triggers(connection, "archived_tasks")
+
+
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    create_base_schema,
+    store_due_dates_as_ordinals,
+    count_tasks_by_status_and_due_date,
+    record_task_changes,
+    archive_closed_tasks,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection: sqlite3.Connection) -> int:
+    if schema_version(connection) == SCHEMA_VERSION:
+        return 0
+
+    # BEGIN IMMEDIATE serializes processes opening the same file; re-read the version once it is held.
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        version = schema_version(connection)
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema version {version} is newer than the supported version {SCHEMA_VERSION}"
+            )
+        for migration in MIGRATIONS[version:]:
+            migration(connection)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    return SCHEMA_VERSION - version
+
+
+def drop_indexes_and_triggers(connection: sqlite3.Connection) -> None:
+    # Bulk loads skip per-row index and trigger work, then call rebuild_indexes_and_triggers once.
+    for kind, name in connection.execute(
+        "SELECT type, name FROM sqlite_master WHERE tbl_name = 'tasks' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    ).fetchall():
+        connection.execute(f"DROP {kind.upper()} {name}")
+
+
+def rebuild_indexes_and_triggers(connection: sqlite3.Connection) -> None:
+    _create_indexes(connection)
+    _create_archive_indexes(connection)
+    connection.execute(f"UPDATE tasks SET closed_at = {TODAY_ORDINAL} WHERE status = 'CLOSED' AND closed_at IS NULL")
+    connection.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+    connection.execute("DELETE FROM task_counts")
+    connection.execute("""
+        INSERT INTO task_counts (status, due_date, count)
+        SELECT status, due_date, COUNT(*) FROM (
+            SELECT status, due_date FROM tasks UNION ALL SELECT status, due_date FROM archived_tasks
+        ) GROUP BY status, due_date
+    """)
+    connection.execute("UPDATE tasks_version SET version = version + 1 WHERE id = 1")
+    # The load was not recorded row by row, so every client has to resync.
+    connection.execute("DELETE FROM task_changes")
+    connection.execute(f"INSERT INTO task_changes (task_id, operation) VALUES (NULL, '{RESET}')")
+    _create_triggers(connection)
+    _create_count_triggers(connection)
+    _create_change_triggers(connection)
+    _create_closed_at_triggers(connection)
+
+
+def _create_indexes(connection: sqlite3.Connection) -> None:
+    connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status_due_date ON tasks (status, due_date)")
+    connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date)")
+
+
+def _create_archive_indexes(connection: sqlite3.Connection) -> None:
+    # Only closed tasks have a closed_at, so the archiver's scan skips every open one.
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_closed_at ON tasks (closed_at) WHERE closed_at IS NOT NULL"
+    )
+
+
+def _create_triggers(connection: sqlite3.Connection) -> None:
+    for event in ("INSERT", "UPDATE OF description, due_date, status", "DELETE"):
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS tasks_version_{event.split()[0].lower()} AFTER {event} ON tasks
+            BEGIN
+                UPDATE tasks_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+    connection.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+        END
+    """)
+    connection.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        END
+    """)
+    connection.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF description ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, description) VALUES ('delete', old.id, old.description);
+            INSERT INTO tasks_fts (rowid, description) VALUES (new.id, new.description);
+        END
+    """)
+
+
+def _create_count_triggers(connection: sqlite3.Connection, table: str = "tasks") -> None:
+    # Archived tasks keep being counted, so stats do not change when a task is archived.
+    prefix = "task_counts" if table == "tasks" else f"{table}_counts"
+    increment = """
+        INSERT INTO task_counts (status, due_date, count) VALUES (new.status, new.due_date, 1)
+        ON CONFLICT (status, due_date) DO UPDATE SET count = count + 1;
+    """
+    decrement = """
+        UPDATE task_counts SET count = count - 1 WHERE status = old.status AND due_date = old.due_date;
+        DELETE FROM task_counts WHERE status = old.status AND due_date = old.due_date AND count = 0;
+    """
+    connection.execute(f"CREATE TRIGGER IF NOT EXISTS {prefix}_insert AFTER INSERT ON {table} BEGIN {increment} END")
+    connection.execute(f"CREATE TRIGGER IF NOT EXISTS {prefix}_delete AFTER DELETE ON {table} BEGIN {decrement} END")
+    connection.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {prefix}_update AFTER UPDATE OF status, due_date ON {table}
+        WHEN old.status IS NOT new.status OR old.due_date IS NOT new.due_date
+        BEGIN {decrement} {increment} END
+    """)
+
+
+def _create_change_triggers(connection: sqlite3.Connection) -> None:
+    for event, row in (("INSERT", "new"), ("UPDATE OF description, due_date, status", "new"), ("DELETE", "old")):
+        operation = event.split()[0].lower()
+        connection.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS task_changes_{operation} AFTER {event} ON tasks
+            BEGIN
+                INSERT INTO task_changes (task_id, operation) VALUES ({row}.id, '{operation}');
+            END
+        """)
+
+
+def _create_closed_at_triggers(connection: sqlite3.Connection) -> None:
+    # Stamps the day a task was closed, whichever write closed it, and clears it when reopened.
+    connection.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_closed_at_insert AFTER INSERT ON tasks
+        WHEN new.status = 'CLOSED' AND new.closed_at IS NULL
+        BEGIN
+            UPDATE tasks SET closed_at = {TODAY_ORDINAL} WHERE id = new.id;
+        END
+    """)
+    connection.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_closed_at_update AFTER UPDATE OF status ON tasks
+        WHEN old.status IS NOT new.status
+        BEGIN
+            UPDATE tasks SET closed_at = CASE WHEN new.status = 'CLOSED' THEN {TODAY_ORDINAL} END WHERE id = new.id;
+        END
+    """)
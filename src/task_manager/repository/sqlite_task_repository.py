@@ -1,71 +1,439 @@
+import pickle
 import sqlite3
+import tempfile
 from datetime import date
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List
-from task_manager.domain.task import Task
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, List, Tuple, TypeVar
+from task_manager.domain.task import Task, OPEN
+from task_manager.domain.task_change import ChangeFeed, TaskChange, cursor_to_seq
+from task_manager.metrics import registry as metrics, timed
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository.group_commit_writer import (
+    DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_DELAY_MS, GroupCommitWriter
+)
+from task_manager.repository.sqlite_connection_pool import MEMORY_DB, SQLiteConnectionPool
+from task_manager.repository.sqlite_migrations import (
+    RESET, drop_indexes_and_triggers, migrate, rebuild_indexes_and_triggers
+)
 from task_manager.repository.task_repository_interface import TaskRepositoryInterface
+from task_manager.repository.text_search import to_fts_query
 
 DEFAULT_DB_FILE = Path("../../data/tasks.db")
+DEFAULT_FETCH_SIZE = 500
+MAX_IDS_PER_QUERY = 500
+IMPORT_CHUNK_SIZE = 10000
+IMPORT_SPOOL_MEMORY_BYTES = 16 * 1024 * 1024
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_JOURNAL_MODE = "WAL"
+# SQLite's own default; NORMAL is faster in WAL mode but can lose the last commits on power loss.
+DEFAULT_SYNCHRONOUS = "FULL"
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHE_SIZE_KIB = 16384
+# Sampled rows per index for ANALYZE after archiving; exact statistics are not worth a full scan.
+ANALYSIS_LIMIT = 1000
+
+TASK_COLUMNS = "id, description, due_date, status"
+SELECT_TASKS = f"SELECT {TASK_COLUMNS} FROM tasks"
+# Both tables are ordered by id, so SQLite merges them instead of sorting.
+SELECT_TASKS_WITH_ARCHIVE = (
+    f"SELECT {TASK_COLUMNS} FROM ({SELECT_TASKS} UNION ALL SELECT {TASK_COLUMNS} FROM archived_tasks)"
+)
+RETURNING_TASK = f"RETURNING {TASK_COLUMNS}"
+INSERT_TASK = "INSERT INTO tasks (description, due_date, status) VALUES (?, ?, ?)"
+INSERT_TASK_WITH_ID = "INSERT INTO tasks (id, description, due_date, status) VALUES (?, ?, ?, ?)"
+# Rows left as they are are not updated, so their triggers (version, change log, closed_at) stay quiet.
+UPSERT_TASK = (
+    f"{INSERT_TASK_WITH_ID} ON CONFLICT (id) DO UPDATE SET "
+    "description = excluded.description, due_date = excluded.due_date, status = excluded.status "
+    "WHERE description <> excluded.description OR due_date <> excluded.due_date OR status <> excluded.status"
+)
+UPDATE_TASK = "UPDATE tasks SET description = ?, due_date = ?, status = ? WHERE id = ?"
+UPDATE_DETAILS = f"UPDATE tasks SET description = ?, due_date = ? WHERE id = ? {RETURNING_TASK}"
+# Archived tasks are read-only but can still be deleted.
+DELETE_TASKS = [
+    f"DELETE FROM tasks WHERE id IN ({{}}) {RETURNING_TASK}",
+    f"DELETE FROM archived_tasks WHERE id IN ({{}}) {RETURNING_TASK}",
+]
+
+T = TypeVar("T")
+
+# Due dates are stored as day ordinals; they repeat heavily across rows, so share one date per value.
+to_date = lru_cache(maxsize=4096)(date.fromordinal)
 
 
 class SQLiteTaskRepository(TaskRepositoryInterface):
 
-    def __init__(self, db_path: Path = DEFAULT_DB_FILE):
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_FILE,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        journal_mode: str = DEFAULT_JOURNAL_MODE,
+        synchronous: str = DEFAULT_SYNCHRONOUS,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        group_commit: bool = False,
+        group_commit_max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        group_commit_max_delay_ms: float = DEFAULT_MAX_DELAY_MS
+    ):
         self._ensure_db_directory(db_path)
-        self.connection = sqlite3.connect(db_path, check_same_thread=False)
-        self._create_table()
+        pragmas = {
+            "journal_mode": journal_mode,
+            "synchronous": synchronous,
+            "busy_timeout": busy_timeout_ms,
+            # A negative cache_size is expressed in KiB instead of pages.
+            "cache_size": -cache_size_kib
+        }
+        # All writes go through one connection owned by the writer thread; reads use their own
+        # read-only pool, so in WAL mode they never queue behind a write burst.
+        # auto_vacuum only takes effect on a new file and cannot be set on a read-only connection.
+        self._write_pool = SQLiteConnectionPool(db_path, 1, {"auto_vacuum": "INCREMENTAL", **pragmas})
+        self._migrate()
+        if str(db_path) == MEMORY_DB:
+            # A ":memory:" database only exists on the connection that created it.
+            self.pool = self._write_pool
+        else:
+            # The journal mode is stored in the file, so setting it once on the write connection is enough.
+            read_pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+            self.pool = SQLiteConnectionPool(db_path, pool_size, read_pragmas, read_only=True)
+        # Without group commit every write still goes through the writer thread, one per transaction.
+        self._writer = GroupCommitWriter(
+            self._write_pool,
+            group_commit_max_batch_size if group_commit else 1,
+            group_commit_max_delay_ms if group_commit else 0
+        )
 
+    @timed("repository")
     def find_all(self) -> List[Task]:
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT id, description, due_date, status FROM tasks")
-        return [self._to_task(row) for row in cursor.fetchall()]
+        return self._query(SELECT_TASKS)
+
+    @timed("repository")
+    def find_page(self, after_id: Optional[int], limit: int) -> List[Task]:
+        return self._query(*self._keyset_query(None, after_id, limit))
 
+    @timed("repository")
+    def find_by_filter(
+        self, task_filter: TaskFilter, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Task]:
+        return self._query(*self._keyset_query(task_filter, after_id, limit))
+
+    def iter_all(
+        self, batch_size: int = DEFAULT_FETCH_SIZE, task_filter: Optional[TaskFilter] = None
+    ) -> Iterator[Task]:
+        # Keyset pages, each on a connection borrowed only for that query: a slow consumer must not
+        # hold one of the pool's few connections for the whole download. Pages are separate reads,
+        # so a write landing mid-stream is seen by the pages after it.
+        after_id = None
+        while True:
+            tasks = self._query(*self._keyset_query(task_filter, after_id, batch_size))
+            if not tasks:
+                return
+            # Read before yielding: consumers may rewrite ids, as the sharded repository does.
+            after_id = tasks[-1].id
+            yield from tasks
+            if len(tasks) < batch_size:
+                return
+
+    @timed("repository")
+    def search(self, query: str, limit: int) -> List[Task]:
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            return []
+        return self._query(
+            "SELECT t.id, t.description, t.due_date, t.status FROM tasks_fts "
+            "JOIN tasks t ON t.id = tasks_fts.rowid "
+            "WHERE tasks_fts MATCH ? ORDER BY tasks_fts.rank LIMIT ?",
+            (fts_query, limit)
+        )
+
+    @timed("repository")
     def find_by_id(self, task_id: int) -> Optional[Task]:
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT id, description, due_date, status FROM tasks WHERE id = ?", (task_id,))
-        row = cursor.fetchone()
-        return self._to_task(row) if row else None
+        # Falls back to the archive in the same statement: two primary key lookups, one round trip.
+        tasks = self._query(
+            f"{SELECT_TASKS} WHERE id = ? UNION ALL SELECT {TASK_COLUMNS} FROM archived_tasks WHERE id = ? LIMIT 1",
+            (task_id, task_id)
+        )
+        return tasks[0] if tasks else None
 
+    @timed("repository")
+    def find_by_ids(self, task_ids: List[int]) -> List[Task]:
+        tasks = []
+        for start in range(0, len(task_ids), MAX_IDS_PER_QUERY):
+            chunk = task_ids[start:start + MAX_IDS_PER_QUERY]
+            placeholders = ", ".join("?" * len(chunk))
+            tasks.extend(self._query(f"{SELECT_TASKS} WHERE id IN ({placeholders}) ORDER BY id", chunk))
+        return tasks
+
+    @timed("repository")
     def save(self, task: Task) -> None:
-        cursor = self.connection.cursor()
-        cursor.execute(
-            "INSERT INTO tasks (description, due_date, status) VALUES (?, ?, ?)",
-            (task.description, task.due_date.isoformat(), task.status)
-        )
-        self.connection.commit()
-        task.id = cursor.lastrowid
+        task.id = self._write(lambda connection: self._insert(connection, task))
+
+    @timed("repository")
+    def save_many(self, tasks: List[Task]) -> None:
+        task_ids = self._write(lambda connection: [self._insert(connection, task) for task in tasks])
+        for task, task_id in zip(tasks, task_ids):
+            task.id = task_id
 
+    @timed("repository")
     def update(self, task: Task) -> None:
-        self._execute(
-            "UPDATE tasks SET description = ?, due_date = ?, status = ? WHERE id = ?",
-            (task.description, task.due_date.isoformat(), task.status, task.id)
+        self._write(lambda connection: connection.execute(UPDATE_TASK, self._to_update_params(task)))
+
+    @timed("repository")
+    def update_many(self, tasks: List[Task]) -> None:
+        params = [self._to_update_params(task) for task in tasks]
+        self._write(lambda connection: connection.executemany(UPDATE_TASK, params))
+
+    @timed("repository")
+    def update_details(self, task_id: int, description: str, due_date: date) -> Optional[Task]:
+        tasks = self._write_returning(UPDATE_DETAILS, (description, due_date.toordinal(), task_id))
+        return tasks[0] if tasks else None
+
+    @timed("repository")
+    def update_details_many(self, items: List[Tuple[int, str, date]]) -> List[Task]:
+        def update_all(connection):
+            rows = []
+            for task_id, description, due_date in items:
+                rows.extend(connection.execute(UPDATE_DETAILS, (description, due_date.toordinal(), task_id)).fetchall())
+            return rows
+        return self._to_tasks(self._write(update_all))
+
+    @timed("repository")
+    def update_status(self, task_id: int, status: str) -> Optional[Task]:
+        tasks = self._write_returning(f"UPDATE tasks SET status = ? WHERE id = ? {RETURNING_TASK}", (status, task_id))
+        return tasks[0] if tasks else None
+
+    @timed("repository")
+    def update_status_many(self, task_ids: List[int], status: str) -> List[Task]:
+        return self._write_returning_in_chunks(
+            [f"UPDATE tasks SET status = ? WHERE id IN ({{}}) {RETURNING_TASK}"], task_ids, (status,)
         )
 
-    def delete(self, task_id: int) -> None:
-        self._execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+    @timed("repository")
+    def delete(self, task_id: int) -> Optional[Task]:
+        tasks = self._write_returning_in_chunks(DELETE_TASKS, [task_id])
+        return tasks[0] if tasks else None
+
+    @timed("repository")
+    def delete_many(self, task_ids: List[int]) -> List[Task]:
+        return self._write_returning_in_chunks(DELETE_TASKS, task_ids)
 
-    def _create_table(self) -> None:
-        self._execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                description TEXT NOT NULL,
-                due_date TEXT NOT NULL,
-                status TEXT NOT NULL
+    @timed("repository")
+    def replace_all(self, tasks: List[Task]) -> None:
+        def replace_rows(connection):
+            # Upserting instead of deleting everything keeps closed_at (the archive age) of unchanged
+            # tasks, and only tasks that really changed reach the change log.
+            kept_ids = {task.id for task in tasks}
+            removed_ids = [task_id for task_id, in connection.execute("SELECT id FROM tasks") if task_id not in kept_ids]
+            for start in range(0, len(removed_ids), MAX_IDS_PER_QUERY):
+                chunk = removed_ids[start:start + MAX_IDS_PER_QUERY]
+                connection.execute(f"DELETE FROM tasks WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            connection.executemany(
+                UPSERT_TASK,
+                [(task.id, task.description, task.due_date.toordinal(), task.status) for task in tasks]
             )
-        """)
-
-    def _execute(self, sql: str, params: tuple = ()) -> None:
-        cursor = self.connection.cursor()
-        cursor.execute(sql, params)
-        self.connection.commit()
-
-    def _to_task(self, row: tuple) -> Task:
-        return Task(
-            id=row[0],
-            description=row[1],
-            due_date=date.fromisoformat(row[2]),
-            status=row[3]
-        )
+            self._check_archive_conflicts(connection)
+        self._write(replace_rows)
+
+    @timed("repository")
+    def import_tasks(self, tasks: Iterable[Task], replace_existing: bool = False) -> int:
+        def load(connection):
+            # Runs inside the writer's transaction, so dropping and rebuilding are atomic with the load.
+            drop_indexes_and_triggers(connection)
+            if replace_existing:
+                connection.execute("DELETE FROM tasks")
+                connection.execute("DELETE FROM archived_tasks")
+            imported = 0
+            for _ in range(chunk_count):
+                chunk = pickle.load(spool)
+                connection.executemany(INSERT_TASK_WITH_ID, chunk)
+                imported += len(chunk)
+            self._check_archive_conflicts(connection)
+            rebuild_indexes_and_triggers(connection)
+            return imported
+
+        # The input is read and validated before the write is submitted: a slow upload or pipe must
+        # not hold the writer thread and the file's write lock. Rows are spooled in chunks, to disk
+        # once they outgrow IMPORT_SPOOL_MEMORY_BYTES.
+        with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MEMORY_BYTES) as spool:
+            chunk_count = self._spool_rows(tasks, spool)
+            spool.seek(0)
+            try:
+                return self._write(load)
+            except sqlite3.IntegrityError as error:
+                raise ValueError(f"Imported tasks conflict with existing ones: {error}") from None
+
+    @timed("repository")
+    def archive_closed_tasks(self, closed_before: date, limit: int) -> int:
+        def archive(connection):
+            rows = connection.execute(
+                "DELETE FROM tasks WHERE id IN (SELECT id FROM tasks WHERE closed_at < ? LIMIT ?) "
+                f"RETURNING {TASK_COLUMNS}, closed_at",
+                (closed_before.toordinal(), limit)
+            ).fetchall()
+            connection.executemany(
+                f"INSERT INTO archived_tasks ({TASK_COLUMNS}, closed_at) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            return len(rows)
+        return self._write(archive)
+
+    @timed("repository")
+    def compact(self) -> None:
+        def compact_file(connection):
+            # Hands the pages freed by archiving back to the file system; a no-op unless the file was
+            # created with auto_vacuum = INCREMENTAL.
+            connection.execute("PRAGMA incremental_vacuum").fetchall()
+            connection.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+            connection.execute("ANALYZE")
+        self._write(compact_file)
+
+    @timed("repository")
+    def task_counts(self) -> List[Tuple[str, date, int]]:
+        with self.pool.connection() as connection:
+            rows = connection.execute("SELECT status, due_date, count FROM task_counts").fetchall()
+        return [(status, to_date(due_date), count) for status, due_date, count in rows]
+
+    @timed("repository")
+    def find_changes(self, since: str, limit: int) -> ChangeFeed:
+        since = cursor_to_seq(since)
+        with self.pool.connection() as connection:
+            # One read transaction, so the log bounds and the changed rows come from the same snapshot.
+            connection.execute("BEGIN")
+            oldest, newest = connection.execute("SELECT MIN(seq), COALESCE(MAX(seq), 0) FROM task_changes").fetchone()
+            reset = connection.execute(
+                "SELECT EXISTS (SELECT 1 FROM task_changes WHERE seq > ? AND operation = ?)", (since, RESET)
+            ).fetchone()[0]
+            if reset or since > newest or (oldest is not None and oldest > since + 1):
+                return ChangeFeed(str(newest), reset=True)
+            # Only each task's latest change is returned, joined with its current row.
+            rows = connection.execute(
+                """
+                SELECT c.seq, c.operation, c.task_id, t.description, t.due_date, t.status
+                FROM (
+                    SELECT task_id, MAX(seq) AS seq FROM task_changes WHERE seq > ? GROUP BY task_id
+                ) latest
+                JOIN task_changes c ON c.seq = latest.seq
+                LEFT JOIN tasks t ON t.id = c.task_id
+                ORDER BY c.seq LIMIT ?
+                """,
+                (since, limit)
+            ).fetchall()
+        changes = [
+            TaskChange(seq, operation, task_id, None if status is None else Task(task_id, description, to_date(due_date), status))
+            for seq, operation, task_id, description, due_date, status in rows
+        ]
+        # A full page may stop short of the newest change; the client continues from its last entry.
+        return ChangeFeed(str(changes[-1].seq if len(changes) == limit else newest), changes)
+
+    @timed("repository")
+    def max_task_id(self) -> Optional[int]:
+        # Archived tasks keep their ids, so both tables count; MAX(id) on a rowid table is one seek.
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT MAX(id) FROM (SELECT MAX(id) AS id FROM tasks UNION ALL SELECT MAX(id) FROM archived_tasks)"
+            ).fetchone()[0]
+
+    @timed("repository")
+    def data_version(self) -> int:
+        with self.pool.connection() as connection:
+            return connection.execute("SELECT version FROM tasks_version WHERE id = 1").fetchone()[0]
+
+    def close(self) -> None:
+        self._writer.close()
+        if self.pool is not self._write_pool:
+            self.pool.close()
+        self._write_pool.close()
+
+    def _migrate(self) -> None:
+        with self._write_pool.connection() as connection:
+            migrate(connection)
+
+    def _select_for(self, task_filter: Optional[TaskFilter]) -> str:
+        return SELECT_TASKS_WITH_ARCHIVE if task_filter and task_filter.include_archived else SELECT_TASKS
+
+    def _keyset_query(
+        self, task_filter: Optional[TaskFilter], after_id: Optional[int], limit: Optional[int]
+    ) -> Tuple[str, list]:
+        where, params = self._filter_clause(task_filter) if task_filter else ([], [])
+        # No cursor means no lower bound: imported ids may be <= 0, and so is a shard's local id 0.
+        if after_id is not None:
+            where.append("id > ?")
+            params.append(after_id)
+        sql = self._select_for(task_filter)
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def _filter_clause(self, task_filter: TaskFilter) -> Tuple[List[str], list]:
+        where, params = [], []
+        if task_filter.overdue:
+            where.append("status = ? AND due_date < ?")
+            params.extend([OPEN, date.today().toordinal()])
+        if task_filter.status is not None:
+            where.append("status = ?")
+            params.append(task_filter.status)
+        if task_filter.due_after is not None:
+            where.append("due_date >= ?")
+            params.append(task_filter.due_after.toordinal())
+        if task_filter.due_before is not None:
+            where.append("due_date <= ?")
+            params.append(task_filter.due_before.toordinal())
+        return where, params
+
+    def _query(self, sql: str, params=()) -> List[Task]:
+        with self.pool.connection() as connection:
+            rows = connection.execute(sql, params).fetchall()
+        with metrics.timer("repository", "map_rows"):
+            return self._to_tasks(rows)
+
+    def _write(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        return self._writer.submit(operation)
+
+    def _write_returning(self, sql: str, params=()) -> List[Task]:
+        # RETURNING rows must be consumed before the transaction can commit.
+        rows = self._write(lambda connection: connection.execute(sql, params).fetchall())
+        return self._to_tasks(rows)
+
+    def _write_returning_in_chunks(self, sql_templates: List[str], task_ids: List[int], params=()) -> List[Task]:
+        def execute_chunks(connection):
+            rows = []
+            for sql_template in sql_templates:
+                for start in range(0, len(task_ids), MAX_IDS_PER_QUERY):
+                    chunk = task_ids[start:start + MAX_IDS_PER_QUERY]
+                    sql = sql_template.format(", ".join("?" * len(chunk)))
+                    rows.extend(connection.execute(sql, (*params, *chunk)).fetchall())
+            return rows
+        return self._to_tasks(self._write(execute_chunks))
+
+    def _check_archive_conflicts(self, connection: sqlite3.Connection) -> None:
+        # Raised inside the write, so the whole transaction rolls back.
+        archived = connection.execute(
+            "SELECT tasks.id FROM tasks JOIN archived_tasks ON archived_tasks.id = tasks.id LIMIT 1"
+        ).fetchone()
+        if archived:
+            raise ValueError(f"Tasks conflict with archived ones: duplicate id {archived[0]}")
+
+    def _spool_rows(self, tasks: Iterable[Task], spool: BinaryIO) -> int:
+        rows = ((task.id, task.description, task.due_date.toordinal(), task.status) for task in tasks)
+        chunk_count = 0
+        for chunk in iter(lambda: list(islice(rows, IMPORT_CHUNK_SIZE)), []):
+            pickle.dump(chunk, spool, pickle.HIGHEST_PROTOCOL)
+            chunk_count += 1
+        return chunk_count
+
+    def _insert(self, connection: sqlite3.Connection, task: Task) -> int:
+        return connection.execute(INSERT_TASK, (task.description, task.due_date.toordinal(), task.status)).lastrowid
+
+    def _to_update_params(self, task: Task) -> tuple:
+        return task.description, task.due_date.toordinal(), task.status, task.id
+
+    def _to_tasks(self, rows: List[tuple]) -> List[Task]:
+        return [Task(task_id, description, to_date(due_date), status) for task_id, description, due_date, status in rows]
 
     def _ensure_db_directory(self, db_path: Path) -> None:
         if not db_path.parent.exists():
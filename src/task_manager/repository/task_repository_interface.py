@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Tuple
 from task_manager.domain.task import Task
+from task_manager.domain.task_change import ChangeFeed
+from task_manager.domain.task_filter import TaskFilter
 
 class TaskRepositoryInterface(ABC):
     
@@ -8,18 +11,96 @@ class TaskRepositoryInterface(ABC):
     def find_all(self) -> List[Task]:
         pass
 
+    @abstractmethod
+    def find_page(self, after_id: Optional[int], limit: int) -> List[Task]:
+        pass
+
+    @abstractmethod
+    def find_by_filter(
+        self, task_filter: TaskFilter, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Task]:
+        pass
+
+    @abstractmethod
+    def iter_all(self, batch_size: int = 500, task_filter: Optional[TaskFilter] = None) -> Iterator[Task]:
+        pass
+
+    @abstractmethod
+    def search(self, query: str, limit: int) -> List[Task]:
+        pass
+
     @abstractmethod
     def find_by_id(self, task_id: int) -> Optional[Task]:
         pass
 
+    @abstractmethod
+    def find_by_ids(self, task_ids: List[int]) -> List[Task]:
+        pass
+
     @abstractmethod
     def save(self, task: Task) -> None:
         pass
 
+    @abstractmethod
+    def save_many(self, tasks: List[Task]) -> None:
+        pass
+
     @abstractmethod
     def update(self, task: Task) -> None:
         pass
 
     @abstractmethod
-    def delete(self, task_id: int) -> None:
+    def update_many(self, tasks: List[Task]) -> None:
+        pass
+
+    @abstractmethod
+    def update_details(self, task_id: int, description: str, due_date: date) -> Optional[Task]:
+        pass
+
+    @abstractmethod
+    def update_details_many(self, items: List[Tuple[int, str, date]]) -> List[Task]:
+        pass
+
+    @abstractmethod
+    def update_status(self, task_id: int, status: str) -> Optional[Task]:
+        pass
+
+    @abstractmethod
+    def update_status_many(self, task_ids: List[int], status: str) -> List[Task]:
+        pass
+
+    @abstractmethod
+    def delete(self, task_id: int) -> Optional[Task]:
+        pass
+
+    @abstractmethod
+    def delete_many(self, task_ids: List[int]) -> List[Task]:
+        pass
+
+    @abstractmethod
+    def import_tasks(self, tasks: Iterable[Task], replace_existing: bool = False) -> int:
+        pass
+
+    @abstractmethod
+    def archive_closed_tasks(self, closed_before: date, limit: int) -> int:
+        pass
+
+    @abstractmethod
+    def compact(self) -> None:
+        pass
+
+    @abstractmethod
+    def task_counts(self) -> List[Tuple[str, date, int]]:
+        pass
+
+    @abstractmethod
+    def find_changes(self, since: str, limit: int) -> ChangeFeed:
+        pass
+
+    @abstractmethod
+    def max_task_id(self) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    def data_version(self) -> int:
         pass
@@ -0,0 +1,17 @@
+import re
+import unicodedata
+from typing import List
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    # Mirrors FTS5's "unicode61 remove_diacritics 2" tokenizer closely enough for ranking in memory.
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WORD.findall(stripped)
+
+
+def to_fts_query(text: str) -> str:
+    # Quoting every term keeps FTS5 operators typed by users (AND, NEAR, *, ...) literal.
+    return " ".join(f'"{token}"' for token in tokenize(text))
@@ -1,12 +1,45 @@
-from flask import Flask, request, jsonify
+import io
+import json
+import time
+import zlib
+from dataclasses import asdict
+from flask import Flask, Response, g, request, jsonify
 from datetime import date
 from task_manager.service.task_service import TaskService
-from task_manager.domain.task import Task
+from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_change import START_CURSOR
+from task_manager.domain.task_filter import TaskFilter
+from task_manager import transfer
+from task_manager.metrics import registry as metrics
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_SEARCH_LIMIT = 20
+STREAM_CHUNK_SIZE = 200
+NDJSON_MIMETYPE = "application/x-ndjson"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+MAX_BATCH_SIZE = 1000
+MAX_LONG_POLL_SECONDS = 30
+
 
 def create_app(service: TaskService):
     app = Flask(__name__)
     BASE_URL = "/task-manager"
 
+    @app.before_request
+    def start_timer():
+        if metrics.enabled:
+            g.started_at = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started_at = g.pop("started_at", None)
+        if started_at is not None:
+            route = request.endpoint or "unmatched"
+            metrics.observe("rest_api", route, time.perf_counter() - started_at)
+            metrics.increment("http_responses_total", route=route, status=str(response.status_code))
+        return response
+
     def task_to_dict(task: Task):
         return {
             "id": task.id,
@@ -20,46 +53,279 @@ def create_app(service: TaskService):
             return jsonify(task_to_dict(task)), status_code
         return jsonify({"error": "Task not found"}), 404
 
+    def conditional_response(etag_suffix, build_response):
+        # The version is read before the query runs: a write landing in between yields newer
+        # data under an older ETag, which only costs the client one extra full download later.
+        etag = f"{service.data_version()}-{etag_suffix}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = app.make_response(build_response())
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        return response
+
+    def list_etag_suffix():
+        # Today's date is part of the key because the overdue filter and the stats buckets depend on it.
+        request_key = f"{request.path}|{request.query_string}|{request.headers.get('Accept', '')}|{date.today()}".encode()
+        return f"list-{zlib.crc32(request_key):08x}"
+
+    def parse_task_payload(data):
+        if not isinstance(data, dict):
+            raise ValueError("Each task must be a JSON object")
+        description = data.get("description")
+        due_date_str = data.get("due_date")
+
+        if not description or not due_date_str:
+            raise ValueError("Description and due_date are required")
+        try:
+            return description, date.fromisoformat(due_date_str)
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+    def parse_batch(items):
+        if not isinstance(items, list) or not items:
+            raise ValueError("Expected a non-empty list")
+        if len(items) > MAX_BATCH_SIZE:
+            raise ValueError(f"Batches are limited to {MAX_BATCH_SIZE} items")
+        return items
+
+    def is_task_id(value):
+        # bool is a subclass of int, but JSON true must not address task 1.
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def parse_task_ids(data):
+        task_ids = parse_batch(data.get("ids") if isinstance(data, dict) else None)
+        if not all(is_task_id(task_id) for task_id in task_ids):
+            raise ValueError("ids must be integers")
+        return task_ids
+
+    def batch_result(task: Task, status_code=200):
+        if task:
+            return {"status": status_code, "task": task_to_dict(task)}
+        return {"status": 404, "error": "Task not found"}
+
+    def parse_batch_item(item):
+        task_id = item.get("id") if isinstance(item, dict) else None
+        if not is_task_id(task_id):
+            raise ValueError("id is required")
+        return (task_id, *parse_task_payload(item))
+
+    def run_batch(items, parse_item, execute, status_code=200):
+        results, valid_items, positions = [None] * len(items), [], []
+        for position, item in enumerate(items):
+            try:
+                valid_items.append(parse_item(item))
+                positions.append(position)
+            except ValueError as error:
+                results[position] = {"status": 400, "error": str(error)}
+
+        if valid_items:
+            for position, task in zip(positions, execute(valid_items)):
+                results[position] = batch_result(task, status_code)
+        return jsonify(results)
+
+    def parse_page_args():
+        if "limit" not in request.args and "cursor" not in request.args:
+            return None, None
+        try:
+            limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+            cursor = int(request.args["cursor"]) if "cursor" in request.args else None
+        except ValueError:
+            raise ValueError("limit and cursor must be integers")
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        return cursor, limit
+
+    def parse_date_arg(name):
+        value = request.args.get(name)
+        if value is None:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid {name} format. Use YYYY-MM-DD")
+
+    def parse_filter_args():
+        status = request.args.get("status")
+        if status is not None:
+            status = status.upper()
+            if status not in (OPEN, CLOSED):
+                raise ValueError(f"status must be {OPEN} or {CLOSED}")
+        task_filter = TaskFilter(
+            status=status,
+            due_after=parse_date_arg("due_after"),
+            due_before=parse_date_arg("due_before"),
+            overdue=request.args.get("overdue") in ("1", "true"),
+            include_archived=request.args.get("include_archived") in ("1", "true")
+        )
+        return None if task_filter.is_empty() else task_filter
+
+    def wants_stream():
+        if request.args.get("stream") in ("1", "true"):
+            return True
+        return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+    def stream_ndjson(tasks):
+        chunk = []
+        for task in tasks:
+            chunk.append(json.dumps(task_to_dict(task)))
+            if len(chunk) == STREAM_CHUNK_SIZE:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+
+    def stream_json_array(tasks):
+        separator = "["
+        chunk = []
+        for task in tasks:
+            chunk.append(separator + json.dumps(task_to_dict(task)))
+            separator = ","
+            if len(chunk) == STREAM_CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        chunk.append("[]" if separator == "[" else "]")
+        yield "".join(chunk)
+
+    def stream_tasks(task_filter):
+        tasks = service.stream_tasks(task_filter)
+        if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+            return Response(stream_ndjson(tasks), mimetype=NDJSON_MIMETYPE)
+        return Response(stream_json_array(tasks), mimetype="application/json")
+
+    def build_task_list():
+        try:
+            task_filter = parse_filter_args()
+            cursor, limit = parse_page_args()
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+
+        if wants_stream():
+            return stream_tasks(task_filter)
+
+        if limit is None:
+            tasks = service.list_tasks(task_filter=task_filter)
+            with metrics.timer("rest_api", "serialize"):
+                return jsonify([task_to_dict(t) for t in tasks])
+
+        tasks = service.list_tasks(after_id=cursor, limit=limit, task_filter=task_filter)
+        next_cursor = tasks[-1].id if len(tasks) == limit else None
+        with metrics.timer("rest_api", "serialize"):
+            return jsonify({
+                "tasks": [task_to_dict(t) for t in tasks],
+                "next_cursor": next_cursor
+            })
+
     @app.route(f"{BASE_URL}/tasks", methods=["GET"])
     def list_tasks():
-        tasks = service.list_tasks()
-        return jsonify([task_to_dict(t) for t in tasks])
+        return conditional_response(list_etag_suffix(), build_task_list)
+
+    def build_search_results():
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"error": "q is required"}), 400
+        try:
+            limit = int(request.args.get("limit", DEFAULT_SEARCH_LIMIT))
+        except ValueError:
+            limit = 0
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+        tasks = service.search_tasks(query, limit)
+        with metrics.timer("rest_api", "serialize"):
+            return jsonify([task_to_dict(t) for t in tasks])
+
+    @app.route(f"{BASE_URL}/tasks/search", methods=["GET"])
+    def search_tasks():
+        return conditional_response(list_etag_suffix(), build_search_results)
+
+    @app.route(f"{BASE_URL}/tasks/stats", methods=["GET"])
+    def get_stats():
+        return conditional_response(list_etag_suffix(), lambda: jsonify(asdict(service.get_stats())))
+
+    @app.route(f"{BASE_URL}/tasks/changes", methods=["GET"])
+    def get_changes():
+        since = request.args.get("since", START_CURSOR)
+        try:
+            limit = int(request.args.get("limit", MAX_PAGE_SIZE))
+            timeout = float(request.args.get("timeout", 0))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer, timeout a number of seconds"}), 400
+        if limit < 1 or limit > MAX_PAGE_SIZE or not timeout >= 0:
+            return jsonify({"error": f"timeout must be >= 0, limit between 1 and {MAX_PAGE_SIZE}"}), 400
+        try:
+            # since is an opaque cursor; only the repository that issued it can validate it.
+            feed = service.get_changes(since, limit, min(timeout, MAX_LONG_POLL_SECONDS))
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        with metrics.timer("rest_api", "serialize"):
+            return jsonify({
+                "changes": [
+                    {
+                        "seq": change.seq,
+                        "operation": change.operation,
+                        "id": change.task_id,
+                        "task": task_to_dict(change.task) if change.task else None
+                    }
+                    for change in feed.changes
+                ],
+                "last_seq": feed.last_seq,
+                "reset": feed.reset
+            })
 
     @app.route(f"{BASE_URL}/tasks/<int:task_id>", methods=["GET"])
     def get_task(task_id):
-        return handle_task_response(service.get_task(task_id))
+        return conditional_response(f"task-{task_id}", lambda: handle_task_response(service.get_task(task_id)))
 
     @app.route(f"{BASE_URL}/tasks", methods=["POST"])
     def add_task():
-        data = request.json
-        description = data.get("description")
-        due_date_str = data.get("due_date")
-        
-        if not description or not due_date_str:
-            return jsonify({"error": "Description and due_date are required"}), 400
-            
         try:
-            due_date = date.fromisoformat(due_date_str)
-            created_task = service.add_task(description, due_date)
-            return handle_task_response(created_task, 201)
-        except ValueError:
-            return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+            description, due_date = parse_task_payload(request.json)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return handle_task_response(service.add_task(description, due_date), 201)
 
     @app.route(f"{BASE_URL}/tasks/<int:task_id>", methods=["PUT"])
     def edit_task(task_id):
-        data = request.json
-        description = data.get("description")
-        due_date_str = data.get("due_date")
-        
-        if not description or not due_date_str:
-            return jsonify({"error": "Description and due_date are required"}), 400
+        try:
+            description, due_date = parse_task_payload(request.json)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return handle_task_response(service.edit_task(task_id, description, due_date))
 
+    @app.route(f"{BASE_URL}/tasks/batch", methods=["POST"])
+    def add_tasks():
         try:
-            due_date = date.fromisoformat(due_date_str)
-            updated_task = service.edit_task(task_id, description, due_date)
-            return handle_task_response(updated_task)
-        except ValueError:
-            return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
+            items = parse_batch(request.json)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return run_batch(items, parse_task_payload, service.add_tasks, 201)
+
+    @app.route(f"{BASE_URL}/tasks/batch", methods=["PUT"])
+    def edit_tasks():
+        try:
+            items = parse_batch(request.json)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return run_batch(items, parse_batch_item, service.edit_tasks)
+
+    @app.route(f"{BASE_URL}/tasks/complete", methods=["PATCH"])
+    def complete_tasks():
+        try:
+            task_ids = parse_task_ids(request.json)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return jsonify([batch_result(task) for task in service.complete_tasks(task_ids)])
+
+    @app.route(f"{BASE_URL}/tasks/batch", methods=["DELETE"])
+    def delete_tasks():
+        try:
+            task_ids = parse_task_ids(request.json)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return jsonify([batch_result(task) for task in service.delete_tasks(task_ids)])
 
     @app.route(f"{BASE_URL}/tasks/<int:task_id>/complete", methods=["PATCH"])
     def complete_task(task_id):
@@ -69,4 +335,34 @@ def create_app(service: TaskService):
     def delete_task(task_id):
         return handle_task_response(service.delete_task(task_id))
     
+    @app.route(f"{BASE_URL}/export", methods=["GET"])
+    def export_tasks():
+        try:
+            fmt = transfer.format_for(request.args.get("format"))
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return Response(
+            transfer.encode(service.export_tasks(), fmt),
+            mimetype=transfer.MIMETYPES[fmt],
+            headers={"Content-Disposition": f"attachment; filename=tasks.{fmt}"}
+        )
+
+    @app.route(f"{BASE_URL}/import", methods=["POST"])
+    def import_tasks():
+        try:
+            csv_body = request.mimetype == transfer.MIMETYPES[transfer.CSV]
+            fmt = transfer.format_for(request.args.get("format"), transfer.CSV if csv_body else transfer.NDJSON)
+            # Read the body as it arrives instead of buffering the whole dump.
+            lines = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+            imported = service.import_tasks(
+                transfer.decode(lines, fmt), request.args.get("replace") in ("1", "true")
+            )
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return jsonify({"imported": imported})
+
+    @app.route(f"{BASE_URL}/metrics", methods=["GET"])
+    def get_metrics():
+        return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
     return app
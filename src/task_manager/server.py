@@ -0,0 +1,124 @@
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+LISTEN_BACKLOG = 1024
+KEEP_ALIVE_TIMEOUT_SECONDS = 5.0
+# A worker dying sooner than this after starting is treated as a startup failure, not restarted.
+MIN_WORKER_UPTIME_SECONDS = 1.0
+
+AppFactory = Callable[[], Callable]
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Bounds how long an idle keep-alive connection can hold one of the pool's threads.
+    timeout = KEEP_ALIVE_TIMEOUT_SECONDS
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    # Unlike werkzeug's ThreadedWSGIServer, requests share a fixed pool instead of a thread each.
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, threads: int, fd: int = None):
+        super().__init__(host, port, app, handler=KeepAliveRequestHandler, fd=fd)
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="request")
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process_request, request, client_address)
+
+    def wait_for_requests(self):
+        self._executor.shutdown(wait=True)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def bind(host: str, port: int) -> socket.socket:
+    listener = socket.create_server((host, port), backlog=LISTEN_BACKLOG)
+    listener.set_inheritable(True)
+    # Every worker wakes up for each new connection; the ones that lose the race must get EAGAIN
+    # from accept() and go back to polling instead of blocking there (and ignoring shutdown).
+    listener.setblocking(False)
+    return listener
+
+
+def serve(app_factory: AppFactory, listener: socket.socket, workers: int, threads: int) -> None:
+    if workers <= 1 or not hasattr(os, "fork"):
+        _run_worker(app_factory, listener, threads)
+        return
+
+    children: Dict[int, float] = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        children[_fork_worker(app_factory, listener, threads)] = time.monotonic()
+
+    while children:
+        pid, status = os.wait()
+        started_at = children.pop(pid, None)
+        if started_at is None or stopping:
+            continue
+        if os.waitstatus_to_exitcode(status) != 0 and time.monotonic() - started_at < MIN_WORKER_UPTIME_SECONDS:
+            stop(signal.SIGTERM, None)
+            print(f"Worker {pid} failed on startup, shutting down", file=sys.stderr)
+            continue
+        children[_fork_worker(app_factory, listener, threads)] = time.monotonic()
+    listener.close()
+
+
+def _fork_worker(app_factory: AppFactory, listener: socket.socket, threads: int) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+
+    exit_code = 1
+    try:
+        # Ctrl+C reaches the whole process group; the parent turns it into an orderly SIGTERM.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        _run_worker(app_factory, listener, threads)
+        exit_code = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        # Skip the parent's atexit handlers and buffered state inherited through fork.
+        os._exit(exit_code)
+
+
+def _run_worker(app_factory: AppFactory, listener: socket.socket, threads: int) -> None:
+    # The app, and with it every database connection, is created after fork, never shared.
+    host, port = listener.getsockname()[:2]
+    server = PooledWSGIServer(host, port, app_factory(), threads, fd=listener.fileno())
+
+    def shutdown(signum, frame):
+        # shutdown() waits for serve_forever to return, so it cannot run on the serving thread.
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        # Lets in-flight requests finish before the process exits.
+        server.wait_for_requests()
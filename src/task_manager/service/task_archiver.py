@@ -0,0 +1,38 @@
+import threading
+import traceback
+from task_manager.service.task_service import TaskService
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 30
+DEFAULT_INTERVAL_SECONDS = 3600.0
+DEFAULT_BATCH_SIZE = 500
+
+
+class TaskArchiver:
+
+    def __init__(
+        self,
+        service: TaskService,
+        archive_after_days: int = DEFAULT_ARCHIVE_AFTER_DAYS,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        self._service = service
+        self._archive_after_days = archive_after_days
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="task-archiver", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        # Runs once at startup, then every interval; a failed run is reported and retried next time.
+        while not self._stopped.is_set():
+            try:
+                self._service.archive_closed_tasks(self._archive_after_days, self._batch_size)
+            except Exception:
+                traceback.print_exc()
+            self._stopped.wait(self._interval)
@@ -1,45 +1,123 @@
-from typing import Optional
-from datetime import date
-from task_manager.domain.task import Task
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+from datetime import date, timedelta
+from task_manager.domain.task import Task, CLOSED
+from task_manager.domain.task_change import ChangeFeed
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.domain.task_stats import TaskStats
+from task_manager.metrics import timed
 from task_manager.repository.task_repository_interface import TaskRepositoryInterface
 
+# How often a long-polling get_changes call looks for new changes; also catches other processes' writes.
+CHANGE_POLL_INTERVAL_SECONDS = 0.1
+
 
 class TaskService:
 
     def __init__(self, repository: TaskRepositoryInterface):
         self.repository = repository
 
-    def list_tasks(self):
-        return self.repository.find_all()
+    @timed("service")
+    def list_tasks(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        task_filter: Optional[TaskFilter] = None
+    ) -> List[Task]:
+        if task_filter is not None and not task_filter.is_empty():
+            return self.repository.find_by_filter(task_filter, after_id, limit)
+        if limit is None:
+            return self.repository.find_all()
+        return self.repository.find_page(after_id, limit)
+
+    def stream_tasks(self, task_filter: Optional[TaskFilter] = None) -> Iterator[Task]:
+        if task_filter is not None and not task_filter.is_empty():
+            return self.repository.iter_all(task_filter=task_filter)
+        return self.repository.iter_all()
 
+    @timed("service")
+    def search_tasks(self, query: str, limit: int) -> List[Task]:
+        return self.repository.search(query, limit)
+
+    @timed("service")
     def get_task(self, task_id: int) -> Optional[Task]:
         return self.repository.find_by_id(task_id)
 
+    @timed("service")
     def add_task(self, description: str, due_date: date) -> Task:
         task = Task(None, description, due_date)
         self.repository.save(task)
         return task
 
+    @timed("service")
+    def add_tasks(self, items: List[Tuple[str, date]]) -> List[Task]:
+        tasks = [Task(None, description, due_date) for description, due_date in items]
+        self.repository.save_many(tasks)
+        return tasks
+
+    @timed("service")
     def edit_task(self, task_id: int, description: str, due_date: date) -> Optional[Task]:
-        task = self.repository.find_by_id(task_id)
-        if task:
-            task.description = description
-            task.due_date = due_date
-            self.repository.update(task)
-            return task
-        return None
+        return self.repository.update_details(task_id, description, due_date)
 
+    @timed("service")
+    def edit_tasks(self, items: List[Tuple[int, str, date]]) -> List[Optional[Task]]:
+        tasks_by_id = {task.id: task for task in self.repository.update_details_many(items)}
+        return [tasks_by_id.get(task_id) for task_id, _, _ in items]
+
+    @timed("service")
     def complete_task(self, task_id: int) -> Optional[Task]:
-        task = self.repository.find_by_id(task_id)
-        if task:
-            task.close()
-            self.repository.update(task)
-            return task
-        return None
+        return self.repository.update_status(task_id, CLOSED)
+
+    @timed("service")
+    def complete_tasks(self, task_ids: List[int]) -> List[Optional[Task]]:
+        completed = self.repository.update_status_many(list(set(task_ids)), CLOSED)
+        tasks_by_id = {task.id: task for task in completed}
+        return [tasks_by_id.get(task_id) for task_id in task_ids]
 
+    @timed("service")
     def delete_task(self, task_id: int) -> Optional[Task]:
-        task = self.repository.find_by_id(task_id)
-        if task:
-            self.repository.delete(task_id)
-            return task
-        return None
+        return self.repository.delete(task_id)
+
+    @timed("service")
+    def delete_tasks(self, task_ids: List[int]) -> List[Optional[Task]]:
+        deleted = self.repository.delete_many(list(set(task_ids)))
+        tasks_by_id = {task.id: task for task in deleted}
+        return [tasks_by_id.get(task_id) for task_id in task_ids]
+
+    def export_tasks(self) -> Iterator[Task]:
+        return self.repository.iter_all(task_filter=TaskFilter(include_archived=True))
+
+    @timed("service")
+    def import_tasks(self, tasks: Iterable[Task], replace_existing: bool = False) -> int:
+        return self.repository.import_tasks(tasks, replace_existing)
+
+    def archive_closed_tasks(self, older_than_days: int, batch_size: int) -> int:
+        # One transaction per batch, so writes from requests are queued behind a batch, not the whole run.
+        closed_before = date.today() - timedelta(days=older_than_days)
+        archived = 0
+        while True:
+            moved = self.repository.archive_closed_tasks(closed_before, batch_size)
+            archived += moved
+            if moved < batch_size:
+                break
+        if archived:
+            self.repository.compact()
+        return archived
+
+    @timed("service")
+    def get_stats(self) -> TaskStats:
+        return TaskStats.from_counts(self.repository.task_counts(), date.today())
+
+    def get_changes(self, since: str, limit: int, timeout_seconds: float = 0) -> ChangeFeed:
+        # Not timed: a long poll spends most of its time waiting, which would swamp the latency histogram.
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            feed = self.repository.find_changes(since, limit)
+            remaining = deadline - time.monotonic()
+            if feed.changes or feed.reset or remaining <= 0:
+                return feed
+            time.sleep(min(CHANGE_POLL_INTERVAL_SECONDS, remaining))
+
+    @timed("service")
+    def data_version(self) -> int:
+        return self.repository.data_version()
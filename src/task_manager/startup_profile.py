@@ -0,0 +1,33 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+
+class StartupProfile:
+    # Steps are always timed, which costs a few perf_counter calls; only report() depends on enabled.
+
+    def __init__(self, enabled: bool, started_at: Optional[float] = None):
+        self.enabled = enabled
+        self._started_at = time.perf_counter() if started_at is None else started_at
+        self._steps: List[Tuple[str, float]] = []
+
+    def record(self, name: str, seconds: float) -> None:
+        self._steps.append((name, seconds))
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started_at)
+
+    def report(self, output: Optional[TextIO] = None) -> None:
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._started_at
+        lines = ["Perfil de inicialização:"]
+        lines += [f"  {name:<24} {seconds * 1000:8.1f} ms" for name, seconds in self._steps]
+        lines.append(f"  {'total':<24} {total * 1000:8.1f} ms")
+        print("\n".join(lines), file=output or sys.stderr)
@@ -0,0 +1,137 @@
+import csv
+import io
+import json
+import re
+from json.encoder import encode_basestring
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+from task_manager.domain.task import Task, OPEN, CLOSED
+
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (NDJSON, CSV)
+MIMETYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+CSV_HEADER = ["id", "description", "due_date", "status"]
+CHUNK_SIZE = 1000
+STATUSES = frozenset((OPEN, CLOSED))
+# SQLite's INTEGER PRIMARY KEY range.
+MIN_TASK_ID = -(2 ** 63)
+MAX_TASK_ID = 2 ** 63 - 1
+INTEGER_TEXT = re.compile(r"-?[0-9]+")
+
+
+def format_for(name: Optional[str], default: str = NDJSON) -> str:
+    if not name:
+        return default
+    if name in FORMATS:
+        return name
+    raise ValueError(f"Unsupported format '{name}', expected one of {', '.join(FORMATS)}")
+
+
+def encode(tasks: Iterable[Task], fmt: str) -> Iterator[str]:
+    # Yields text in chunks of CHUNK_SIZE tasks, so callers can stream without holding the dump.
+    if fmt == CSV:
+        return _encode_csv(tasks)
+    return _encode_ndjson(tasks)
+
+
+def decode(lines: Iterable[str], fmt: str) -> Iterator[Task]:
+    if fmt == CSV:
+        return _decode_csv(lines)
+    return _decode_ndjson(lines)
+
+
+def _encode_ndjson(tasks: Iterable[Task]) -> Iterator[str]:
+    chunk = []
+    for task in tasks:
+        # Same output as json.dumps(..., ensure_ascii=False) on the task dict, without building the dict;
+        # only the description needs escaping.
+        task_id = "null" if task.id is None else task.id
+        chunk.append(
+            f'{{"id": {task_id}, "description": {encode_basestring(task.description)}, '
+            f'"due_date": "{task.due_date.isoformat()}", "status": "{task.status}"}}'
+        )
+        if len(chunk) == CHUNK_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def _encode_csv(tasks: Iterable[Task]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    rows = 0
+    for task in tasks:
+        writer.writerow((task.id, task.description, task.due_date.isoformat(), task.status))
+        rows += 1
+        if rows == CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue()
+
+
+def _decode_ndjson(lines: Iterable[str]) -> Iterator[Task]:
+    numbered_lines = enumerate(lines, start=1)
+    for chunk in iter(lambda: list(islice(numbered_lines, CHUNK_SIZE)), []):
+        chunk = [(line_number, line) for line_number, line in chunk if not line.isspace()]
+        try:
+            # One json.loads per chunk is about twice as fast as one per line.
+            items = json.loads("[" + ",".join(line for _, line in chunk) + "]")
+        except json.JSONDecodeError:
+            items = None
+        # A line like '{...}, {...}' still parses as part of the array, shifting every later item.
+        if items is None or len(items) != len(chunk):
+            items = [_parse_json_line(line_number, line) for line_number, line in chunk]
+        for (line_number, _), item in zip(chunk, items):
+            if not isinstance(item, dict):
+                raise ValueError(f"Line {line_number}: expected a JSON object")
+            yield _to_task(item, line_number)
+
+
+def _parse_json_line(line_number: int, line: str):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as error:
+        raise ValueError(f"Line {line_number}: invalid JSON ({error.msg})") from None
+
+
+def _decode_csv(lines: Iterable[str]) -> Iterator[Task]:
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    if not {"description", "due_date"} <= set(header):
+        raise ValueError(f"Line 1: expected the header {','.join(CSV_HEADER)}")
+    for row in reader:
+        if row:
+            yield _to_task({key: value for key, value in zip(header, row) if value != ""}, reader.line_num)
+
+
+def _to_task(item: dict, line_number: int) -> Task:
+    description = item.get("description")
+    if not isinstance(description, str) or not description:
+        raise ValueError(f"Line {line_number}: description is required")
+    status = item.get("status", OPEN)
+    if status not in STATUSES:
+        raise ValueError(f"Line {line_number}: status must be {OPEN} or {CLOSED}")
+    try:
+        due_date = date.fromisoformat(item["due_date"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Line {line_number}: invalid due_date (YYYY-MM-DD)") from None
+    return Task(_to_id(item.get("id"), line_number), description, due_date, status)
+
+
+def _to_id(value, line_number: int) -> Optional[int]:
+    if value is None:
+        return None
+    # CSV fields are always text; JSON ids must already be integers, so true or 1.9 are not coerced.
+    if isinstance(value, str) and INTEGER_TEXT.fullmatch(value):
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not MIN_TASK_ID <= value <= MAX_TASK_ID:
+        raise ValueError(f"Line {line_number}: id must be an integer between {MIN_TASK_ID} and {MAX_TASK_ID}")
+    return value
@@ -1,6 +1,15 @@
 from datetime import date
+from typing import List, Optional
+from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_filter import TaskFilter
 from task_manager.service.task_service import TaskService
 
+PAGE_SIZE = 50
+NEXT_PAGE = "n"
+PREVIOUS_PAGE = "p"
+FILTER = "f"
+BACK = "0"
+
 
 class ConsoleMenu:
 
@@ -35,11 +44,59 @@ class ConsoleMenu:
         print("5 - Concluir tarefa")
 
     def _list_tasks(self):
-        for task in self.service.list_tasks():
-            print(
-                f"[{task.id}] {task.description} | "
-                f"Até: {task.due_date} | Status: {task.status}"
+        task_filter = TaskFilter()
+        # Cursor of every page up to the current one; previous pages are fetched again instead of kept.
+        cursors = [None]
+        while True:
+            # The extra task only tells whether there is a next page.
+            tasks = self.service.list_tasks(after_id=cursors[-1], limit=PAGE_SIZE + 1, task_filter=task_filter)
+            has_next_page = len(tasks) > PAGE_SIZE
+            tasks = tasks[:PAGE_SIZE]
+            self._print_page(tasks, len(cursors), task_filter)
+
+            option = input("n - Próxima | p - Anterior | f - Filtrar | 0 - Voltar: ").strip().lower()
+            if option == BACK:
+                break
+            elif option == NEXT_PAGE and has_next_page:
+                cursors.append(tasks[-1].id)
+            elif option == PREVIOUS_PAGE and len(cursors) > 1:
+                cursors.pop()
+            elif option == FILTER:
+                task_filter = self._read_filter(task_filter)
+                cursors = [None]
+
+    def _print_page(self, tasks: List[Task], page: int, task_filter: TaskFilter):
+        lines = [f"\n--- Tarefas (página {page}) ---"]
+        if not task_filter.is_empty():
+            lines.append(
+                f"Filtro: status {task_filter.status or 'todos'} | "
+                f"de {task_filter.due_after or '-'} até {task_filter.due_before or '-'}"
             )
+        lines.extend(
+            f"[{task.id}] {task.description} | Até: {task.due_date} | Status: {task.status}"
+            for task in tasks
+        )
+        if not tasks:
+            lines.append("Nenhuma tarefa encontrada.")
+        # A single write per page instead of one per task.
+        print("\n".join(lines))
+
+    def _read_filter(self, current: TaskFilter) -> TaskFilter:
+        status = input("Status (OPEN/CLOSED, vazio para todos): ").strip().upper() or None
+        if status not in (None, OPEN, CLOSED):
+            print("Status inválido.")
+            return current
+        try:
+            due_after = self._read_optional_date("Vence a partir de (YYYY-MM-DD, vazio para ignorar): ")
+            due_before = self._read_optional_date("Vence até (YYYY-MM-DD, vazio para ignorar): ")
+        except ValueError:
+            print("Data inválida.")
+            return current
+        return TaskFilter(status=status, due_after=due_after, due_before=due_before)
+
+    def _read_optional_date(self, prompt: str) -> Optional[date]:
+        value = input(prompt).strip()
+        return date.fromisoformat(value) if value else None
 
     def _add_task(self):
         desc = input("Descrição: ")
@@ -0,0 +1,64 @@
+import pytest
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from task_manager.repository.group_commit_writer import GroupCommitWriter
+from task_manager.repository.sqlite_connection_pool import SQLiteConnectionPool
+
+@pytest.fixture
+def pool():
+    pool = SQLiteConnectionPool(Path(":memory:"), 1, {})
+    with pool.connection() as connection:
+        connection.execute("CREATE TABLE items (value TEXT NOT NULL)")
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def writer(pool):
+    writer = GroupCommitWriter(pool, max_batch_size=8)
+    yield writer
+    writer.close()
+
+def insert(value):
+    return lambda connection: connection.execute("INSERT INTO items (value) VALUES (?)", (value,)).lastrowid
+
+def values(pool):
+    with pool.connection() as connection:
+        return sorted(row[0] for row in connection.execute("SELECT value FROM items"))
+
+def test_submit_returns_result_after_commit(writer, pool):
+    row_id = writer.submit(insert("a"))
+
+    assert row_id == 1
+    assert values(pool) == ["a"]
+
+def test_failing_operation_does_not_undo_batch_mates(writer, pool):
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(connection):
+        started.set()
+        release.wait()
+        return insert("first")(connection)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        first = executor.submit(writer.submit, blocking)
+        started.wait()
+        ok = executor.submit(writer.submit, insert("ok"))
+        failing = executor.submit(writer.submit, insert(None))
+        while writer._queue.qsize() < 2:
+            threading.Event().wait(0.001)
+        release.set()
+
+        assert first.result() == 1
+        assert ok.result() is not None
+        with pytest.raises(sqlite3.IntegrityError):
+            failing.result()
+
+    assert values(pool) == ["first", "ok"]
+
+def test_concurrent_submissions_are_all_committed(writer, pool):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: writer.submit(insert(str(i))), range(100)))
+
+    assert len(values(pool)) == 100
@@ -0,0 +1,228 @@
+import pytest
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository.sharded_task_repository import ShardedTaskRepository, shard_paths
+from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
+
+SHARD_COUNT = 3
+
+@pytest.fixture
+def repository(tmp_path):
+    repo = ShardedTaskRepository([
+        SQLiteTaskRepository(path) for path in shard_paths(tmp_path / "tasks.db", SHARD_COUNT)
+    ])
+    yield repo
+    repo.close()
+
+def save_tasks(repository, count):
+    tasks = [Task(None, f"Task {index}", date(2024, 1, 1 + index % 28)) for index in range(count)]
+    for task in tasks:
+        repository.save(task)
+    return tasks
+
+def test_shard_paths():
+    assert shard_paths(Path("data/tasks.db"), 2) == [Path("data/tasks-0.db"), Path("data/tasks-1.db")]
+
+def test_save_spreads_tasks_and_ids_name_their_shard(repository):
+    tasks = save_tasks(repository, 6)
+
+    assert sorted(task.id % SHARD_COUNT for task in tasks) == [0, 0, 1, 1, 2, 2]
+    assert len({task.id for task in tasks}) == 6
+    for task in tasks:
+        assert repository.find_by_id(task.id) == task
+
+def test_find_all_returns_every_shard_in_id_order(repository):
+    tasks = save_tasks(repository, 7)
+
+    assert repository.find_all() == sorted(tasks, key=lambda task: task.id)
+
+def test_find_page_walks_all_tasks_in_order(repository):
+    tasks = save_tasks(repository, 10)
+    expected = sorted(task.id for task in tasks)
+
+    seen = []
+    after_id = None
+    while True:
+        page = repository.find_page(after_id, 3)
+        if not page:
+            break
+        seen.extend(task.id for task in page)
+        after_id = page[-1].id
+
+    assert seen == expected
+
+def test_find_by_filter_with_cursor(repository):
+    tasks = save_tasks(repository, 9)
+    for task in tasks[::2]:
+        repository.update_status(task.id, CLOSED)
+    closed_ids = sorted(task.id for task in tasks[::2])
+
+    first = repository.find_by_filter(TaskFilter(status=CLOSED), limit=2)
+    rest = repository.find_by_filter(TaskFilter(status=CLOSED), after_id=first[-1].id)
+
+    assert [task.id for task in first + rest] == closed_ids
+
+def test_iter_all_merges_shards_lazily_in_order(repository):
+    tasks = save_tasks(repository, 8)
+
+    assert [task.id for task in repository.iter_all(batch_size=2)] == sorted(task.id for task in tasks)
+
+def test_save_many_keeps_batch_on_one_shard(repository):
+    tasks = [Task(None, f"Batch {index}", date(2024, 1, 1)) for index in range(4)]
+
+    repository.save_many(tasks)
+
+    assert len({task.id % SHARD_COUNT for task in tasks}) == 1
+    assert repository.find_by_ids([task.id for task in tasks]) == sorted(tasks, key=lambda task: task.id)
+
+def test_batch_operations_route_ids_to_their_shards(repository):
+    tasks = save_tasks(repository, 6)
+    ids = [task.id for task in tasks]
+
+    closed = repository.update_status_many(ids[:4], CLOSED)
+    updated = repository.update_details_many([(ids[4], "Renamed", date(2025, 5, 5))])
+    deleted = repository.delete_many(ids[:2])
+
+    assert sorted(task.id for task in closed) == sorted(ids[:4])
+    assert all(task.status == CLOSED for task in closed)
+    assert updated[0].id == ids[4] and updated[0].description == "Renamed"
+    assert sorted(task.id for task in deleted) == sorted(ids[:2])
+    assert repository.find_by_ids(ids[:2]) == []
+    assert len(repository.find_all()) == 4
+
+def test_update_and_delete_single_task(repository):
+    task, = save_tasks(repository, 1)
+    task.description = "Changed"
+    repository.update(task)
+
+    assert repository.find_by_id(task.id).description == "Changed"
+    assert repository.delete(task.id).id == task.id
+    assert repository.find_by_id(task.id) is None
+
+def test_search_returns_global_ids(repository):
+    tasks = save_tasks(repository, 6)
+    repository.update_details(tasks[3].id, "Buy milk", date(2024, 1, 1))
+
+    assert [task.id for task in repository.search("milk", 10)] == [tasks[3].id]
+    assert len(repository.search("task", 4)) == 4
+
+def test_task_counts_sum_across_shards(repository):
+    for _ in range(5):
+        repository.save(Task(None, "Same day", date(2024, 3, 1)))
+
+    assert repository.task_counts() == [(OPEN, date(2024, 3, 1), 5)]
+
+def test_import_tasks_keeps_ids_and_routes_them(repository):
+    imported = [Task(index, f"Imported {index}", date(2024, 2, 1)) for index in range(1, 8)]
+
+    assert repository.import_tasks(iter(imported)) == 7
+    assert repository.find_all() == imported
+    assert repository.find_by_id(5).description == "Imported 5"
+
+def test_paging_includes_local_id_zero_and_negative_ids(repository):
+    # Global id 1 is local id 0 on shard 1.
+    repository.import_tasks([Task(task_id, f"Task {task_id}", date(2024, 2, 1)) for task_id in (-2, 0, 1, 2)])
+
+    first_page = repository.find_page(None, 3)
+
+    assert [task.id for task in first_page] == [-2, 0, 1]
+    assert [task.id for task in repository.find_page(first_page[-1].id, 3)] == [2]
+    assert [task.id for task in repository.find_by_filter(TaskFilter(status=OPEN), limit=3)] == [-2, 0, 1]
+
+def test_max_task_id_maps_shard_maxima_to_global_ids(repository):
+    assert repository.max_task_id() is None
+
+    repository.import_tasks([Task(task_id, f"Task {task_id}", date(2024, 2, 1)) for task_id in (4, 9)])
+
+    assert repository.max_task_id() == 9
+
+def test_import_tasks_conflict_raises(repository):
+    task, = save_tasks(repository, 1)
+
+    with pytest.raises(ValueError):
+        repository.import_tasks([Task(task.id, "Duplicate", date(2024, 1, 1))])
+
+def test_import_tasks_replace_existing(repository):
+    save_tasks(repository, 4)
+
+    repository.import_tasks([Task(None, "Only", date(2024, 1, 1))], replace_existing=True)
+
+    assert [task.description for task in repository.find_all()] == ["Only"]
+
+def test_queries_do_not_wait_for_a_running_import(repository):
+    release = threading.Event()
+
+    def slow_input():
+        yield Task(None, "Imported", date(2024, 1, 1))
+        release.wait(5)
+
+    importer = threading.Thread(target=lambda: repository.import_tasks(slow_input()))
+    importer.start()
+    started_at = time.monotonic()
+    repository.data_version()
+    repository.find_all()
+    elapsed = time.monotonic() - started_at
+    release.set()
+    importer.join()
+
+    assert elapsed < 2
+    assert [task.description for task in repository.find_all()] == ["Imported"]
+
+def test_data_version_changes_on_any_shard_write(repository):
+    before = repository.data_version()
+    save_tasks(repository, 1)
+
+    assert repository.data_version() > before
+
+def test_find_changes_merges_shards_with_global_ids(repository):
+    start = repository.find_changes("0", 10)
+    tasks = save_tasks(repository, 4)
+    repository.update_status(tasks[0].id, CLOSED)
+    repository.delete(tasks[1].id)
+
+    feed = repository.find_changes(start.last_seq, 10)
+
+    assert start.reset is True
+    assert len(start.last_seq.split(".")) == SHARD_COUNT
+    assert sorted(change.task_id for change in feed.changes) == sorted(task.id for task in tasks)
+    changes = {change.task_id: change for change in feed.changes}
+    assert changes[tasks[0].id].task == repository.find_by_id(tasks[0].id)
+    assert changes[tasks[1].id].task is None
+    assert repository.find_changes(feed.last_seq, 10).changes == []
+
+def test_find_changes_pages_across_shards(repository):
+    since = repository.find_changes("0", 10).last_seq
+    tasks = save_tasks(repository, 7)
+
+    seen = []
+    while True:
+        feed = repository.find_changes(since, 2)
+        if not feed.changes:
+            break
+        assert len(feed.changes) <= 2
+        seen.extend(change.task_id for change in feed.changes)
+        since = feed.last_seq
+
+    assert sorted(seen) == sorted(task.id for task in tasks)
+
+@pytest.mark.parametrize("cursor", ["1.2", "x.0.0", "-1.0.0"])
+def test_find_changes_rejects_invalid_cursor(repository, cursor):
+    with pytest.raises(ValueError):
+        repository.find_changes(cursor, 10)
+
+def test_archive_closed_tasks_drains_every_shard(repository):
+    tasks = save_tasks(repository, 6)
+    repository.update_status_many([task.id for task in tasks], CLOSED)
+
+    # Closed today, so a cutoff of tomorrow makes all of them old enough.
+    assert repository.archive_closed_tasks(date.today() + timedelta(days=1), 1) == SHARD_COUNT
+    assert repository.archive_closed_tasks(date.today() + timedelta(days=1), 10) == 3
+    repository.compact()
+
+    assert repository.find_all() == []
+    assert repository.find_by_id(tasks[0].id).status == CLOSED
+    assert len(repository.find_by_filter(TaskFilter(include_archived=True))) == 6
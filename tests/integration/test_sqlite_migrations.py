@@ -0,0 +1,97 @@
+import pytest
+import sqlite3
+from datetime import date
+from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository import sqlite_migrations
+from task_manager.repository.sqlite_migrations import SCHEMA_VERSION, migrate, schema_version
+from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
+
+LEGACY_DATES = ["0001-01-01", "2024-02-29", "2024-03-01", "9999-12-31"]
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    # Schema and rows as written before migrations existed.
+    db_path = tmp_path / "tasks.db"
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, due_date TEXT NOT NULL, status TEXT NOT NULL)")
+    connection.executemany(
+        "INSERT INTO tasks (description, due_date, status) VALUES (?, ?, ?)",
+        [(f"Legacy {due_date}", due_date, OPEN) for due_date in LEGACY_DATES] + [("Deleted", "2024-01-01", CLOSED)]
+    )
+    connection.execute("DELETE FROM tasks WHERE description = 'Deleted'")
+    connection.commit()
+    connection.close()
+    return db_path
+
+def test_new_database_is_created_at_current_version(tmp_path):
+    repository = SQLiteTaskRepository(tmp_path / "tasks.db")
+    repository.save(Task(id=None, description="Task", due_date=date(2024, 1, 1)))
+
+    with repository.pool.connection() as connection:
+        assert schema_version(connection) == SCHEMA_VERSION
+        assert connection.execute("SELECT due_date FROM tasks").fetchone()[0] == date(2024, 1, 1).toordinal()
+
+def test_legacy_database_is_upgraded_in_place(legacy_db):
+    repository = SQLiteTaskRepository(legacy_db)
+
+    tasks = repository.find_all()
+    assert [t.due_date for t in tasks] == [date.fromisoformat(d) for d in LEGACY_DATES]
+    assert [t.id for t in tasks] == [1, 2, 3, 4]
+    assert repository.find_by_filter(TaskFilter(due_after=date(2024, 2, 29), due_before=date(2024, 3, 1))) == tasks[1:3]
+    assert [t.id for t in repository.search("legacy", 10)] == [1, 2, 3, 4]
+
+def test_upgrade_keeps_id_sequence_and_triggers(legacy_db):
+    repository = SQLiteTaskRepository(legacy_db)
+    version = repository.data_version()
+    task = Task(id=None, description="After upgrade", due_date=date.today())
+
+    repository.save(task)
+
+    assert task.id == 6
+    assert repository.data_version() > version
+    assert [t.id for t in repository.search("upgrade", 10)] == [task.id]
+
+def test_upgrade_backfills_task_counts(legacy_db):
+    repository = SQLiteTaskRepository(legacy_db)
+
+    assert sorted(repository.task_counts()) == [(OPEN, date.fromisoformat(d), 1) for d in LEGACY_DATES]
+
+def test_upgrade_stamps_closed_tasks_for_archival(legacy_db):
+    connection = sqlite3.connect(legacy_db)
+    connection.execute("INSERT INTO tasks (description, due_date, status) VALUES ('Closed', '2024-01-01', ?)", (CLOSED,))
+    connection.commit()
+    connection.close()
+
+    SQLiteTaskRepository(legacy_db)
+
+    connection = sqlite3.connect(legacy_db)
+    assert connection.execute("SELECT status, closed_at FROM tasks WHERE closed_at IS NOT NULL").fetchall() == [
+        (CLOSED, date.today().toordinal())
+    ]
+
+def test_migrate_is_a_no_op_at_current_version(legacy_db):
+    connection = sqlite3.connect(legacy_db)
+
+    assert migrate(connection) == SCHEMA_VERSION
+    assert migrate(connection) == 0
+
+def test_newer_schema_is_rejected(legacy_db):
+    connection = sqlite3.connect(legacy_db)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+    with pytest.raises(RuntimeError):
+        migrate(connection)
+
+def test_failed_migration_is_rolled_back(legacy_db, monkeypatch):
+    def broken_migration(connection):
+        connection.execute("DROP TABLE tasks")
+        raise sqlite3.OperationalError("boom")
+    monkeypatch.setattr(sqlite_migrations, "MIGRATIONS", [sqlite_migrations.create_base_schema, broken_migration])
+    connection = sqlite3.connect(legacy_db)
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(connection)
+
+    assert schema_version(connection) == 0
+    assert connection.execute("SELECT due_date FROM tasks WHERE id = 1").fetchone()[0] == "0001-01-01"
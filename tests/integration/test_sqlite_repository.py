@@ -1,8 +1,16 @@
+import threading
 import pytest
 import sqlite3
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date, timedelta
 from pathlib import Path
 from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_change import ChangeFeed
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.metrics import registry as metrics
+from task_manager.repository.caching_task_repository import CachingTaskRepository
+from task_manager.repository.in_memory_task_repository import InMemoryTaskRepository
 from task_manager.repository.sqlite_task_repository import SQLiteTaskRepository
 
 # Use an in-memory database for testing to avoid file I/O and cleanup issues
@@ -63,3 +71,678 @@ def test_delete(repository):
 
 def test_find_by_id_not_found(repository):
     assert repository.find_by_id(999) is None
+
+def test_delete_returns_deleted_task(repository):
+    task = Task(id=None, description="To Delete", due_date=date.today())
+    repository.save(task)
+
+    assert repository.delete(task.id) == task
+    assert repository.delete(task.id) is None
+
+def test_update_details(repository):
+    task = Task(id=None, description="Original", due_date=date.today(), status=CLOSED)
+    repository.save(task)
+
+    updated = repository.update_details(task.id, "Updated", date(2024, 1, 1))
+
+    assert updated == Task(id=task.id, description="Updated", due_date=date(2024, 1, 1), status=CLOSED)
+    assert repository.find_by_id(task.id) == updated
+    assert repository.update_details(999, "Missing", date.today()) is None
+
+def test_update_status(repository):
+    task = Task(id=None, description="Task", due_date=date.today())
+    repository.save(task)
+
+    assert repository.update_status(task.id, CLOSED).status == CLOSED
+    assert repository.find_by_id(task.id).status == CLOSED
+    assert repository.update_status(999, CLOSED) is None
+
+def test_update_details_many(repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(2)]
+    repository.save_many(tasks)
+
+    updated = repository.update_details_many([
+        (tasks[0].id, "First", date(2024, 1, 1)),
+        (999, "Missing", date(2024, 1, 1))
+    ])
+
+    assert [(t.id, t.description) for t in updated] == [(tasks[0].id, "First")]
+
+def test_update_status_many(repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)]
+    repository.save_many(tasks)
+
+    closed = repository.update_status_many([tasks[0].id, tasks[1].id, 999], CLOSED)
+
+    assert sorted(t.id for t in closed) == [tasks[0].id, tasks[1].id]
+    assert [t.status for t in repository.find_all()] == [CLOSED, CLOSED, OPEN]
+
+def test_find_page(repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(5)]
+    for task in tasks:
+        repository.save(task)
+
+    first_page = repository.find_page(None, 2)
+    second_page = repository.find_page(first_page[-1].id, 2)
+    last_page = repository.find_page(second_page[-1].id, 2)
+
+    assert [t.id for t in first_page] == [tasks[0].id, tasks[1].id]
+    assert [t.id for t in second_page] == [tasks[2].id, tasks[3].id]
+    assert [t.id for t in last_page] == [tasks[4].id]
+    assert repository.find_page(last_page[-1].id, 2) == []
+
+def test_iter_all_in_batches(repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(5)]
+    for task in tasks:
+        repository.save(task)
+
+    streamed = list(repository.iter_all(batch_size=2))
+
+    assert [t.id for t in streamed] == [t.id for t in tasks]
+
+@pytest.fixture
+def dated_tasks(repository):
+    tasks = [
+        Task(id=None, description="Past open", due_date=date.today() - timedelta(days=3)),
+        Task(id=None, description="Past closed", due_date=date.today() - timedelta(days=3), status=CLOSED),
+        Task(id=None, description="Today", due_date=date.today()),
+        Task(id=None, description="Next week", due_date=date.today() + timedelta(days=7)),
+    ]
+    for task in tasks:
+        repository.save(task)
+    return tasks
+
+def test_find_by_filter_status(repository, dated_tasks):
+    tasks = repository.find_by_filter(TaskFilter(status=CLOSED))
+
+    assert [t.description for t in tasks] == ["Past closed"]
+
+def test_find_by_filter_due_range(repository, dated_tasks):
+    task_filter = TaskFilter(due_after=date.today(), due_before=date.today() + timedelta(days=7))
+
+    tasks = repository.find_by_filter(task_filter)
+
+    assert [t.description for t in tasks] == ["Today", "Next week"]
+
+def test_find_by_filter_overdue(repository, dated_tasks):
+    tasks = repository.find_by_filter(TaskFilter(overdue=True))
+
+    assert [t.description for t in tasks] == ["Past open"]
+
+def test_find_by_filter_paginated(repository, dated_tasks):
+    first_page = repository.find_by_filter(TaskFilter(status=OPEN), limit=2)
+    second_page = repository.find_by_filter(TaskFilter(status=OPEN), after_id=first_page[-1].id, limit=2)
+
+    assert [t.description for t in first_page] == ["Past open", "Today"]
+    assert [t.description for t in second_page] == ["Next week"]
+
+def test_open_streams_do_not_hold_pool_connections(tmp_path):
+    repo = SQLiteTaskRepository(tmp_path / "tasks.db", pool_size=1)
+    repo.save_many([Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(5)])
+    streams = [repo.iter_all(batch_size=2), repo.iter_all(batch_size=2)]
+    for stream in streams:
+        next(stream)
+
+    found = []
+    reader = threading.Thread(target=lambda: found.append(repo.find_by_id(1)))
+    reader.start()
+    reader.join(timeout=5)
+
+    assert found and found[0].id == 1
+    assert [task.id for task in streams[0]] == [2, 3, 4, 5]
+    repo.close()
+
+def test_paging_includes_imported_ids_below_one(repository):
+    repository.import_tasks([Task(id=task_id, description=f"Task {task_id}", due_date=date.today()) for task_id in (-5, 0, 3)])
+
+    first_page = repository.find_page(None, 2)
+    filtered = repository.find_by_filter(TaskFilter(status=OPEN), limit=2)
+
+    assert [task.id for task in first_page] == [-5, 0]
+    assert [task.id for task in repository.find_page(first_page[-1].id, 2)] == [3]
+    assert [task.id for task in filtered] == [-5, 0]
+    assert [task.id for task in repository.iter_all(batch_size=1)] == [-5, 0, 3]
+
+def test_iter_all_filtered(repository, dated_tasks):
+    tasks = list(repository.iter_all(task_filter=TaskFilter(status=OPEN, due_after=date.today())))
+
+    assert [t.description for t in tasks] == ["Today", "Next week"]
+
+def test_status_due_date_filter_uses_index(repository):
+    with repository.pool.connection() as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE status = ? AND due_date < ?",
+            (OPEN, date.today().isoformat())
+        ).fetchall()
+
+    assert any("idx_tasks_status_due_date" in row[-1] for row in plan)
+
+def test_save_many(repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)]
+
+    repository.save_many(tasks)
+
+    assert all(t.id is not None for t in tasks)
+    assert repository.find_by_ids([t.id for t in tasks]) == tasks
+
+def test_find_by_ids_ignores_missing(repository):
+    task = Task(id=None, description="Task", due_date=date.today())
+    repository.save(task)
+
+    assert repository.find_by_ids([task.id, 999]) == [task]
+
+def test_update_many(repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(2)]
+    repository.save_many(tasks)
+    for task in tasks:
+        task.close()
+
+    repository.update_many(tasks)
+
+    assert all(t.status == CLOSED for t in repository.find_all())
+
+def test_delete_many(repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)]
+    repository.save_many(tasks)
+
+    deleted = repository.delete_many([tasks[0].id, tasks[2].id, 999])
+
+    assert sorted(t.id for t in deleted) == [tasks[0].id, tasks[2].id]
+    assert repository.find_all() == [tasks[1]]
+
+def test_save_many_is_atomic(repository):
+    tasks = [
+        Task(id=None, description="Valid", due_date=date.today()),
+        Task(id=None, description=None, due_date=date.today())
+    ]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        repository.save_many(tasks)
+
+    assert repository.find_all() == []
+
+def test_data_version_changes_on_every_write(repository):
+    versions = [repository.data_version()]
+    task = Task(id=None, description="Task", due_date=date.today())
+
+    repository.save(task)
+    versions.append(repository.data_version())
+    repository.update_status(task.id, CLOSED)
+    versions.append(repository.data_version())
+    repository.delete(task.id)
+    versions.append(repository.data_version())
+
+    assert versions == sorted(set(versions))
+
+def test_data_version_unchanged_by_reads(repository):
+    repository.save(Task(id=None, description="Task", due_date=date.today()))
+    version = repository.data_version()
+
+    repository.find_all()
+
+    assert repository.data_version() == version
+
+def test_task_counts_follow_writes(repository):
+    today = date.today()
+    tasks = [
+        Task(id=None, description="A", due_date=today),
+        Task(id=None, description="B", due_date=today),
+        Task(id=None, description="C", due_date=today + timedelta(days=1)),
+    ]
+    repository.save_many(tasks)
+
+    repository.update_status(tasks[0].id, CLOSED)
+    repository.update_details(tasks[1].id, "B2", today + timedelta(days=1))
+    repository.update_details(tasks[2].id, "C2", today + timedelta(days=1))
+    repository.delete(tasks[0].id)
+
+    assert repository.task_counts() == [(OPEN, today + timedelta(days=1), 2)]
+
+def test_rows_share_parsed_dates(repository):
+    repository.save_many([Task(id=None, description=f"Task {i}", due_date=date(2024, 1, 1)) for i in range(3)])
+
+    tasks = repository.find_all() + list(repository.iter_all())
+
+    assert all(t.due_date == date(2024, 1, 1) for t in tasks)
+    assert len({id(t.due_date) for t in tasks}) == 1
+
+def test_search_ranks_matching_tasks(repository):
+    repository.save_many([
+        Task(id=None, description="Buy milk", due_date=date.today()),
+        Task(id=None, description="Pay the bills", due_date=date.today()),
+        Task(id=None, description="Milk, milk and more milk", due_date=date.today()),
+    ])
+
+    tasks = repository.search("milk", 10)
+
+    assert [t.description for t in tasks] == ["Milk, milk and more milk", "Buy milk"]
+    assert repository.search("milk", 1)[0].description == "Milk, milk and more milk"
+
+def test_search_ignores_case_and_diacritics(repository):
+    repository.save(Task(id=None, description="Reunião de Avaliação", due_date=date.today()))
+
+    assert len(repository.search("REUNIAO avaliacao", 10)) == 1
+    assert repository.search("reunião orçamento", 10) == []
+
+def test_search_treats_operators_as_text(repository):
+    repository.save(Task(id=None, description="Review NEAR deadline", due_date=date.today()))
+
+    assert len(repository.search('near AND "deadline*', 10)) == 0
+    assert len(repository.search("near deadline", 10)) == 1
+    assert repository.search("  ", 10) == []
+
+def test_search_index_follows_writes(repository):
+    task = Task(id=None, description="Write report", due_date=date.today())
+    repository.save(task)
+
+    repository.update_details(task.id, "Write slides", date.today())
+    assert repository.search("report", 10) == []
+    assert [t.id for t in repository.search("slides", 10)] == [task.id]
+
+    repository.update_status(task.id, CLOSED)
+    assert repository.search("slides", 10)[0].status == CLOSED
+
+    repository.delete(task.id)
+    assert repository.search("slides", 10) == []
+
+def test_search_index_is_built_for_existing_databases(tmp_path):
+    db_path = tmp_path / "tasks.db"
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, due_date TEXT NOT NULL, status TEXT NOT NULL)")
+    connection.execute("INSERT INTO tasks (description, due_date, status) VALUES ('Legacy task', '2024-01-01', 'OPEN')")
+    connection.commit()
+    connection.close()
+
+    repository = SQLiteTaskRepository(db_path)
+
+    assert [t.description for t in repository.search("legacy", 10)] == ["Legacy task"]
+
+@pytest.fixture
+def file_repository(tmp_path):
+    repo = SQLiteTaskRepository(tmp_path / "tasks.db", pool_size=3, synchronous="NORMAL", cache_size_kib=1024)
+    yield repo
+    repo.close()
+
+def test_file_repository_applies_pragmas(file_repository):
+    with file_repository.pool.connection() as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert connection.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert connection.execute("PRAGMA cache_size").fetchone()[0] == -1024
+
+def test_memory_repository_shares_single_connection(repository):
+    assert repository.pool.size == 1
+
+def test_concurrent_writes_and_reads(file_repository):
+    def work(worker):
+        for i in range(20):
+            task = Task(id=None, description=f"Worker {worker} task {i}", due_date=date.today())
+            file_repository.save(task)
+            assert file_repository.find_by_id(task.id) == task
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(work, range(6)))
+
+    assert len(file_repository.find_all()) == 120
+
+def test_read_pool_is_read_only(file_repository):
+    with file_repository.pool.connection() as connection:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            connection.execute("DELETE FROM tasks")
+
+def test_reads_do_not_wait_for_an_open_write_transaction(tmp_path, file_repository):
+    file_repository.save(Task(id=None, description="Committed", due_date=date.today()))
+    other_writer = sqlite3.connect(tmp_path / "tasks.db")
+    other_writer.execute("BEGIN IMMEDIATE")
+    other_writer.execute("UPDATE tasks SET description = 'Uncommitted'")
+
+    try:
+        assert [t.description for t in file_repository.find_all()] == ["Committed"]
+    finally:
+        other_writer.rollback()
+        other_writer.close()
+
+def test_writes_are_serialized_through_the_writer_thread(file_repository):
+    def work(worker):
+        tasks = [Task(id=None, description=f"Worker {worker} task {i}", due_date=date.today()) for i in range(5)]
+        file_repository.save_many(tasks)
+        file_repository.update_status_many([t.id for t in tasks], CLOSED)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(work, range(6)))
+
+    assert len(file_repository.find_by_filter(TaskFilter(status=CLOSED))) == 30
+
+def test_data_version_is_shared_between_repositories(tmp_path):
+    writer = SQLiteTaskRepository(tmp_path / "tasks.db")
+    reader = SQLiteTaskRepository(tmp_path / "tasks.db")
+    version = reader.data_version()
+
+    writer.save(Task(id=None, description="Task", due_date=date.today()))
+
+    assert reader.data_version() > version
+
+def test_group_commit_repository(tmp_path):
+    repository = SQLiteTaskRepository(tmp_path / "tasks.db", group_commit=True, group_commit_max_delay_ms=1)
+
+    def work(worker):
+        task = Task(id=None, description=f"Task {worker}", due_date=date.today())
+        repository.save(task)
+        assert repository.update_status(task.id, CLOSED).status == CLOSED
+        return task.id
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        task_ids = list(executor.map(work, range(40)))
+    repository.close()
+
+    reopened = SQLiteTaskRepository(tmp_path / "tasks.db")
+    assert sorted(t.id for t in reopened.find_all()) == sorted(task_ids)
+    assert all(t.status == CLOSED for t in reopened.find_all())
+
+def test_import_reads_input_before_taking_the_write_lock(file_repository):
+    reading, release = threading.Event(), threading.Event()
+
+    def slow_input():
+        yield Task(id=None, description="Imported", due_date=date(2024, 1, 1))
+        reading.set()
+        release.wait(5)
+
+    importer = threading.Thread(target=lambda: file_repository.import_tasks(slow_input()))
+    importer.start()
+    reading.wait(5)
+    saver = threading.Thread(target=lambda: file_repository.save(Task(id=None, description="Saved", due_date=date.today())))
+    saver.start()
+    saver.join(timeout=2)
+    saved_while_reading = not saver.is_alive()
+    release.set()
+    importer.join()
+    saver.join()
+
+    assert saved_while_reading
+    assert sorted(task.description for task in file_repository.find_all()) == ["Imported", "Saved"]
+
+def test_import_tasks(file_repository):
+    file_repository.save(Task(id=None, description="Existing", due_date=date(2024, 1, 1)))
+    version = file_repository.data_version()
+
+    imported = file_repository.import_tasks(iter([
+        Task(id=10, description="Imported milk", due_date=date(2024, 1, 2), status=CLOSED),
+        Task(id=None, description="Imported without id", due_date=date(2024, 1, 2)),
+    ]))
+
+    assert imported == 2
+    assert [t.id for t in file_repository.find_all()] == [1, 10, 11]
+    assert file_repository.data_version() > version
+    assert [t.id for t in file_repository.search("milk", 10)] == [10]
+    assert sorted(file_repository.task_counts()) == [
+        (CLOSED, date(2024, 1, 2), 1), (OPEN, date(2024, 1, 1), 1), (OPEN, date(2024, 1, 2), 1)
+    ]
+    file_repository.save(Task(id=None, description="Imported later", due_date=date(2024, 1, 3)))
+    assert len(file_repository.search("imported", 10)) == 3
+    with file_repository.pool.connection() as connection:
+        indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_tasks_status_due_date", "idx_tasks_due_date"} <= indexes
+
+def test_import_tasks_replacing_existing(file_repository):
+    file_repository.save(Task(id=None, description="Existing", due_date=date(2024, 1, 1)))
+
+    file_repository.import_tasks([Task(id=1, description="Replacement", due_date=date(2024, 1, 2))], replace_existing=True)
+
+    assert [t.description for t in file_repository.find_all()] == ["Replacement"]
+    assert file_repository.search("existing", 10) == []
+
+def test_failed_import_is_rolled_back(file_repository):
+    file_repository.save(Task(id=None, description="Existing", due_date=date(2024, 1, 1)))
+
+    def tasks():
+        yield Task(id=5, description="Imported", due_date=date(2024, 1, 1))
+        yield Task(id=1, description="Conflict", due_date=date(2024, 1, 1))
+
+    with pytest.raises(ValueError):
+        file_repository.import_tasks(tasks())
+
+    assert [t.description for t in file_repository.find_all()] == ["Existing"]
+    file_repository.save(Task(id=None, description="Still triggered", due_date=date(2024, 1, 1)))
+    assert len(file_repository.search("triggered", 10)) == 1
+
+def test_import_tasks_with_group_commit(tmp_path):
+    repository = SQLiteTaskRepository(tmp_path / "tasks.db", group_commit=True)
+
+    imported = repository.import_tasks([Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)])
+    repository.close()
+
+    assert imported == 3
+    assert len(SQLiteTaskRepository(tmp_path / "tasks.db").find_all()) == 3
+
+def test_in_memory_snapshot_round_trip(tmp_path):
+    sqlite_repository = SQLiteTaskRepository(tmp_path / "tasks.db")
+    sqlite_repository.save(Task(id=None, description="Persisted", due_date=date(2024, 1, 1)))
+    memory_repository = InMemoryTaskRepository.from_repository(sqlite_repository)
+
+    memory_repository.save(Task(id=None, description="Added in memory", due_date=date(2024, 1, 2)))
+    memory_repository.update_status(1, CLOSED)
+    memory_repository.snapshot_to(sqlite_repository)
+
+    assert sqlite_repository.find_all() == memory_repository.find_all()
+    new_task = Task(id=None, description="After snapshot", due_date=date(2024, 1, 3))
+    sqlite_repository.save(new_task)
+    assert new_task.id == 3
+
+def test_repository_queries_are_instrumented(repository):
+    metrics.reset()
+    metrics.enabled = True
+    try:
+        repository.save(Task(id=None, description="Task", due_date=date.today()))
+        repository.find_all()
+        output = metrics.render()
+    finally:
+        metrics.enabled = False
+        metrics.reset()
+
+    assert 'layer="repository",operation="save"} 1' in output
+    assert 'layer="repository",operation="find_all"} 1' in output
+    assert 'layer="repository",operation="map_rows"} 1' in output
+
+def test_find_changes(file_repository):
+    since = file_repository.find_changes("0", 10)
+    assert since.reset is True
+    kept = Task(id=None, description="Kept", due_date=date(2024, 1, 1))
+    removed = Task(id=None, description="Removed", due_date=date(2024, 1, 1))
+    file_repository.save_many([kept, removed])
+    file_repository.update_details(kept.id, "Kept and edited", date(2024, 2, 1))
+    file_repository.delete(removed.id)
+
+    feed = file_repository.find_changes(since.last_seq, 10)
+
+    assert [(c.operation, c.task_id) for c in feed.changes] == [("update", kept.id), ("delete", removed.id)]
+    assert feed.changes[0].task == Task(kept.id, "Kept and edited", date(2024, 2, 1), OPEN)
+    assert feed.changes[1].task is None
+    assert file_repository.find_changes(feed.last_seq, 10) == ChangeFeed(feed.last_seq)
+
+@pytest.mark.parametrize("cursor", ["", "-1", "1.2", "x"])
+def test_find_changes_rejects_invalid_cursor(file_repository, cursor):
+    with pytest.raises(ValueError):
+        file_repository.find_changes(cursor, 10)
+
+def test_find_changes_pages_with_limit(file_repository):
+    since = file_repository.find_changes("0", 10).last_seq
+    file_repository.save_many([Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)])
+
+    first = file_repository.find_changes(since, 2)
+    rest = file_repository.find_changes(first.last_seq, 2)
+
+    assert [c.operation for c in first.changes + rest.changes] == ["insert"] * 3
+    assert first.last_seq == str(first.changes[-1].seq)
+
+def test_find_changes_resets_after_import(file_repository):
+    since = file_repository.find_changes("0", 10).last_seq
+
+    file_repository.import_tasks([Task(id=None, description="Imported", due_date=date.today())])
+    feed = file_repository.find_changes(since, 10)
+    file_repository.save(Task(id=None, description="After import", due_date=date.today()))
+
+    assert feed.reset is True
+    assert [c.task.description for c in file_repository.find_changes(feed.last_seq, 10).changes] == ["After import"]
+
+def test_find_changes_resets_when_log_was_pruned(tmp_path, file_repository):
+    since = file_repository.find_changes("0", 10).last_seq
+    file_repository.save_many([Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)])
+    connection = sqlite3.connect(tmp_path / "tasks.db")
+    connection.execute("DELETE FROM task_changes WHERE seq <= ?", (int(since) + 1,))
+    connection.commit()
+    connection.close()
+
+    assert file_repository.find_changes(since, 10).reset is True
+    assert len(file_repository.find_changes(str(int(since) + 1), 10).changes) == 2
+
+def closed_at(db_path, task_id):
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute("SELECT closed_at FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+    finally:
+        connection.close()
+
+def close_days_ago(db_path, task_ids, days):
+    connection = sqlite3.connect(db_path)
+    connection.executemany(
+        "UPDATE tasks SET closed_at = ? WHERE id = ?",
+        [((date.today() - timedelta(days=days)).toordinal(), task_id) for task_id in task_ids]
+    )
+    connection.commit()
+    connection.close()
+
+def test_closed_at_follows_status(tmp_path, file_repository):
+    task = Task(id=None, description="Task", due_date=date.today())
+    file_repository.save(task)
+    assert closed_at(tmp_path / "tasks.db", task.id) is None
+
+    file_repository.update_status(task.id, CLOSED)
+    assert closed_at(tmp_path / "tasks.db", task.id) == date.today().toordinal()
+
+    file_repository.update(replace(task, status=OPEN))
+    assert closed_at(tmp_path / "tasks.db", task.id) is None
+
+def test_closed_at_does_not_touch_version_or_change_log(file_repository):
+    task = Task(id=None, description="Task", due_date=date.today())
+    file_repository.save(task)
+    since = file_repository.find_changes("0", 10).last_seq
+    version = file_repository.data_version()
+
+    file_repository.update_status(task.id, CLOSED)
+
+    assert file_repository.data_version() == version + 1
+    assert len(file_repository.find_changes(since, 10).changes) == 1
+
+@pytest.fixture
+def archived_tasks(tmp_path, file_repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date(2024, 1, 1)) for i in range(5)]
+    file_repository.save_many(tasks)
+    file_repository.update_status_many([t.id for t in tasks[:4]], CLOSED)
+    close_days_ago(tmp_path / "tasks.db", [t.id for t in tasks[:3]], 40)
+    return tasks
+
+def test_archive_closed_tasks_moves_old_closed_tasks(file_repository, archived_tasks):
+    counts = sorted(file_repository.task_counts())
+
+    assert file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 2) == 2
+    assert file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 2) == 1
+    assert file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 2) == 0
+
+    assert [t.id for t in file_repository.find_all()] == [t.id for t in archived_tasks[3:]]
+    assert sorted(file_repository.task_counts()) == counts
+
+def test_archived_tasks_stay_reachable(file_repository, archived_tasks):
+    file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 10)
+    archived_id = archived_tasks[0].id
+
+    assert file_repository.find_by_id(archived_id) == replace(archived_tasks[0], status=CLOSED)
+    assert [t.id for t in file_repository.find_by_filter(TaskFilter(include_archived=True))] == [
+        t.id for t in archived_tasks
+    ]
+    page = file_repository.find_by_filter(TaskFilter(status=CLOSED, include_archived=True), after_id=1, limit=2)
+    assert [t.id for t in page] == [2, 3]
+    assert len(list(file_repository.iter_all(task_filter=TaskFilter(include_archived=True)))) == 5
+    assert file_repository.update_status(archived_id, OPEN) is None
+    assert file_repository.delete(archived_id).id == archived_id
+    assert file_repository.find_by_id(archived_id) is None
+
+def test_import_checks_and_replaces_archive(file_repository, archived_tasks):
+    file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 10)
+
+    with pytest.raises(ValueError, match="archived"):
+        file_repository.import_tasks([Task(id=1, description="Clash", due_date=date.today())])
+
+    file_repository.import_tasks([Task(id=1, description="Fresh", due_date=date.today())], replace_existing=True)
+    assert file_repository.find_by_filter(TaskFilter(include_archived=True)) == [
+        Task(1, "Fresh", date.today(), OPEN)
+    ]
+
+def test_archive_scan_uses_closed_at_index(file_repository):
+    with file_repository.pool.connection() as connection:
+        plan = connection.execute("EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE closed_at < ?", (1,)).fetchall()
+
+    assert any("idx_tasks_closed_at" in row[-1] for row in plan)
+
+def test_compact(tmp_path, file_repository, archived_tasks):
+    file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 10)
+
+    file_repository.compact()
+
+    connection = sqlite3.connect(tmp_path / "tasks.db")
+    assert connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert connection.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    connection.close()
+
+def test_cache_sees_writes_from_another_process(tmp_path):
+    files = [SQLiteTaskRepository(tmp_path / "tasks.db") for _ in range(2)]
+    first, second = (CachingTaskRepository(repository, version_check_seconds=0) for repository in files)
+    task = Task(id=None, description="Original", due_date=date(2024, 1, 1))
+    first.save(task)
+    second.find_by_id(task.id)
+
+    other = Task(id=None, description="Other", due_date=date(2024, 1, 1))
+    first.save(other)
+    second.find_by_id(other.id)
+
+    first.update_details(task.id, "Edited", date(2024, 1, 1))
+
+    assert second.find_by_id(task.id).description == "Edited"
+    assert second.find_by_id(other.id).description == "Other"
+    assert second.hits == 1
+    for repository in files:
+        repository.close()
+
+def test_memory_snapshot_keeps_archived_ids_and_closed_at(tmp_path, file_repository):
+    tasks = [Task(id=None, description=f"Task {i}", due_date=date(2024, 1, 1)) for i in range(3)]
+    file_repository.save_many(tasks)
+    file_repository.update_status_many([tasks[0].id, tasks[2].id], CLOSED)
+    close_days_ago(tmp_path / "tasks.db", [tasks[0].id], 10)
+    close_days_ago(tmp_path / "tasks.db", [tasks[2].id], 40)
+    file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 10)
+
+    memory_repository = InMemoryTaskRepository.from_repository(file_repository)
+    new_task = Task(id=None, description="New", due_date=date(2024, 1, 2))
+    memory_repository.save(new_task)
+    memory_repository.snapshot_to(file_repository)
+
+    assert new_task.id == tasks[2].id + 1
+    assert file_repository.find_by_id(tasks[2].id) == replace(tasks[2], status=CLOSED)
+    assert closed_at(tmp_path / "tasks.db", tasks[0].id) == (date.today() - timedelta(days=10)).toordinal()
+
+def test_replace_all_rejects_archived_ids(file_repository, archived_tasks):
+    file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 10)
+    remaining = file_repository.find_all()
+
+    with pytest.raises(ValueError, match="archived"):
+        file_repository.replace_all(remaining + [Task(archived_tasks[0].id, "Clash", date(2024, 1, 1))])
+
+    assert file_repository.find_all() == remaining
+
+def test_max_task_id_includes_archived_tasks(file_repository, archived_tasks):
+    assert file_repository.max_task_id() == archived_tasks[4].id
+
+    file_repository.archive_closed_tasks(date.today() - timedelta(days=30), 10)
+    for task in archived_tasks[3:]:
+        file_repository.delete(task.id)
+
+    assert file_repository.max_task_id() == archived_tasks[2].id
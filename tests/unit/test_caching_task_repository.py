@@ -0,0 +1,183 @@
+import pytest
+from datetime import date
+from unittest.mock import Mock
+from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_change import ChangeFeed, TaskChange, UPDATED
+from task_manager.repository.caching_task_repository import CHANGE_PAGE_SIZE, CachingTaskRepository
+from task_manager.repository.task_repository_interface import TaskRepositoryInterface
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def mock_repository():
+    repository = Mock(spec=TaskRepositoryInterface)
+    repository.find_by_id.side_effect = lambda task_id: Task(id=task_id, description=f"Task {task_id}", due_date=date(2024, 1, 1))
+    repository.data_version.return_value = 1
+    repository.find_changes.return_value = ChangeFeed("1")
+    return repository
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def caching_repository(mock_repository, clock):
+    return CachingTaskRepository(mock_repository, max_size=2, ttl_seconds=10, clock=clock)
+
+def test_find_by_id_is_cached(caching_repository, mock_repository):
+    first = caching_repository.find_by_id(1)
+    second = caching_repository.find_by_id(1)
+
+    assert first == second
+    mock_repository.find_by_id.assert_called_once_with(1)
+    assert caching_repository.hits == 1
+    assert caching_repository.misses == 1
+
+def test_cached_task_is_a_copy(caching_repository):
+    caching_repository.find_by_id(1).description = "Mutated"
+
+    assert caching_repository.find_by_id(1).description == "Task 1"
+
+def test_missing_task_is_not_cached(caching_repository, mock_repository):
+    mock_repository.find_by_id.side_effect = None
+    mock_repository.find_by_id.return_value = None
+
+    assert caching_repository.find_by_id(999) is None
+    assert caching_repository.find_by_id(999) is None
+    assert mock_repository.find_by_id.call_count == 2
+
+def test_least_recently_used_entry_is_evicted(caching_repository, mock_repository):
+    caching_repository.find_by_id(1)
+    caching_repository.find_by_id(2)
+    caching_repository.find_by_id(1)
+    caching_repository.find_by_id(3)
+
+    assert len(caching_repository) == 2
+    caching_repository.find_by_id(1)
+    caching_repository.find_by_id(2)
+    assert [c.args[0] for c in mock_repository.find_by_id.call_args_list] == [1, 2, 3, 2]
+
+def test_entries_expire_after_ttl(caching_repository, mock_repository, clock):
+    caching_repository.find_by_id(1)
+    clock.now = 11
+
+    caching_repository.find_by_id(1)
+
+    assert mock_repository.find_by_id.call_count == 2
+
+def test_update_status_invalidates_entry(caching_repository, mock_repository):
+    caching_repository.find_by_id(1)
+    closed = Task(id=1, description="Task 1", due_date=date(2024, 1, 1), status=CLOSED)
+    mock_repository.update_status.return_value = closed
+
+    assert caching_repository.update_status(1, CLOSED) == closed
+    caching_repository.find_by_id(1)
+
+    assert mock_repository.find_by_id.call_count == 2
+
+def test_delete_many_invalidates_entries(caching_repository, mock_repository):
+    caching_repository.find_by_id(1)
+    caching_repository.find_by_id(2)
+    mock_repository.delete_many.return_value = []
+
+    caching_repository.delete_many([1, 2])
+
+    assert len(caching_repository) == 0
+
+def test_read_racing_with_write_is_not_cached(caching_repository, mock_repository):
+    def find_during_update(task_id):
+        caching_repository.update_details(task_id, "New", date(2024, 1, 2))
+        return Task(id=task_id, description="Old", due_date=date(2024, 1, 1))
+    mock_repository.find_by_id.side_effect = find_during_update
+
+    caching_repository.find_by_id(1)
+
+    assert len(caching_repository) == 0
+
+def test_cache_hits_do_not_reach_the_repository(caching_repository, mock_repository, clock):
+    caching_repository.find_by_id(1)
+    for _ in range(100):
+        caching_repository.find_by_id(1)
+
+    mock_repository.find_by_id.assert_called_once_with(1)
+    mock_repository.data_version.assert_called_once_with()
+    assert caching_repository.hits == 100
+
+def test_write_from_another_process_evicts_changed_tasks(caching_repository, mock_repository, clock):
+    caching_repository.find_by_id(1)
+    caching_repository.find_by_id(2)
+    mock_repository.data_version.return_value = 2
+    mock_repository.find_changes.return_value = ChangeFeed("2", [TaskChange(2, UPDATED, 1)])
+
+    caching_repository.find_by_id(1)
+    assert caching_repository.hits == 1
+    clock.now = 1
+    caching_repository.find_by_id(1)
+    caching_repository.find_by_id(2)
+
+    mock_repository.find_changes.assert_called_with("1", CHANGE_PAGE_SIZE)
+    assert [c.args[0] for c in mock_repository.find_by_id.call_args_list] == [1, 2, 1]
+    assert caching_repository.hits == 2
+
+def test_change_feed_reset_drops_every_entry(caching_repository, mock_repository, clock):
+    caching_repository.find_by_id(1)
+    mock_repository.data_version.return_value = 2
+    mock_repository.find_changes.return_value = ChangeFeed("9", reset=True)
+    clock.now = 1
+
+    caching_repository.find_by_id(1)
+
+    assert mock_repository.find_by_id.call_count == 2
+    assert caching_repository.hits == 0
+
+def test_find_by_ids_only_loads_missing(caching_repository, mock_repository):
+    caching_repository.find_by_id(1)
+    mock_repository.find_by_ids.return_value = [Task(id=2, description="Task 2", due_date=date(2024, 1, 1))]
+
+    tasks = caching_repository.find_by_ids([1, 2])
+
+    assert [t.id for t in tasks] == [1, 2]
+    mock_repository.find_by_ids.assert_called_once_with([2])
+
+def test_queries_are_delegated(caching_repository, mock_repository):
+    mock_repository.find_all.return_value = []
+
+    assert caching_repository.find_all() == []
+    mock_repository.find_all.assert_called_once()
+
+def test_search_is_delegated(caching_repository, mock_repository):
+    mock_repository.search.return_value = []
+
+    assert caching_repository.search("milk", 5) == []
+    mock_repository.search.assert_called_once_with("milk", 5)
+
+def test_task_counts_are_delegated(caching_repository, mock_repository):
+    mock_repository.task_counts.return_value = [(OPEN, date(2024, 1, 1), 3)]
+
+    assert caching_repository.task_counts() == [(OPEN, date(2024, 1, 1), 3)]
+
+def test_import_clears_cache(caching_repository, mock_repository):
+    caching_repository.find_by_id(1)
+    mock_repository.import_tasks.return_value = 1
+    tasks = [Task(id=1, description="Imported", due_date=date(2024, 1, 1))]
+
+    assert caching_repository.import_tasks(tasks, True) == 1
+
+    mock_repository.import_tasks.assert_called_once_with(tasks, True)
+    assert len(caching_repository) == 0
+
+def test_find_changes_is_delegated(caching_repository, mock_repository):
+    mock_repository.find_changes.return_value = ChangeFeed("3")
+
+    assert caching_repository.find_changes("1", 10) == ChangeFeed("3")
+    mock_repository.find_changes.assert_called_once_with("1", 10)
+
+def test_data_version_is_delegated(caching_repository, mock_repository):
+    mock_repository.data_version.return_value = 5
+
+    assert caching_repository.data_version() == 5
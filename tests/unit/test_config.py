@@ -0,0 +1,35 @@
+from pathlib import Path
+from task_manager.config import Settings
+
+def test_defaults():
+    settings = Settings.from_env({})
+
+    assert settings == Settings()
+    assert settings.cache_enabled is False
+    assert settings.synchronous == "FULL"
+
+def test_from_env():
+    settings = Settings.from_env({
+        "TASK_MANAGER_CACHE_ENABLED": "true",
+        "TASK_MANAGER_CACHE_SIZE": "50",
+        "TASK_MANAGER_CACHE_TTL_SECONDS": "2.5",
+    })
+
+    assert settings.cache_enabled is True
+    assert settings.cache_size == 50
+    assert settings.cache_ttl_seconds == 2.5
+
+def test_repository_settings_from_env():
+    settings = Settings.from_env({
+        "TASK_MANAGER_DB_PATH": "/tmp/tasks.db",
+        "TASK_MANAGER_POOL_SIZE": "8",
+        "TASK_MANAGER_SYNCHRONOUS": "NORMAL",
+        "TASK_MANAGER_GROUP_COMMIT_ENABLED": "yes",
+        "TASK_MANAGER_GROUP_COMMIT_MAX_DELAY_MS": "2",
+    })
+
+    assert settings.db_path == Path("/tmp/tasks.db")
+    assert settings.pool_size == 8
+    assert settings.synchronous == "NORMAL"
+    assert settings.group_commit_enabled is True
+    assert settings.group_commit_max_delay_ms == 2.0
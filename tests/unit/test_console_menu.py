@@ -2,7 +2,8 @@ import pytest
 from datetime import date
 from unittest.mock import Mock, patch, call
 from task_manager.domain.task import Task, OPEN
-from task_manager.ui.console_menu import ConsoleMenu
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.ui.console_menu import ConsoleMenu, PAGE_SIZE
 from task_manager.service.task_service import TaskService
 
 @pytest.fixture
@@ -26,8 +27,8 @@ def test_list_tasks(console_menu, mock_service):
         Task(id=1, description="Task 1", due_date=date(2023, 12, 31), status=OPEN)
     ]
     
-    # Simulate choosing option 1 then 0 (exit)
-    with patch('builtins.input', side_effect=["1", "0"]), \
+    # Simulate choosing option 1, leaving the listing, then 0 (exit)
+    with patch('builtins.input', side_effect=["1", "0", "0"]), \
          patch('builtins.print') as mock_print:
         console_menu.show()
         
@@ -36,6 +37,63 @@ def test_list_tasks(console_menu, mock_service):
         printed_content = [call[0][0] for call in mock_print.call_args_list if call.args]
         assert any("[1] Task 1" in str(s) for s in printed_content)
 
+def make_tasks(first_id, count):
+    return [
+        Task(id=i, description=f"Task {i}", due_date=date(2023, 12, 31), status=OPEN)
+        for i in range(first_id, first_id + count)
+    ]
+
+def test_list_tasks_prints_one_page_per_write(console_menu, mock_service):
+    mock_service.list_tasks.return_value = make_tasks(1, PAGE_SIZE + 1)
+
+    with patch('builtins.input', side_effect=["1", "0", "0"]), \
+         patch('builtins.print') as mock_print:
+        console_menu.show()
+
+    page = next(c.args[0] for c in mock_print.call_args_list if "[1] Task 1" in str(c.args[0]))
+    assert f"[{PAGE_SIZE}] Task {PAGE_SIZE}" in page
+    assert f"[{PAGE_SIZE + 1}]" not in page
+
+def test_list_tasks_fetches_pages_on_demand(console_menu, mock_service):
+    mock_service.list_tasks.side_effect = [
+        make_tasks(1, PAGE_SIZE + 1),
+        make_tasks(PAGE_SIZE + 1, 1),
+        make_tasks(PAGE_SIZE + 1, 1),
+        make_tasks(1, PAGE_SIZE + 1),
+    ]
+
+    # Next, next again (no further page), previous, then back and exit
+    with patch('builtins.input', side_effect=["1", "n", "n", "p", "0", "0"]), \
+         patch('builtins.print'):
+        console_menu.show()
+
+    assert [c.kwargs["after_id"] for c in mock_service.list_tasks.call_args_list] == [None, PAGE_SIZE, PAGE_SIZE, None]
+    assert all(c.kwargs["limit"] == PAGE_SIZE + 1 for c in mock_service.list_tasks.call_args_list)
+
+def test_list_tasks_with_filter(console_menu, mock_service):
+    mock_service.list_tasks.return_value = []
+
+    inputs = ["1", "f", "closed", "2024-01-01", "", "0", "0"]
+    with patch('builtins.input', side_effect=inputs), \
+         patch('builtins.print') as mock_print:
+        console_menu.show()
+
+    assert mock_service.list_tasks.call_args_list[-1] == call(
+        after_id=None, limit=PAGE_SIZE + 1, task_filter=TaskFilter(status="CLOSED", due_after=date(2024, 1, 1))
+    )
+    assert any("Nenhuma tarefa encontrada." in str(c.args[0]) for c in mock_print.call_args_list if c.args)
+
+def test_list_tasks_keeps_filter_on_invalid_input(console_menu, mock_service):
+    mock_service.list_tasks.return_value = []
+
+    inputs = ["1", "f", "", "31/12/2023", "0", "0"]
+    with patch('builtins.input', side_effect=inputs), \
+         patch('builtins.print') as mock_print:
+        console_menu.show()
+
+    assert mock_service.list_tasks.call_args_list[-1].kwargs["task_filter"] == TaskFilter()
+    assert call("Data inválida.") in mock_print.call_args_list
+
 def test_add_task(console_menu, mock_service):
     # Simulate option 4, description, date, then exit
     inputs = ["4", "New Task", "2023-12-31", "0"]
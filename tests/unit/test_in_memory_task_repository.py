@@ -0,0 +1,236 @@
+import pytest
+from dataclasses import replace
+from datetime import date, timedelta
+from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_change import ChangeFeed, INSERTED, UPDATED, DELETED
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.repository import in_memory_task_repository
+from task_manager.repository.in_memory_task_repository import InMemoryTaskRepository
+
+@pytest.fixture
+def repository():
+    return InMemoryTaskRepository()
+
+@pytest.fixture
+def dated_tasks(repository):
+    tasks = [
+        Task(id=None, description="Past open", due_date=date.today() - timedelta(days=3)),
+        Task(id=None, description="Past closed", due_date=date.today() - timedelta(days=3), status=CLOSED),
+        Task(id=None, description="Today", due_date=date.today()),
+        Task(id=None, description="Next week", due_date=date.today() + timedelta(days=7)),
+    ]
+    repository.save_many(tasks)
+    return tasks
+
+def test_save_and_find_by_id(repository):
+    task = Task(id=None, description="Test Task", due_date=date(2023, 12, 31))
+
+    repository.save(task)
+
+    assert task.id == 1
+    assert repository.find_by_id(task.id) == task
+
+def test_returned_tasks_are_copies(repository):
+    task = Task(id=None, description="Task", due_date=date.today())
+    repository.save(task)
+
+    repository.find_by_id(task.id).status = CLOSED
+    task.status = CLOSED
+
+    assert repository.find_by_id(task.id).status == OPEN
+    assert repository.find_by_filter(TaskFilter(status=CLOSED)) == []
+
+def test_paging_includes_imported_ids_below_one(repository):
+    repository.import_tasks([Task(id=task_id, description=f"Task {task_id}", due_date=date.today()) for task_id in (-5, 0, 3)])
+
+    assert [task.id for task in repository.find_page(None, 2)] == [-5, 0]
+    assert [task.id for task in repository.find_by_filter(TaskFilter(status=OPEN), limit=2)] == [-5, 0]
+
+def test_next_id_starts_after_given_next_id():
+    repository = InMemoryTaskRepository([Task(2, "Hot", date.today())], next_id=8)
+    task = Task(id=None, description="New", due_date=date.today())
+
+    repository.save(task)
+
+    assert task.id == 8
+    assert repository.max_task_id() == 8
+
+def test_find_page(repository, dated_tasks):
+    first_page = repository.find_page(None, 3)
+    second_page = repository.find_page(first_page[-1].id, 3)
+
+    assert [t.description for t in first_page] == ["Past open", "Past closed", "Today"]
+    assert [t.description for t in second_page] == ["Next week"]
+
+def test_find_by_filter_status(repository, dated_tasks):
+    assert [t.description for t in repository.find_by_filter(TaskFilter(status=CLOSED))] == ["Past closed"]
+
+def test_find_by_filter_due_range(repository, dated_tasks):
+    task_filter = TaskFilter(due_after=date.today(), due_before=date.today() + timedelta(days=7))
+
+    assert [t.description for t in repository.find_by_filter(task_filter)] == ["Today", "Next week"]
+
+def test_find_by_filter_overdue(repository, dated_tasks):
+    assert [t.description for t in repository.find_by_filter(TaskFilter(overdue=True))] == ["Past open"]
+
+def test_find_by_filter_paginated(repository, dated_tasks):
+    first_page = repository.find_by_filter(TaskFilter(status=OPEN), limit=2)
+    second_page = repository.find_by_filter(TaskFilter(status=OPEN), after_id=first_page[-1].id, limit=2)
+
+    assert [t.description for t in first_page] == ["Past open", "Today"]
+    assert [t.description for t in second_page] == ["Next week"]
+
+def test_iter_all(repository, dated_tasks):
+    assert [t.id for t in repository.iter_all(batch_size=3)] == [t.id for t in dated_tasks]
+    assert len(list(repository.iter_all(task_filter=TaskFilter(status=OPEN)))) == 3
+
+def test_update_status_reindexes(repository, dated_tasks):
+    closed = repository.update_status(dated_tasks[0].id, CLOSED)
+
+    assert closed.status == CLOSED
+    assert repository.find_by_filter(TaskFilter(overdue=True)) == []
+    assert repository.update_status(999, CLOSED) is None
+
+def test_update_details_reindexes_due_date(repository, dated_tasks):
+    repository.update_details(dated_tasks[3].id, "Moved", date.today() - timedelta(days=1))
+
+    assert [t.description for t in repository.find_by_filter(TaskFilter(overdue=True))] == ["Past open", "Moved"]
+
+def test_update_many(repository, dated_tasks):
+    dated_tasks[2].close()
+
+    repository.update_many([dated_tasks[2]])
+
+    assert len(repository.find_by_filter(TaskFilter(status=CLOSED))) == 2
+
+def test_delete(repository, dated_tasks):
+    deleted = repository.delete(dated_tasks[0].id)
+
+    assert deleted.description == "Past open"
+    assert repository.find_by_id(dated_tasks[0].id) is None
+    assert repository.find_by_filter(TaskFilter(overdue=True)) == []
+    assert repository.delete(dated_tasks[0].id) is None
+
+def test_delete_many(repository, dated_tasks):
+    deleted = repository.delete_many([dated_tasks[1].id, 999])
+
+    assert [t.id for t in deleted] == [dated_tasks[1].id]
+    assert len(repository.find_all()) == 3
+
+def test_task_counts(repository, dated_tasks):
+    repository.update_status(dated_tasks[0].id, CLOSED)
+    repository.delete(dated_tasks[3].id)
+
+    assert sorted(repository.task_counts()) == [
+        (CLOSED, date.today() - timedelta(days=3), 2),
+        (OPEN, date.today(), 1),
+    ]
+
+def test_import_tasks(repository, dated_tasks):
+    imported = repository.import_tasks([
+        Task(id=10, description="Imported milk", due_date=date.today()),
+        Task(id=None, description="Imported", due_date=date.today()),
+    ])
+
+    assert imported == 2
+    assert [t.id for t in repository.find_all()][-2:] == [10, 11]
+    assert [t.id for t in repository.search("milk", 10)] == [10]
+
+def test_import_tasks_conflict_changes_nothing(repository, dated_tasks):
+    with pytest.raises(ValueError):
+        repository.import_tasks([Task(id=99, description="New", due_date=date.today()), replace(dated_tasks[0])])
+
+    assert len(repository.find_all()) == 4
+
+def test_import_tasks_replacing_existing(repository, dated_tasks):
+    repository.import_tasks([Task(id=1, description="Replacement", due_date=date.today())], replace_existing=True)
+
+    assert [t.description for t in repository.find_all()] == ["Replacement"]
+
+def test_search(repository):
+    repository.save_many([
+        Task(id=None, description="Buy milk", due_date=date.today()),
+        Task(id=None, description="Pay the bills", due_date=date.today()),
+        Task(id=None, description="Milk, milk and more milk", due_date=date.today()),
+    ])
+
+    assert [t.id for t in repository.search("MILK", 10)] == [3, 1]
+    assert [t.id for t in repository.search("buy milk", 10)] == [1]
+    assert repository.search("milk", 1)[0].id == 3
+    assert repository.search("", 10) == []
+
+def test_search_follows_updates_and_deletes(repository):
+    task = Task(id=None, description="Reunião semanal", due_date=date.today())
+    repository.save(task)
+
+    assert [t.id for t in repository.search("reuniao", 10)] == [task.id]
+
+    repository.update_details(task.id, "Retrospectiva", date.today())
+    assert repository.search("reuniao", 10) == []
+    assert [t.id for t in repository.search("retrospectiva", 10)] == [task.id]
+
+    repository.delete(task.id)
+    assert repository.search("retrospectiva", 10) == []
+
+def test_data_version_changes_on_write(repository):
+    version = repository.data_version()
+
+    repository.save(Task(id=None, description="Task", due_date=date.today()))
+
+    assert repository.data_version() > version
+
+def test_find_changes_starts_with_reset(repository):
+    feed = repository.find_changes("0", 10)
+
+    assert feed.reset is True
+    assert repository.find_changes(feed.last_seq, 10) == ChangeFeed(feed.last_seq)
+
+def test_find_changes_returns_latest_change_per_task(repository):
+    since = repository.find_changes("0", 10).last_seq
+    kept = Task(id=None, description="Kept", due_date=date(2024, 1, 1))
+    removed = Task(id=None, description="Removed", due_date=date(2024, 1, 1))
+    repository.save_many([kept, removed])
+    repository.update_status(kept.id, CLOSED)
+    repository.delete(removed.id)
+
+    feed = repository.find_changes(since, 10)
+
+    assert [(c.operation, c.task_id) for c in feed.changes] == [(UPDATED, kept.id), (DELETED, removed.id)]
+    assert feed.changes[0].task.status == CLOSED
+    assert feed.changes[1].task is None
+    assert feed.last_seq == str(feed.changes[-1].seq)
+    assert repository.find_changes(feed.last_seq, 10).changes == []
+
+def test_find_changes_rejects_invalid_cursor(repository):
+    with pytest.raises(ValueError):
+        repository.find_changes("-1", 10)
+
+def test_find_changes_pages_with_limit(repository):
+    since = repository.find_changes("0", 10).last_seq
+    repository.save_many([Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)])
+
+    first = repository.find_changes(since, 2)
+    rest = repository.find_changes(first.last_seq, 2)
+
+    assert [c.operation for c in first.changes + rest.changes] == [INSERTED] * 3
+    assert rest.last_seq == str(rest.changes[-1].seq)
+
+def test_find_changes_resets_after_import_or_pruning(repository, monkeypatch):
+    since = repository.find_changes("0", 10).last_seq
+    repository.import_tasks([Task(id=None, description="Imported", due_date=date.today())])
+    assert repository.find_changes(since, 10).reset is True
+
+    monkeypatch.setattr(in_memory_task_repository, "CHANGE_LOG_SIZE", 2)
+    since = repository.find_changes("0", 10).last_seq
+    repository.save_many([Task(id=None, description=f"Task {i}", due_date=date.today()) for i in range(3)])
+    assert repository.find_changes(since, 10).reset is True
+    assert len(repository.find_changes(str(int(since) + 1), 10).changes) == 2
+
+def test_load_continues_id_sequence():
+    repository = InMemoryTaskRepository([Task(id=7, description="Loaded", due_date=date.today())])
+    task = Task(id=None, description="New", due_date=date.today())
+
+    repository.save(task)
+
+    assert task.id == 8
+    assert [t.id for t in repository.find_all()] == [7, 8]
@@ -1,11 +1,17 @@
+import os
+import pytest
+import subprocess
 import sys
+from datetime import date
+from pathlib import Path
 from unittest.mock import patch, MagicMock
+from task_manager.domain.task import Task
 from task_manager.main import main, REST_API, CONSOLE
 
 def test_main_default_rest_api():
     with patch.object(sys, 'argv', ['main.py']), \
-         patch('task_manager.main.create_app') as mock_create_app, \
-         patch('task_manager.main.ConsoleMenu') as mock_console, \
+         patch('task_manager.rest_api.rest_api.create_app') as mock_create_app, \
+         patch('task_manager.ui.console_menu.ConsoleMenu') as mock_console, \
          patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
          patch('task_manager.main.TaskService') as mock_service:
         
@@ -19,8 +25,8 @@ def test_main_default_rest_api():
 
 def test_main_explicit_rest_api():
     with patch.object(sys, 'argv', ['main.py', 'REST_API']), \
-         patch('task_manager.main.create_app') as mock_create_app, \
-         patch('task_manager.main.ConsoleMenu') as mock_console, \
+         patch('task_manager.rest_api.rest_api.create_app') as mock_create_app, \
+         patch('task_manager.ui.console_menu.ConsoleMenu') as mock_console, \
          patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
          patch('task_manager.main.TaskService') as mock_service:
         
@@ -34,8 +40,8 @@ def test_main_explicit_rest_api():
 
 def test_main_console():
     with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
-         patch('task_manager.main.create_app') as mock_create_app, \
-         patch('task_manager.main.ConsoleMenu') as mock_console, \
+         patch('task_manager.rest_api.rest_api.create_app') as mock_create_app, \
+         patch('task_manager.ui.console_menu.ConsoleMenu') as mock_console, \
          patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
          patch('task_manager.main.TaskService') as mock_service:
         
@@ -48,8 +54,8 @@ def test_main_console():
 
 def test_main_invalid_arg_defaults_to_rest_api():
     with patch.object(sys, 'argv', ['main.py', 'INVALID_ARG']), \
-         patch('task_manager.main.create_app') as mock_create_app, \
-         patch('task_manager.main.ConsoleMenu') as mock_console, \
+         patch('task_manager.rest_api.rest_api.create_app') as mock_create_app, \
+         patch('task_manager.ui.console_menu.ConsoleMenu') as mock_console, \
          patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
          patch('task_manager.main.TaskService') as mock_service:
         
@@ -60,3 +66,197 @@ def test_main_invalid_arg_defaults_to_rest_api():
         mock_create_app.assert_called_once()
         mock_app.run.assert_called_once_with(debug=True)
         mock_console.assert_not_called()
+
+def test_main_wraps_repository_with_cache_when_enabled():
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch.dict('os.environ', {
+             'TASK_MANAGER_CACHE_ENABLED': '1', 'TASK_MANAGER_CACHE_SIZE': '10',
+             'TASK_MANAGER_CACHE_VERSION_CHECK_SECONDS': '0.5'
+         }), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
+         patch('task_manager.main.CachingTaskRepository') as mock_cache, \
+         patch('task_manager.main.TaskService') as mock_service:
+
+        main()
+
+        mock_cache.assert_called_once_with(mock_repo.return_value, 10, None, version_check_seconds=0.5)
+        mock_service.assert_called_once_with(mock_cache.return_value)
+
+def test_main_enables_group_commit_from_env():
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch.dict('os.environ', {'TASK_MANAGER_GROUP_COMMIT_ENABLED': '1'}), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
+         patch('task_manager.main.TaskService'):
+
+        main()
+
+        assert mock_repo.call_args.kwargs['group_commit'] is True
+
+def test_main_memory_backend_without_snapshot():
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch.dict('os.environ', {'TASK_MANAGER_BACKEND': 'memory'}), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
+         patch('task_manager.main.InMemoryTaskRepository') as mock_memory_repo, \
+         patch('task_manager.main.TaskService') as mock_service:
+
+        main()
+
+        mock_repo.assert_not_called()
+        mock_service.assert_called_once_with(mock_memory_repo.return_value)
+
+def test_main_memory_backend_with_snapshot():
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch.dict('os.environ', {'TASK_MANAGER_BACKEND': 'memory', 'TASK_MANAGER_MEMORY_SNAPSHOT_ENABLED': '1'}), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
+         patch('task_manager.main.InMemoryTaskRepository') as mock_memory_repo, \
+         patch('task_manager.main.TaskService') as mock_service, \
+         patch('task_manager.main.atexit') as mock_atexit:
+
+        main()
+
+        mock_memory_repo.from_repository.assert_called_once_with(mock_repo.return_value)
+        mock_service.assert_called_once_with(mock_memory_repo.from_repository.return_value)
+        mock_atexit.register.assert_called_once()
+
+def test_main_serve_creates_repository_per_worker():
+    with patch.object(sys, 'argv', ['main.py', 'SERVE']), \
+         patch.dict('os.environ', {'TASK_MANAGER_PORT': '0', 'TASK_MANAGER_WORKERS': '3', 'TASK_MANAGER_THREADS': '4'}), \
+         patch('task_manager.server.serve') as mock_serve, \
+         patch('task_manager.rest_api.rest_api.create_app') as mock_create_app, \
+         patch('task_manager.main.SQLiteTaskRepository') as mock_repo:
+
+        main()
+
+        app_factory, listener, workers, threads = mock_serve.call_args.args
+        listener.close()
+        assert (workers, threads) == (3, 4)
+        mock_repo.assert_not_called()
+        assert app_factory() is mock_create_app.return_value
+        mock_repo.assert_called_once()
+
+def test_main_serve_rejects_memory_backend_with_workers():
+    with patch.object(sys, 'argv', ['main.py', 'SERVE']), \
+         patch.dict('os.environ', {'TASK_MANAGER_BACKEND': 'memory', 'TASK_MANAGER_WORKERS': '2'}), \
+         patch('task_manager.server.serve') as mock_serve:
+
+        with pytest.raises(SystemExit):
+            main()
+
+        mock_serve.assert_not_called()
+
+def test_main_export(tmp_path):
+    path = tmp_path / "tasks.csv"
+    with patch.object(sys, 'argv', ['main.py', 'export', str(path)]), \
+         patch('task_manager.main.SQLiteTaskRepository'), \
+         patch('task_manager.main.TaskService') as mock_service:
+        mock_service.return_value.export_tasks.return_value = iter([
+            Task(id=1, description="Task 1", due_date=date(2024, 1, 1))
+        ])
+
+        main()
+
+    assert path.read_text() == "id,description,due_date,status\n1,Task 1,2024-01-01,OPEN\n"
+
+def test_main_import(tmp_path, capsys):
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"description": "Task 1", "due_date": "2024-01-01"}\n')
+    with patch.object(sys, 'argv', ['main.py', 'IMPORT', str(path), '--replace']), \
+         patch('task_manager.main.SQLiteTaskRepository'), \
+         patch('task_manager.main.TaskService') as mock_service:
+        mock_service.return_value.import_tasks.side_effect = lambda tasks, replace_existing: len(list(tasks))
+
+        main()
+
+    assert mock_service.return_value.import_tasks.call_args.args[1] is True
+    assert "1 tarefas importadas" in capsys.readouterr().err
+
+def test_main_import_reports_invalid_file(tmp_path):
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('not json\n')
+    with patch.object(sys, 'argv', ['main.py', 'IMPORT', str(path)]), \
+         patch('task_manager.main.SQLiteTaskRepository'), \
+         patch('task_manager.main.TaskService') as mock_service:
+        mock_service.return_value.import_tasks.side_effect = lambda tasks, replace_existing: len(list(tasks))
+
+        with pytest.raises(SystemExit, match="Line 1"):
+            main()
+
+def test_main_shards_sqlite_backend_from_env():
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch.dict('os.environ', {'TASK_MANAGER_SHARD_COUNT': '2', 'TASK_MANAGER_DB_PATH': 'data/tasks.db'}), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository') as mock_repo, \
+         patch('task_manager.main.ShardedTaskRepository') as mock_sharded, \
+         patch('task_manager.main.TaskService') as mock_service:
+
+        main()
+
+        assert [call.args[0] for call in mock_repo.call_args_list] == [Path('data/tasks-0.db'), Path('data/tasks-1.db')]
+        mock_sharded.assert_called_once_with([mock_repo.return_value, mock_repo.return_value])
+        mock_service.assert_called_once_with(mock_sharded.return_value)
+
+def test_main_starts_archiver_when_enabled():
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch.dict('os.environ', {'TASK_MANAGER_ARCHIVE_ENABLED': '1', 'TASK_MANAGER_ARCHIVE_AFTER_DAYS': '7'}), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository'), \
+         patch('task_manager.main.TaskService') as mock_service, \
+         patch('task_manager.main.TaskArchiver') as mock_archiver, \
+         patch('task_manager.main.atexit') as mock_atexit:
+
+        main()
+
+        mock_archiver.assert_called_once_with(mock_service.return_value, 7, 3600.0, 500)
+        mock_atexit.register.assert_called_once_with(mock_archiver.return_value.close)
+
+def test_main_does_not_archive_by_default():
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository'), \
+         patch('task_manager.main.TaskService'), \
+         patch('task_manager.main.TaskArchiver') as mock_archiver:
+
+        main()
+
+        mock_archiver.assert_not_called()
+
+def test_importing_main_does_not_load_interfaces():
+    code = (
+        "import sys, task_manager.main; "
+        "print([name for name in ('flask', 'werkzeug', 'task_manager.rest_api.rest_api', "
+        "'task_manager.ui.console_menu', 'task_manager.server') if name in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    )
+
+    assert result.stdout.strip() == "[]"
+
+def test_main_profile_startup_prints_breakdown(capsys):
+    with patch.object(sys, 'argv', ['main.py', '--profile-startup', 'CONSOLE']), \
+         patch('task_manager.ui.console_menu.ConsoleMenu') as mock_console, \
+         patch('task_manager.main.SQLiteTaskRepository'), \
+         patch('task_manager.main.TaskService'):
+
+        main()
+
+        mock_console.return_value.show.assert_called_once()
+    err = capsys.readouterr().err
+    assert "Perfil de inicialização:" in err
+    for step in ("módulos", "configuração", "repositório", "serviço", "interface", "total"):
+        assert step in err
+
+def test_main_does_not_profile_by_default(capsys):
+    with patch.object(sys, 'argv', ['main.py', 'CONSOLE']), \
+         patch('task_manager.ui.console_menu.ConsoleMenu'), \
+         patch('task_manager.main.SQLiteTaskRepository'), \
+         patch('task_manager.main.TaskService'):
+
+        main()
+
+    assert "Perfil" not in capsys.readouterr().err
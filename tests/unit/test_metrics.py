@@ -0,0 +1,75 @@
+import pytest
+from task_manager.metrics import MetricsRegistry, registry, timed
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry(enabled=True)
+
+@pytest.fixture
+def enabled_registry():
+    registry.reset()
+    registry.enabled = True
+    yield registry
+    registry.enabled = False
+    registry.reset()
+
+def test_timer_records_histogram(metrics):
+    with metrics.timer("repository", "find_all"):
+        pass
+
+    output = metrics.render()
+
+    assert 'task_manager_operation_duration_seconds_count{layer="repository",operation="find_all"} 1' in output
+    assert 'le="+Inf"} 1' in output
+
+def test_disabled_timer_records_nothing():
+    metrics = MetricsRegistry(enabled=False)
+
+    with metrics.timer("repository", "find_all"):
+        pass
+
+    assert "find_all" not in metrics.render()
+
+def test_buckets_are_cumulative(metrics):
+    metrics.observe("service", "get_task", 0.0004)
+    metrics.observe("service", "get_task", 0.003)
+
+    output = metrics.render()
+
+    assert 'operation="get_task",le="0.0005"} 1' in output
+    assert 'operation="get_task",le="0.005"} 2' in output
+    assert 'operation="get_task"} 2' in output
+
+def test_timer_counts_errors(metrics):
+    with pytest.raises(ValueError):
+        with metrics.timer("service", "add_task"):
+            raise ValueError
+
+    assert 'task_manager_errors_total{layer="service",operation="add_task"} 1' in metrics.render()
+
+def test_counters(metrics):
+    metrics.increment("http_responses_total", route="get_task", status="200")
+    metrics.increment("http_responses_total", route="get_task", status="200")
+
+    output = metrics.render()
+
+    assert "# TYPE task_manager_http_responses_total counter" in output
+    assert 'task_manager_http_responses_total{route="get_task",status="200"} 2' in output
+
+def test_timed_decorator(enabled_registry):
+    @timed("service")
+    def list_tasks():
+        return [1]
+
+    assert list_tasks() == [1]
+    assert 'layer="service",operation="list_tasks"} 1' in enabled_registry.render()
+
+def test_timed_decorator_disabled():
+    registry.reset()
+
+    @timed("service")
+    def list_tasks():
+        return [1]
+
+    assert list_tasks() == [1]
+    assert "list_tasks" not in registry.render()
@@ -1,8 +1,13 @@
+import json
 import pytest
 from datetime import date
 from unittest.mock import Mock
 from task_manager.domain.task import Task, OPEN, CLOSED
-from task_manager.rest_api.rest_api import create_app
+from task_manager.domain.task_change import ChangeFeed, TaskChange, UPDATED, DELETED
+from task_manager.domain.task_filter import TaskFilter
+from task_manager.domain.task_stats import TaskStats
+from task_manager.metrics import registry as metrics
+from task_manager.rest_api.rest_api import create_app, DEFAULT_SEARCH_LIMIT, MAX_BATCH_SIZE, MAX_LONG_POLL_SECONDS, MAX_PAGE_SIZE
 from task_manager.service.task_service import TaskService
 
 @pytest.fixture
@@ -32,6 +37,113 @@ def test_list_tasks(client, mock_service):
     assert data[0]['due_date'] == "2023-12-31"
     assert data[0]['status'] == OPEN
 
+def test_list_tasks_paginated(client, mock_service):
+    mock_service.list_tasks.return_value = [
+        Task(id=1, description="Task 1", due_date=date(2023, 12, 31), status=OPEN),
+        Task(id=2, description="Task 2", due_date=date(2023, 12, 31), status=OPEN)
+    ]
+
+    response = client.get('/task-manager/tasks?limit=2&cursor=0')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [t['id'] for t in data['tasks']] == [1, 2]
+    assert data['next_cursor'] == 2
+    mock_service.list_tasks.assert_called_once_with(after_id=0, limit=2, task_filter=None)
+
+def test_list_tasks_last_page(client, mock_service):
+    mock_service.list_tasks.return_value = [
+        Task(id=3, description="Task 3", due_date=date(2023, 12, 31), status=OPEN)
+    ]
+
+    response = client.get('/task-manager/tasks?limit=2&cursor=2')
+
+    assert response.status_code == 200
+    assert response.get_json()['next_cursor'] is None
+
+def test_list_tasks_invalid_limit(client, mock_service):
+    response = client.get('/task-manager/tasks?limit=0')
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    mock_service.list_tasks.assert_not_called()
+
+def test_list_tasks_filtered(client, mock_service):
+    mock_service.list_tasks.return_value = []
+
+    response = client.get('/task-manager/tasks?status=open&due_after=2024-01-01&due_before=2024-01-07')
+
+    assert response.status_code == 200
+    mock_service.list_tasks.assert_called_once_with(
+        task_filter=TaskFilter(status=OPEN, due_after=date(2024, 1, 1), due_before=date(2024, 1, 7))
+    )
+
+def test_list_tasks_include_archived(client, mock_service):
+    mock_service.list_tasks.return_value = []
+
+    response = client.get('/task-manager/tasks?include_archived=true&status=closed&limit=10')
+
+    assert response.status_code == 200
+    mock_service.list_tasks.assert_called_once_with(
+        after_id=None, limit=10, task_filter=TaskFilter(status=CLOSED, include_archived=True)
+    )
+
+def test_list_tasks_overdue(client, mock_service):
+    mock_service.list_tasks.return_value = []
+
+    response = client.get('/task-manager/tasks?overdue=true&limit=10')
+
+    assert response.status_code == 200
+    mock_service.list_tasks.assert_called_once_with(
+        after_id=None, limit=10, task_filter=TaskFilter(overdue=True)
+    )
+
+def test_list_tasks_invalid_status(client, mock_service):
+    response = client.get('/task-manager/tasks?status=DONE')
+
+    assert response.status_code == 400
+    mock_service.list_tasks.assert_not_called()
+
+def test_list_tasks_invalid_due_date(client, mock_service):
+    response = client.get('/task-manager/tasks?due_before=tomorrow')
+
+    assert response.status_code == 400
+    assert "due_before" in response.get_json()['error']
+    mock_service.list_tasks.assert_not_called()
+
+def test_list_tasks_stream_json(client, mock_service):
+    mock_service.stream_tasks.return_value = iter([
+        Task(id=1, description="Task 1", due_date=date(2023, 12, 31), status=OPEN),
+        Task(id=2, description="Task 2", due_date=date(2023, 12, 31), status=CLOSED)
+    ])
+
+    response = client.get('/task-manager/tasks?stream=1')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert [t['id'] for t in response.get_json()] == [1, 2]
+    mock_service.list_tasks.assert_not_called()
+
+def test_list_tasks_stream_empty(client, mock_service):
+    mock_service.stream_tasks.return_value = iter([])
+
+    response = client.get('/task-manager/tasks?stream=1')
+
+    assert response.get_json() == []
+
+def test_list_tasks_stream_ndjson(client, mock_service):
+    mock_service.stream_tasks.return_value = iter([
+        Task(id=1, description="Task 1", due_date=date(2023, 12, 31), status=OPEN),
+        Task(id=2, description="Task 2", due_date=date(2023, 12, 31), status=CLOSED)
+    ])
+
+    response = client.get('/task-manager/tasks', headers={"Accept": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [1, 2]
+
 def test_get_task_success(client, mock_service):
     task_id = 1
     task = Task(id=task_id, description="Task 1", due_date=date(2023, 12, 31), status=OPEN)
@@ -178,3 +290,336 @@ def test_delete_task_not_found(client, mock_service):
     
     assert response.status_code == 404
     assert response.get_json() == {"error": "Task not found"}
+
+def test_add_tasks_batch(client, mock_service):
+    mock_service.add_tasks.return_value = [
+        Task(id=1, description="Task 1", due_date=date(2024, 1, 1), status=OPEN)
+    ]
+    payload = [
+        {"description": "Task 1", "due_date": "2024-01-01"},
+        {"description": "Task 2", "due_date": "invalid-date"}
+    ]
+
+    response = client.post('/task-manager/tasks/batch', json=payload)
+
+    assert response.status_code == 200
+    results = response.get_json()
+    assert results[0]['status'] == 201
+    assert results[0]['task']['id'] == 1
+    assert results[1]['status'] == 400
+    assert "Invalid date format" in results[1]['error']
+    mock_service.add_tasks.assert_called_once_with([("Task 1", date(2024, 1, 1))])
+
+def test_add_tasks_batch_requires_list(client, mock_service):
+    response = client.post('/task-manager/tasks/batch', json={"description": "Task"})
+
+    assert response.status_code == 400
+    mock_service.add_tasks.assert_not_called()
+
+def test_add_tasks_batch_too_large(client, mock_service):
+    payload = [{"description": "Task", "due_date": "2024-01-01"}] * (MAX_BATCH_SIZE + 1)
+
+    response = client.post('/task-manager/tasks/batch', json=payload)
+
+    assert response.status_code == 400
+    mock_service.add_tasks.assert_not_called()
+
+def test_edit_tasks_batch(client, mock_service):
+    mock_service.edit_tasks.return_value = [
+        Task(id=1, description="Updated", due_date=date(2024, 1, 1), status=OPEN),
+        None
+    ]
+    payload = [
+        {"id": 1, "description": "Updated", "due_date": "2024-01-01"},
+        {"id": 999, "description": "Missing", "due_date": "2024-01-01"},
+        {"description": "No id", "due_date": "2024-01-01"}
+    ]
+
+    response = client.put('/task-manager/tasks/batch', json=payload)
+
+    results = response.get_json()
+    assert [r['status'] for r in results] == [200, 404, 400]
+    mock_service.edit_tasks.assert_called_once_with([
+        (1, "Updated", date(2024, 1, 1)),
+        (999, "Missing", date(2024, 1, 1))
+    ])
+
+def test_complete_tasks_batch(client, mock_service):
+    mock_service.complete_tasks.return_value = [
+        Task(id=1, description="Task", due_date=date.today(), status=CLOSED),
+        None
+    ]
+
+    response = client.patch('/task-manager/tasks/complete', json={"ids": [1, 999]})
+
+    results = response.get_json()
+    assert results[0]['task']['status'] == CLOSED
+    assert results[1] == {"status": 404, "error": "Task not found"}
+    mock_service.complete_tasks.assert_called_once_with([1, 999])
+
+def test_complete_tasks_batch_invalid_ids(client, mock_service):
+    response = client.patch('/task-manager/tasks/complete', json={"ids": ["one"]})
+
+    assert response.status_code == 400
+    mock_service.complete_tasks.assert_not_called()
+
+def test_batch_ids_reject_booleans(client, mock_service):
+    response = client.delete('/task-manager/tasks/batch', json={"ids": [True]})
+
+    assert response.status_code == 400
+    mock_service.delete_tasks.assert_not_called()
+
+def test_edit_tasks_batch_rejects_boolean_id(client, mock_service):
+    response = client.put('/task-manager/tasks/batch', json=[{"id": True, "description": "X", "due_date": "2024-01-01"}])
+
+    assert [r['status'] for r in response.get_json()] == [400]
+    mock_service.edit_tasks.assert_not_called()
+
+def test_delete_tasks_batch(client, mock_service):
+    mock_service.delete_tasks.return_value = [
+        Task(id=1, description="Task", due_date=date.today(), status=OPEN)
+    ]
+
+    response = client.delete('/task-manager/tasks/batch', json={"ids": [1]})
+
+    assert response.get_json()[0]['status'] == 200
+    mock_service.delete_tasks.assert_called_once_with([1])
+
+def test_list_tasks_sets_etag(client, mock_service):
+    mock_service.data_version.return_value = 7
+    mock_service.list_tasks.return_value = []
+
+    response = client.get('/task-manager/tasks')
+
+    assert response.status_code == 200
+    assert response.headers['ETag'].startswith('"7-list-')
+
+def test_list_tasks_not_modified(client, mock_service):
+    mock_service.data_version.return_value = 7
+    mock_service.list_tasks.return_value = []
+    etag = client.get('/task-manager/tasks?status=OPEN').headers['ETag']
+    mock_service.list_tasks.reset_mock()
+
+    response = client.get('/task-manager/tasks?status=OPEN', headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    mock_service.list_tasks.assert_not_called()
+
+def test_list_tasks_etag_depends_on_query(client, mock_service):
+    mock_service.data_version.return_value = 7
+    mock_service.list_tasks.return_value = []
+    etag = client.get('/task-manager/tasks?status=OPEN').headers['ETag']
+
+    response = client.get('/task-manager/tasks?status=CLOSED', headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+
+def test_list_tasks_modified_after_write(client, mock_service):
+    mock_service.data_version.return_value = 7
+    mock_service.list_tasks.return_value = []
+    etag = client.get('/task-manager/tasks').headers['ETag']
+    mock_service.data_version.return_value = 8
+
+    response = client.get('/task-manager/tasks', headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_get_task_not_modified(client, mock_service):
+    mock_service.data_version.return_value = 3
+    mock_service.get_task.return_value = Task(id=1, description="Task 1", due_date=date(2023, 12, 31), status=OPEN)
+    etag = client.get('/task-manager/tasks/1').headers['ETag']
+    mock_service.get_task.reset_mock()
+
+    response = client.get('/task-manager/tasks/1', headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    mock_service.get_task.assert_not_called()
+
+def test_get_task_not_found_has_no_etag(client, mock_service):
+    mock_service.data_version.return_value = 3
+    mock_service.get_task.return_value = None
+
+    response = client.get('/task-manager/tasks/999')
+
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+def test_search_tasks(client, mock_service):
+    mock_service.data_version.return_value = 1
+    mock_service.search_tasks.return_value = [
+        Task(id=1, description="Buy milk", due_date=date(2023, 12, 31), status=OPEN)
+    ]
+
+    response = client.get('/task-manager/tasks/search?q=milk&limit=5')
+
+    assert response.status_code == 200
+    assert [t['id'] for t in response.get_json()] == [1]
+    mock_service.search_tasks.assert_called_once_with("milk", 5)
+
+def test_search_tasks_default_limit(client, mock_service):
+    mock_service.data_version.return_value = 1
+    mock_service.search_tasks.return_value = []
+
+    client.get('/task-manager/tasks/search?q=milk')
+
+    mock_service.search_tasks.assert_called_once_with("milk", DEFAULT_SEARCH_LIMIT)
+
+@pytest.mark.parametrize("query", ["", "?q=", "?q=%20%20", "?q=milk&limit=0", "?q=milk&limit=abc"])
+def test_search_tasks_invalid_arguments(client, mock_service, query):
+    mock_service.data_version.return_value = 1
+
+    response = client.get(f'/task-manager/tasks/search{query}')
+
+    assert response.status_code == 400
+    mock_service.search_tasks.assert_not_called()
+
+def test_search_tasks_not_modified(client, mock_service):
+    mock_service.data_version.return_value = 4
+    mock_service.search_tasks.return_value = []
+    etag = client.get('/task-manager/tasks/search?q=milk').headers['ETag']
+    mock_service.search_tasks.reset_mock()
+
+    response = client.get('/task-manager/tasks/search?q=milk', headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    mock_service.search_tasks.assert_not_called()
+
+def test_get_stats(client, mock_service):
+    mock_service.data_version.return_value = 1
+    mock_service.get_stats.return_value = TaskStats(total=3, by_status={OPEN: 2, CLOSED: 1}, overdue=1)
+
+    response = client.get('/task-manager/tasks/stats')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["total"] == 3
+    assert data["by_status"] == {OPEN: 2, CLOSED: 1}
+    assert data["overdue"] == 1
+    assert data["due"] == {"overdue": 0, "today": 0, "next_7_days": 0, "later": 0}
+
+def test_etags_differ_between_routes(client, mock_service):
+    mock_service.data_version.return_value = 1
+    mock_service.list_tasks.return_value = []
+    mock_service.get_stats.return_value = TaskStats()
+    etag = client.get('/task-manager/tasks').headers['ETag']
+
+    response = client.get('/task-manager/tasks/stats', headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+
+def test_export_tasks(client, mock_service):
+    mock_service.export_tasks.return_value = iter([
+        Task(id=1, description="Task 1", due_date=date(2023, 12, 31), status=OPEN)
+    ])
+
+    response = client.get('/task-manager/export?format=csv')
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert response.get_data(as_text=True) == "id,description,due_date,status\n1,Task 1,2023-12-31,OPEN\n"
+
+def test_export_tasks_unknown_format(client, mock_service):
+    response = client.get('/task-manager/export?format=xml')
+
+    assert response.status_code == 400
+
+def test_import_tasks(client, mock_service):
+    mock_service.import_tasks.side_effect = lambda tasks, replace_existing: len(list(tasks))
+
+    response = client.post(
+        '/task-manager/import?replace=true',
+        data='{"description": "A", "due_date": "2024-01-01"}\n{"description": "B", "due_date": "2024-01-02"}\n',
+        content_type="application/x-ndjson"
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"imported": 2}
+    assert mock_service.import_tasks.call_args.args[1] is True
+
+def test_import_tasks_csv_body(client, mock_service):
+    mock_service.import_tasks.side_effect = lambda tasks, replace_existing: [t.description for t in tasks]
+
+    response = client.post('/task-manager/import', data="description,due_date\nA,2024-01-01\n", content_type="text/csv")
+
+    assert response.get_json() == {"imported": ["A"]}
+
+def test_import_tasks_invalid_line(client, mock_service):
+    mock_service.import_tasks.side_effect = lambda tasks, replace_existing: len(list(tasks))
+
+    response = client.post('/task-manager/import', data='{"description": "A"}\n')
+
+    assert response.status_code == 400
+    assert "Line 1" in response.get_json()["error"]
+
+def test_import_tasks_id_out_of_range(client, mock_service):
+    mock_service.import_tasks.side_effect = lambda tasks, replace_existing: len(list(tasks))
+
+    response = client.post('/task-manager/import', data='{"id": 99999999999999999999, "description": "A", "due_date": "2024-01-01"}\n')
+
+    assert response.status_code == 400
+    assert "Line 1: id must be an integer" in response.get_json()["error"]
+
+def test_metrics_endpoint(client, mock_service):
+    mock_service.data_version.return_value = 1
+    mock_service.list_tasks.return_value = []
+    metrics.reset()
+    metrics.enabled = True
+    try:
+        client.get('/task-manager/tasks')
+        response = client.get('/task-manager/metrics')
+    finally:
+        metrics.enabled = False
+        metrics.reset()
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    assert 'layer="rest_api",operation="list_tasks"' in body
+    assert 'layer="rest_api",operation="serialize"' in body
+    assert 'task_manager_http_responses_total{route="list_tasks",status="200"} 1' in body
+
+def test_get_changes(client, mock_service):
+    mock_service.get_changes.return_value = ChangeFeed("8", [
+        TaskChange(7, UPDATED, 1, Task(id=1, description="Task", due_date=date(2024, 1, 1), status=CLOSED)),
+        TaskChange(8, DELETED, 2),
+    ])
+
+    response = client.get('/task-manager/tasks/changes?since=6&limit=50&timeout=2.5')
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "changes": [
+            {"seq": 7, "operation": "update", "id": 1,
+             "task": {"id": 1, "description": "Task", "due_date": "2024-01-01", "status": CLOSED}},
+            {"seq": 8, "operation": "delete", "id": 2, "task": None},
+        ],
+        "last_seq": "8",
+        "reset": False
+    }
+    mock_service.get_changes.assert_called_once_with("6", 50, 2.5)
+
+def test_get_changes_defaults_and_caps_timeout(client, mock_service):
+    mock_service.get_changes.return_value = ChangeFeed("3", reset=True)
+
+    assert client.get('/task-manager/tasks/changes').get_json()["reset"] is True
+    client.get('/task-manager/tasks/changes?since=3&timeout=600')
+
+    assert mock_service.get_changes.call_args_list[0].args == ("0", MAX_PAGE_SIZE, 0)
+    assert mock_service.get_changes.call_args_list[1].args == ("3", MAX_PAGE_SIZE, MAX_LONG_POLL_SECONDS)
+
+@pytest.mark.parametrize("query", ["limit=x", "limit=0", "timeout=nan", "timeout=-1"])
+def test_get_changes_invalid_arguments(client, mock_service, query):
+    response = client.get(f'/task-manager/tasks/changes?{query}')
+
+    assert response.status_code == 400
+    mock_service.get_changes.assert_not_called()
+
+def test_get_changes_invalid_cursor(client, mock_service):
+    mock_service.get_changes.side_effect = ValueError("Invalid change cursor 'x'")
+
+    response = client.get('/task-manager/tasks/changes?since=x')
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid change cursor 'x'"}
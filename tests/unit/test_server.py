@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from http.client import HTTPConnection
+from task_manager.server import PooledWSGIServer, bind, serve
+
+def pid_app(environ, start_response):
+    body = f"{os.getpid()} {threading.current_thread().name}".encode()
+    start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", str(len(body)))])
+    return [body]
+
+def get(port):
+    connection = HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request("GET", "/")
+        return connection.getresponse().read().decode()
+    finally:
+        connection.close()
+
+def wait_until_serving(port):
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            return get(port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+def test_pooled_server_handles_requests_on_pool_threads():
+    listener = bind("127.0.0.1", 0)
+    port = listener.getsockname()[1]
+    server = PooledWSGIServer("127.0.0.1", port, pid_app, threads=2, fd=listener.fileno())
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        responses = [get(port) for _ in range(3)]
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+        server.wait_for_requests()
+        listener.close()
+
+    assert all(response.split()[1].startswith("request") for response in responses)
+
+def test_serve_runs_apps_in_forked_workers():
+    listener = bind("127.0.0.1", 0)
+    port = listener.getsockname()[1]
+    factory_calls = multiprocessing.get_context("fork").Queue()
+
+    def app_factory():
+        factory_calls.put(os.getpid())
+        return pid_app
+
+    parent = multiprocessing.get_context("fork").Process(target=serve, args=(app_factory, listener, 2, 2))
+    parent.start()
+    try:
+        worker_pid = int(wait_until_serving(port).split()[0])
+        worker_pids = {factory_calls.get(timeout=5), factory_calls.get(timeout=5)}
+    finally:
+        os.kill(parent.pid, signal.SIGTERM)
+        parent.join(timeout=10)
+        listener.close()
+
+    assert worker_pid in worker_pids
+    assert parent.pid not in worker_pids
+    assert parent.exitcode == 0
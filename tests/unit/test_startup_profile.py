@@ -0,0 +1,38 @@
+import io
+import pytest
+from task_manager.startup_profile import StartupProfile
+
+def test_report_lists_steps_and_total():
+    profile = StartupProfile(True, started_at=0.0)
+    profile.record("módulos", 0.0125)
+    with profile.step("repositório"):
+        pass
+    output = io.StringIO()
+
+    profile.report(output)
+
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "Perfil de inicialização:"
+    assert lines[1].split() == ["módulos", "12.5", "ms"]
+    assert lines[2].split()[0] == "repositório"
+    assert lines[3].split()[0] == "total"
+
+def test_step_is_recorded_when_it_raises():
+    profile = StartupProfile(True)
+    output = io.StringIO()
+
+    with pytest.raises(RuntimeError):
+        with profile.step("repositório"):
+            raise RuntimeError("boom")
+    profile.report(output)
+
+    assert "repositório" in output.getvalue()
+
+def test_disabled_profile_reports_nothing():
+    profile = StartupProfile(False)
+    profile.record("módulos", 0.01)
+    output = io.StringIO()
+
+    profile.report(output)
+
+    assert output.getvalue() == ""
@@ -15,3 +15,8 @@ def test_close_task():
     task.close()
     
     assert task.status == CLOSED
+
+def test_task_is_slotted():
+    task = Task(id=1, description="Test Task", due_date=date.today())
+
+    assert not hasattr(task, "__dict__")
@@ -0,0 +1,42 @@
+import threading
+from unittest.mock import Mock
+from task_manager.service.task_archiver import TaskArchiver
+from task_manager.service.task_service import TaskService
+
+def test_archiver_runs_at_start_and_on_every_interval():
+    service = Mock(spec=TaskService)
+    runs = threading.Semaphore(0)
+    service.archive_closed_tasks.side_effect = lambda *args: runs.release()
+
+    archiver = TaskArchiver(service, archive_after_days=7, interval_seconds=0.01, batch_size=50)
+    try:
+        assert runs.acquire(timeout=5) and runs.acquire(timeout=5)
+    finally:
+        archiver.close()
+
+    service.archive_closed_tasks.assert_called_with(7, 50)
+
+def test_archiver_survives_a_failed_run(capsys):
+    service = Mock(spec=TaskService)
+    runs = threading.Semaphore(0)
+
+    def archive(*args):
+        runs.release()
+        raise RuntimeError("database is locked")
+    service.archive_closed_tasks.side_effect = archive
+
+    archiver = TaskArchiver(service, interval_seconds=0.01)
+    try:
+        assert runs.acquire(timeout=5) and runs.acquire(timeout=5)
+    finally:
+        archiver.close()
+
+    assert "database is locked" in capsys.readouterr().err
+
+def test_close_stops_waiting_for_next_interval():
+    service = Mock(spec=TaskService)
+
+    archiver = TaskArchiver(service, interval_seconds=3600)
+    archiver.close()
+
+    assert service.archive_closed_tasks.call_count == 1
@@ -1,7 +1,9 @@
 import pytest
-from datetime import date
+from datetime import date, timedelta
 from unittest.mock import Mock
 from task_manager.domain.task import Task, OPEN, CLOSED
+from task_manager.domain.task_change import ChangeFeed, TaskChange, INSERTED
+from task_manager.domain.task_filter import TaskFilter
 from task_manager.service.task_service import TaskService
 from task_manager.repository.task_repository_interface import TaskRepositoryInterface
 
@@ -26,6 +28,70 @@ def test_list_tasks(task_service, mock_repository):
     assert tasks == expected_tasks
     mock_repository.find_all.assert_called_once()
 
+def test_list_tasks_page(task_service, mock_repository):
+    expected_tasks = [Task(id=3, description="Task 3", due_date=date.today())]
+    mock_repository.find_page.return_value = expected_tasks
+
+    tasks = task_service.list_tasks(after_id=2, limit=10)
+
+    assert tasks == expected_tasks
+    mock_repository.find_page.assert_called_once_with(2, 10)
+    mock_repository.find_all.assert_not_called()
+
+def test_list_tasks_filtered(task_service, mock_repository):
+    task_filter = TaskFilter(status=OPEN, due_before=date(2024, 1, 7))
+    mock_repository.find_by_filter.return_value = []
+
+    task_service.list_tasks(limit=10, task_filter=task_filter)
+
+    mock_repository.find_by_filter.assert_called_once_with(task_filter, None, 10)
+    mock_repository.find_page.assert_not_called()
+
+def test_list_tasks_empty_filter_uses_find_all(task_service, mock_repository):
+    task_service.list_tasks(task_filter=TaskFilter())
+
+    mock_repository.find_all.assert_called_once()
+    mock_repository.find_by_filter.assert_not_called()
+
+def test_stream_tasks(task_service, mock_repository):
+    expected_tasks = iter([Task(id=1, description="Task 1", due_date=date.today())])
+    mock_repository.iter_all.return_value = expected_tasks
+
+    assert task_service.stream_tasks() is expected_tasks
+    mock_repository.iter_all.assert_called_once()
+
+def test_search_tasks(task_service, mock_repository):
+    expected_tasks = [Task(id=1, description="Buy milk", due_date=date.today())]
+    mock_repository.search.return_value = expected_tasks
+
+    assert task_service.search_tasks("milk", 20) == expected_tasks
+    mock_repository.search.assert_called_once_with("milk", 20)
+
+def test_get_stats(task_service, mock_repository):
+    mock_repository.task_counts.return_value = [
+        (OPEN, date.today(), 2),
+        (CLOSED, date.today(), 1),
+    ]
+
+    stats = task_service.get_stats()
+
+    assert stats.total == 3
+    assert stats.by_status == {OPEN: 2, CLOSED: 1}
+    assert stats.due["today"] == 2
+
+def test_export_tasks_includes_archived(task_service, mock_repository):
+    mock_repository.iter_all.return_value = iter([])
+
+    assert list(task_service.export_tasks()) == []
+    mock_repository.iter_all.assert_called_once_with(task_filter=TaskFilter(include_archived=True))
+
+def test_import_tasks(task_service, mock_repository):
+    mock_repository.import_tasks.return_value = 2
+    tasks = iter([])
+
+    assert task_service.import_tasks(tasks, replace_existing=True) == 2
+    mock_repository.import_tasks.assert_called_once_with(tasks, True)
+
 def test_add_task(task_service, mock_repository):
     description = "New Task"
     due_date = date(2023, 12, 31)
@@ -41,38 +107,115 @@ def test_add_task(task_service, mock_repository):
 
 def test_edit_task_existing(task_service, mock_repository):
     task_id = 1
-    original_task = Task(id=task_id, description="Old", due_date=date.today())
-    mock_repository.find_by_id.return_value = original_task
-    
-    new_desc = "Updated"
-    new_date = date(2024, 1, 1)
-    
-    task_service.edit_task(task_id, new_desc, new_date)
-    
-    mock_repository.find_by_id.assert_called_with(task_id)
-    mock_repository.update.assert_called_once_with(original_task)
-    assert original_task.description == new_desc
-    assert original_task.due_date == new_date
+    updated_task = Task(id=task_id, description="Updated", due_date=date(2024, 1, 1))
+    mock_repository.update_details.return_value = updated_task
+
+    result = task_service.edit_task(task_id, "Updated", date(2024, 1, 1))
+
+    assert result == updated_task
+    mock_repository.update_details.assert_called_once_with(task_id, "Updated", date(2024, 1, 1))
+    mock_repository.find_by_id.assert_not_called()
 
 def test_edit_task_not_found(task_service, mock_repository):
-    mock_repository.find_by_id.return_value = None
-    
-    task_service.edit_task(999, "Desc", date.today())
-    
-    mock_repository.find_by_id.assert_called_with(999)
-    mock_repository.update.assert_not_called()
+    mock_repository.update_details.return_value = None
+
+    assert task_service.edit_task(999, "Desc", date.today()) is None
 
 def test_complete_task(task_service, mock_repository):
     task_id = 1
-    task = Task(id=task_id, description="Task", due_date=date.today())
-    mock_repository.find_by_id.return_value = task
-    
-    task_service.complete_task(task_id)
-    
-    assert task.status == CLOSED
-    mock_repository.update.assert_called_once_with(task)
+    task = Task(id=task_id, description="Task", due_date=date.today(), status=CLOSED)
+    mock_repository.update_status.return_value = task
+
+    assert task_service.complete_task(task_id) == task
+    mock_repository.update_status.assert_called_once_with(task_id, CLOSED)
+    mock_repository.find_by_id.assert_not_called()
 
 def test_delete_task(task_service, mock_repository):
     task_id = 1
-    task_service.delete_task(task_id)
+    task = Task(id=task_id, description="Task", due_date=date.today())
+    mock_repository.delete.return_value = task
+
+    assert task_service.delete_task(task_id) == task
     mock_repository.delete.assert_called_once_with(task_id)
+    mock_repository.find_by_id.assert_not_called()
+
+def test_add_tasks(task_service, mock_repository):
+    tasks = task_service.add_tasks([("Task 1", date(2024, 1, 1)), ("Task 2", date(2024, 1, 2))])
+
+    mock_repository.save_many.assert_called_once_with(tasks)
+    assert [t.description for t in tasks] == ["Task 1", "Task 2"]
+
+def test_edit_tasks(task_service, mock_repository):
+    task = Task(id=1, description="New", due_date=date(2024, 1, 1))
+    mock_repository.update_details_many.return_value = [task]
+    items = [(1, "New", date(2024, 1, 1)), (2, "Missing", date(2024, 1, 1))]
+
+    results = task_service.edit_tasks(items)
+
+    assert results == [task, None]
+    mock_repository.update_details_many.assert_called_once_with(items)
+
+def test_complete_tasks(task_service, mock_repository):
+    task = Task(id=1, description="Task", due_date=date.today(), status=CLOSED)
+    mock_repository.update_status_many.return_value = [task]
+
+    results = task_service.complete_tasks([1, 2])
+
+    assert results == [task, None]
+    assert mock_repository.update_status_many.call_args[0][1] == CLOSED
+
+def test_delete_tasks(task_service, mock_repository):
+    task = Task(id=1, description="Task", due_date=date.today())
+    mock_repository.delete_many.return_value = [task]
+
+    results = task_service.delete_tasks([2, 1])
+
+    assert results == [None, task]
+    assert sorted(mock_repository.delete_many.call_args[0][0]) == [1, 2]
+
+def test_data_version(task_service, mock_repository):
+    mock_repository.data_version.return_value = 4
+
+    assert task_service.data_version() == 4
+
+def test_get_changes_without_timeout_returns_immediately(task_service, mock_repository):
+    mock_repository.find_changes.return_value = ChangeFeed("5")
+
+    assert task_service.get_changes("5", 10) == ChangeFeed("5")
+    mock_repository.find_changes.assert_called_once_with("5", 10)
+
+def test_get_changes_long_polls_until_a_change_arrives(task_service, mock_repository):
+    change = TaskChange(6, INSERTED, 1, Task(id=1, description="Task", due_date=date.today()))
+    mock_repository.find_changes.side_effect = [ChangeFeed("5"), ChangeFeed("5"), ChangeFeed("6", [change])]
+
+    feed = task_service.get_changes("5", 10, timeout_seconds=5)
+
+    assert feed.changes == [change]
+    assert mock_repository.find_changes.call_count == 3
+
+def test_get_changes_gives_up_after_timeout(task_service, mock_repository):
+    mock_repository.find_changes.return_value = ChangeFeed("5")
+
+    assert task_service.get_changes("5", 10, timeout_seconds=0.15) == ChangeFeed("5")
+    assert mock_repository.find_changes.call_count >= 2
+
+def test_get_changes_returns_reset_without_waiting(task_service, mock_repository):
+    mock_repository.find_changes.return_value = ChangeFeed("9", reset=True)
+
+    assert task_service.get_changes("0", 10, timeout_seconds=5).reset is True
+    mock_repository.find_changes.assert_called_once()
+
+def test_archive_closed_tasks_runs_batches_then_compacts(task_service, mock_repository):
+    mock_repository.archive_closed_tasks.side_effect = [2, 2, 1]
+
+    assert task_service.archive_closed_tasks(older_than_days=30, batch_size=2) == 5
+
+    closed_before = date.today() - timedelta(days=30)
+    assert [c.args for c in mock_repository.archive_closed_tasks.call_args_list] == [(closed_before, 2)] * 3
+    mock_repository.compact.assert_called_once()
+
+def test_archive_closed_tasks_skips_compaction_when_nothing_moved(task_service, mock_repository):
+    mock_repository.archive_closed_tasks.return_value = 0
+
+    assert task_service.archive_closed_tasks(older_than_days=30, batch_size=500) == 0
+    mock_repository.compact.assert_not_called()
@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+from task_manager.domain.task import OPEN, CLOSED
+from task_manager.domain.task_stats import TaskStats
+
+TODAY = date(2024, 3, 10)
+
+def test_from_counts():
+    stats = TaskStats.from_counts([
+        (OPEN, TODAY - timedelta(days=1), 2),
+        (OPEN, TODAY, 3),
+        (OPEN, TODAY + timedelta(days=7), 4),
+        (OPEN, TODAY + timedelta(days=8), 5),
+        (CLOSED, TODAY - timedelta(days=1), 6),
+    ], TODAY)
+
+    assert stats.total == 20
+    assert stats.by_status == {OPEN: 14, CLOSED: 6}
+    assert stats.overdue == 2
+    assert stats.due == {"overdue": 2, "today": 3, "next_7_days": 4, "later": 5}
+
+def test_from_no_counts():
+    stats = TaskStats.from_counts([], TODAY)
+
+    assert stats.total == 0
+    assert stats.by_status == {OPEN: 0, CLOSED: 0}
+    assert stats.due == {"overdue": 0, "today": 0, "next_7_days": 0, "later": 0}
@@ -0,0 +1,82 @@
+import pytest
+from datetime import date
+from task_manager import transfer
+from task_manager.domain.task import Task, OPEN, CLOSED
+
+TASKS = [
+    Task(id=1, description="Reunião, \"semanal\"", due_date=date(2024, 1, 1)),
+    Task(id=2, description="Line\nbreak", due_date=date(2024, 12, 31), status=CLOSED),
+]
+
+@pytest.mark.parametrize("fmt", transfer.FORMATS)
+def test_round_trip(fmt):
+    text = "".join(transfer.encode(TASKS, fmt))
+
+    assert list(transfer.decode(text.splitlines(keepends=True), fmt)) == TASKS
+
+def test_encode_ndjson():
+    assert "".join(transfer.encode(TASKS[:1], transfer.NDJSON)) == (
+        '{"id": 1, "description": "Reunião, \\"semanal\\"", "due_date": "2024-01-01", "status": "OPEN"}\n'
+    )
+
+def test_encode_csv_writes_header_for_empty_export():
+    assert "".join(transfer.encode([], transfer.CSV)) == "id,description,due_date,status\n"
+
+def test_encode_in_chunks(monkeypatch):
+    monkeypatch.setattr(transfer, "CHUNK_SIZE", 1)
+
+    assert len(list(transfer.encode(TASKS, transfer.NDJSON))) == 2
+
+def test_decode_defaults_and_blank_lines():
+    lines = ['\n', '{"description": "New", "due_date": "2024-01-01"}\n']
+
+    assert list(transfer.decode(lines, transfer.NDJSON)) == [Task(id=None, description="New", due_date=date(2024, 1, 1), status=OPEN)]
+
+def test_decode_csv_without_ids():
+    lines = ["description,due_date\n", "New,2024-01-01\n"]
+
+    assert list(transfer.decode(lines, transfer.CSV)) == [Task(id=None, description="New", due_date=date(2024, 1, 1))]
+
+@pytest.mark.parametrize("line, message", [
+    ('{"description": "A", "due_date": "2024-01-01"', "Line 2: invalid JSON"),
+    ('[1, 2]', "Line 2: expected a JSON object"),
+    ('{"due_date": "2024-01-01"}', "Line 2: description is required"),
+    ('{"description": "A", "due_date": "2024-01-01", "status": "DONE"}', "Line 2: status must be"),
+    ('{"description": "A", "due_date": "01/01/2024"}', "Line 2: invalid due_date"),
+    ('{"id": true, "description": "A", "due_date": "2024-01-01"}', "Line 2: id must be an integer"),
+    ('{"id": 1.9, "description": "A", "due_date": "2024-01-01"}', "Line 2: id must be an integer"),
+    ('{"id": "--5", "description": "A", "due_date": "2024-01-01"}', "Line 2: id must be an integer"),
+    ('{"id": 9223372036854775808, "description": "A", "due_date": "2024-01-01"}', "Line 2: id must be an integer"),
+])
+def test_decode_reports_line_numbers(line, message):
+    lines = ['{"description": "Valid", "due_date": "2024-01-01"}', line]
+
+    with pytest.raises(ValueError, match=message):
+        list(transfer.decode(lines, transfer.NDJSON))
+
+def test_decode_rejects_two_objects_on_one_line():
+    lines = [
+        '{"description": "A", "due_date": "2024-01-01"}, {"description": "B", "due_date": "2024-01-01"}\n',
+        '{"description": "C", "due_date": "2024-01-01"}\n',
+    ]
+
+    with pytest.raises(ValueError, match="Line 1: invalid JSON"):
+        list(transfer.decode(lines, transfer.NDJSON))
+
+def test_decode_csv_ids():
+    lines = ["id,description,due_date\n", "9223372036854775807,Last,2024-01-01\n", "1.9,Bad,2024-01-01\n"]
+    tasks = transfer.decode(lines, transfer.CSV)
+
+    assert next(tasks).id == 2 ** 63 - 1
+    with pytest.raises(ValueError, match="Line 3: id must be an integer"):
+        next(tasks)
+
+def test_decode_csv_requires_header():
+    with pytest.raises(ValueError, match="Line 1"):
+        list(transfer.decode(["1,Task,2024-01-01,OPEN\n"], transfer.CSV))
+
+def test_format_for():
+    assert transfer.format_for(None) == transfer.NDJSON
+    assert transfer.format_for("csv") == transfer.CSV
+    with pytest.raises(ValueError):
+        transfer.format_for("xml")